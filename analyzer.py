@@ -11,22 +11,43 @@ Scores trending repositories based on health metrics:
 No cloning required - uses GitHub API only.
 """
 
+import base64
+import bisect
 import os
+import re
 import json
+import itertools
+import threading
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
-from urllib.request import urlopen, Request
-from urllib.error import URLError, HTTPError
+from urllib.error import HTTPError
+
+from github_trending import (
+    _graphql_repo_to_rest, http_request, parse_github_date, read_cache, read_stale_cache, write_cache,
+)
 
 
 # =============================================================================
 # Configuration
 # =============================================================================
 
+# KEY=value, optionally quoted; comment lines never match
+_ENV_LINE_RE = re.compile(r"""\s*([^#=\s][^=\s]*)\s*=\s*['"]?(.*?)['"]?\s*$""")
+
+
 def load_env_file():
-    """Load .env file from project root or current directory."""
+    """Load .env file from project root or current directory.
+    
+    Skipped when a token is already in the environment - the tokens are all
+    this module reads from it.
+    """
+    if "GITHUB_TOKEN" in os.environ or "GITHUB_TOKENS" in os.environ:
+        return False
+    
     # Try multiple locations
     locations = [
         Path(__file__).parent.parent.parent / ".env",  # TestingGround/.env
@@ -35,27 +56,32 @@ def load_env_file():
     ]
     
     for env_path in locations:
-        if env_path.exists():
-            try:
-                with open(env_path, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#') and '=' in line:
-                            key, value = line.split('=', 1)
-                            key = key.strip()
-                            value = value.strip().strip('"').strip("'")
-                            if key and value and key not in os.environ:
-                                os.environ[key] = value
-                return True
-            except (OSError, ValueError):
-                pass
+        try:
+            with open(env_path, 'r') as f:
+                for line in f:
+                    match = _ENV_LINE_RE.match(line)
+                    if match:
+                        key, value = match.groups()
+                        if value and key not in os.environ:
+                            os.environ[key] = value
+            return True
+        except (OSError, ValueError):
+            pass  # Missing or unreadable - try the next location
     return False
 
 # Load .env on import
 load_env_file()
 
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")
+# Optional comma-separated pool rotated per request (each token has its own rate limit)
+GITHUB_TOKENS = [t.strip() for t in os.environ.get("GITHUB_TOKENS", GITHUB_TOKEN).split(",") if t.strip()]
+if GITHUB_TOKENS and not GITHUB_TOKEN:
+    GITHUB_TOKEN = GITHUB_TOKENS[0]
 API_BASE = "https://api.github.com"
+GRAPHQL_URL = f"{API_BASE}/graphql"
+
+# Repos per GraphQL request (aliased repository fields)
+GRAPHQL_BATCH_SIZE = 10
 
 # Scoring weights
 WEIGHTS = {
@@ -69,49 +95,252 @@ WEIGHTS = {
     "not_archived": 10,        # Still maintained
 }
 
+# Fixed metric order used when building results
+SCORE_KEYS = (
+    "recent_commits", "readme_quality", "issue_response", "pr_merge_rate",
+    "has_license", "not_archived", "low_open_issues", "stars_velocity",
+)
+
+# Grade bands: a total at or above each threshold earns the next letter
+GRADE_THRESHOLDS = (40, 55, 70, 85)
+GRADE_LETTERS = ("F", "D", "C", "B", "A")
+
+# Concurrency: repos analyzed in parallel (each fans out its own endpoint calls)
+MAX_WORKERS = 16
+
+# Rate limiting: pace when a token is nearly out, back off on secondary limits
+RATE_LIMIT_FLOOR = 5   # requests left before waiting for the reset
+MAX_RETRIES = 4        # retries on 429 / Retry-After responses (1, 2, 4, 8s)
+MAX_BACKOFF = 60       # cap in seconds for any single wait
+
 
 # =============================================================================
 # API Helpers
 # =============================================================================
 
-def api_request(endpoint: str) -> Optional[dict]:
-    """Make a GitHub API request with optional auth."""
-    url = f"{API_BASE}{endpoint}" if endpoint.startswith("/") else endpoint
+_token_lock = threading.Lock()
+_token_cycle = itertools.cycle(GITHUB_TOKENS)
+_token_reset = {}  # token -> epoch seconds when its exhausted rate limit resets
+
+
+def next_token() -> str:
+    """Return the next token in the rotation, skipping exhausted ones ("" if none configured)."""
+    if not GITHUB_TOKENS:
+        return ""
+    with _token_lock:
+        now = time.time()
+        for _ in range(len(GITHUB_TOKENS)):
+            token = next(_token_cycle)
+            if _token_reset.get(token, 0) <= now:
+                return token
+        # Everything is exhausted - use the one that resets first
+        return min(GITHUB_TOKENS, key=lambda t: _token_reset.get(t, 0))
+
+
+def mark_token_exhausted(token: str, reset: float) -> None:
+    """Take a token out of the rotation until its rate limit resets."""
+    if token:
+        with _token_lock:
+            _token_reset[token] = reset
+
+
+_REST_HEADERS = {
+    "User-Agent": "github-trending-cli",
+    "Accept": "application/vnd.github.v3+json",
+}
+_GRAPHQL_HEADERS = {
+    "User-Agent": "github-trending-cli",
+    "Content-Type": "application/json",
+}
+
+
+@lru_cache(maxsize=None)
+def _auth_headers(token: str) -> dict:
+    """REST headers for a token, built once per token (treat as read-only)."""
+    return dict(_REST_HEADERS, Authorization=f"token {token}")
+
+
+_rate_state = {}  # token -> (remaining, reset epoch) from the latest response headers
+
+
+def _record_rate_headers(token: str, headers) -> None:
+    """Remember X-RateLimit-Remaining/Reset for the token that made the request."""
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if remaining is not None and reset is not None:
+        try:
+            _rate_state[token] = (int(remaining), float(reset))
+        except ValueError:
+            pass
+
+
+def _wait_for_quota(token: str) -> None:
+    """Sleep until the reset if this token is nearly out and the reset is close."""
+    state = _rate_state.get(token)
+    if state and state[0] < RATE_LIMIT_FLOOR:
+        wait = state[1] - time.time()
+        if 0 < wait <= MAX_BACKOFF:
+            time.sleep(wait)
+
+
+def _retry_delay(error: HTTPError, backoff: float) -> Optional[float]:
+    """Seconds to wait before retrying a rate-limited request, or None if not retryable."""
+    if error.code not in (403, 429) or not error.headers:
+        return None
+    retry_after = error.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return min(float(retry_after), MAX_BACKOFF)
+        except ValueError:
+            return backoff
+    if error.headers.get("X-RateLimit-Remaining") == "0":
+        return None  # Primary limit - waiting is up to the caller
+    return backoff if error.code == 429 else None
+
+
+def _send(url: str, headers: dict, token: str, data: bytes = None, timeout: int = 15):
+    """Send a GitHub API request and return (response_headers, decoded JSON body).
+    
+    The body is None for a 304 Not Modified. Paces on X-RateLimit headers
+    and retries secondary rate limits with exponential backoff. Raises
+    HTTPError once retries are used up.
+    """
+    backoff = 1
+    for attempt in range(MAX_RETRIES + 1):
+        _wait_for_quota(token)
+        try:
+            status, response_headers, body = http_request(url, headers, data=data, timeout=timeout)
+            _record_rate_headers(token, response_headers)
+            if status == 304:
+                return response_headers, None
+            # json.loads takes the raw bytes and detects UTF-8 itself
+            return response_headers, json.loads(body)
+        except HTTPError as e:
+            if e.headers:
+                _record_rate_headers(token, e.headers)
+            wait = _retry_delay(e, backoff)
+            if wait is None or attempt == MAX_RETRIES:
+                raise
+            time.sleep(wait)
+            backoff = min(backoff * 2, MAX_BACKOFF)
+
+
+def api_cache_type(endpoint: str) -> Optional[str]:
+    """Pick the cache bucket (and so the TTL) for an API endpoint, or None to skip caching."""
+    path = endpoint.split("?", 1)[0]
+    if path.startswith("/rate_limit"):
+        return None  # Always live
+    if path.endswith("/readme"):
+        return "readme"
+    if path.endswith("/issues") or path.endswith("/pulls"):
+        return "issues"
+    if path.count("/") == 3 and path.startswith("/repos/"):
+        return "repo_info"  # /repos/{owner}/{repo}
+    return "api"
+
+
+def api_request(endpoint: str, token: str = None) -> Optional[dict]:
+    """Make a GitHub API request with optional auth (cached on disk).
+    
+    Expired entries are revalidated with If-None-Match; GitHub does not
+    count 304 responses against the rate limit.
+    """
+    cache_type = api_cache_type(endpoint)
+    stale = None
+    if cache_type:
+        cached = read_cache(cache_type, endpoint)
+        if cached is not None:
+            return cached
+        stale = read_stale_cache(cache_type, endpoint)
     
-    headers = {
-        "User-Agent": "github-trending-cli",
-        "Accept": "application/vnd.github.v3+json",
-    }
+    url = f"{API_BASE}{endpoint}" if endpoint.startswith("/") else endpoint
     
-    if GITHUB_TOKEN:
-        headers["Authorization"] = f"token {GITHUB_TOKEN}"
+    if token is None:
+        token = next_token()
+    headers = _auth_headers(token) if token else _REST_HEADERS
+    etag = stale.get("_etag") if stale else None
+    if etag:
+        headers = dict(headers, **{"If-None-Match": etag})
     
     try:
-        req = Request(url, headers=headers)
-        with urlopen(req, timeout=15) as response:
-            return json.loads(response.read().decode('utf-8'))
+        response_headers, result = _send(url, headers, token)
     except HTTPError as e:
-        if e.code == 403:
+        if e.code in (403, 429):
             # Rate limited
+            if e.headers and e.headers.get("X-RateLimit-Remaining") == "0":
+                mark_token_exhausted(token, float(e.headers.get("X-RateLimit-Reset") or time.time() + 3600))
             return {"_error": "rate_limited"}
         elif e.code == 404:
             return {"_error": "not_found"}
+        elif e.code == 409:
+            # GitHub's "Git Repository is empty" for commits of an empty repo
+            return {"_error": "empty_repository"}
         return {"_error": str(e)}
     except Exception as e:
         return {"_error": str(e)}
+    
+    if result is None:
+        # 304 Not Modified - the stale copy is current again
+        result = stale["_data"]
+    else:
+        etag = response_headers.get("ETag")
+    
+    # Errors are never cached so they are retried next run
+    if cache_type:
+        write_cache(cache_type, endpoint, result, etag)
+    return result
 
 
 def get_rate_limit() -> dict:
-    """Check current rate limit status."""
-    result = api_request("/rate_limit")
-    if result and "_error" not in result:
-        core = result.get("resources", {}).get("core", {})
-        return {
-            "remaining": core.get("remaining", 0),
-            "limit": core.get("limit", 60),
-            "reset": core.get("reset", 0),
-        }
-    return {"remaining": 0, "limit": 60, "reset": 0}
+    """Check current rate limit status, summed across all configured tokens."""
+    def check(token):
+        result = api_request("/rate_limit", token=token)
+        if result and "_error" not in result:
+            core = result.get("resources", {}).get("core", {})
+            return {
+                "remaining": core.get("remaining", 0),
+                "limit": core.get("limit", 60),
+                "reset": core.get("reset", 0),
+            }
+        return {"remaining": 0, "limit": 60, "reset": 0}
+    
+    if len(GITHUB_TOKENS) <= 1:
+        return check(GITHUB_TOKENS[0] if GITHUB_TOKENS else "")
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(GITHUB_TOKENS))) as pool:
+        limits = list(pool.map(check, GITHUB_TOKENS))
+    return {
+        "remaining": sum(r["remaining"] for r in limits),
+        "limit": sum(r["limit"] for r in limits),
+        "reset": min(r["reset"] for r in limits),
+    }
+
+
+def graphql_query(query: str, variables: dict = None) -> dict:
+    """Run a GitHub GraphQL v4 query. Requires GITHUB_TOKEN."""
+    token = next_token()
+    if not token:
+        return {"_error": "token_required"}
+    
+    headers = dict(_GRAPHQL_HEADERS, Authorization=f"bearer {token}")
+    payload = json.dumps({"query": query, "variables": variables or {}}).encode("utf-8")
+    
+    try:
+        _, result = _send(GRAPHQL_URL, headers, token, data=payload, timeout=30)
+    except HTTPError as e:
+        if e.code in (403, 429):
+            if e.headers and e.headers.get("X-RateLimit-Remaining") == "0":
+                mark_token_exhausted(token, float(e.headers.get("X-RateLimit-Reset") or time.time() + 3600))
+            return {"_error": "rate_limited"}
+        return {"_error": str(e)}
+    except Exception as e:
+        return {"_error": str(e)}
+    
+    # Partial results (e.g. one missing repo) still carry "data"
+    if not result.get("data"):
+        errors = result.get("errors") or [{}]
+        return {"_error": errors[0].get("message", "GraphQL query failed")}
+    return result["data"]
 
 
 # =============================================================================
@@ -123,48 +352,185 @@ def get_repo_info(owner: str, repo: str) -> dict:
     return api_request(f"/repos/{owner}/{repo}") or {}
 
 
-def get_commits(owner: str, repo: str, limit: int = 10) -> list:
-    """Fetch recent commits."""
+# Errors that mean "nothing there" rather than a failed request
+_ABSENT_ERRORS = ("not_found", "empty_repository")
+
+
+def _fetch_failed(result) -> bool:
+    """True for an api_request error that should not be scored as "nothing there"."""
+    return isinstance(result, dict) and result.get("_error", "not_found") not in _ABSENT_ERRORS
+
+
+def get_commits(owner: str, repo: str, limit: int = 10):
+    """Fetch recent commits (the {"_error"} dict if the request failed)."""
     result = api_request(f"/repos/{owner}/{repo}/commits?per_page={limit}")
     if isinstance(result, list):
         return result
-    return []
+    return result if _fetch_failed(result) else []
 
 
 def get_open_issues(owner: str, repo: str) -> dict:
-    """Fetch open issues count and recent issues."""
+    """Fetch open issues count and recent issues (the {"_error"} dict if the request failed)."""
     result = api_request(f"/repos/{owner}/{repo}/issues?state=open&per_page=10")
     if isinstance(result, list):
         return {"items": result, "count": len(result)}
-    return {"items": [], "count": 0}
+    return result if _fetch_failed(result) else {"items": [], "count": 0}
 
 
-def get_pull_requests(owner: str, repo: str, state: str = "all", limit: int = 20) -> list:
-    """Fetch pull requests."""
+def get_pull_requests(owner: str, repo: str, state: str = "all", limit: int = 20):
+    """Fetch pull requests (the {"_error"} dict if the request failed)."""
     result = api_request(f"/repos/{owner}/{repo}/pulls?state={state}&per_page={limit}")
     if isinstance(result, list):
         return result
-    return []
+    return result if _fetch_failed(result) else []
 
 
-def get_readme(owner: str, repo: str) -> Optional[str]:
-    """Fetch README content."""
+def get_readme(owner: str, repo: str):
+    """Fetch README content as raw bytes (scoring never needs it decoded).
+    
+    None when the repo has no README; the {"_error"} dict if the request failed.
+    """
     result = api_request(f"/repos/{owner}/{repo}/readme")
+    if _fetch_failed(result):
+        return result
     if result and "_error" not in result:
         # README API returns base64 encoded content
-        import base64
         content = result.get("content", "")
         try:
-            return base64.b64decode(content).decode('utf-8')
-        except (ValueError, UnicodeDecodeError):
+            return base64.b64decode(content)
+        except ValueError:
             return None
     return None
 
 
+# Everything analyze_repo needs for one repo, in a single GraphQL selection
+_REPO_FRAGMENT = """
+fragment RepoHealth on Repository {
+  description
+  url
+  stargazerCount
+  isArchived
+  primaryLanguage { name }
+  licenseInfo { spdxId }
+  issues(states: OPEN) { totalCount }
+  pullRequests(states: OPEN) { totalCount }
+  recentIssues: issues(states: OPEN, first: 10, orderBy: {field: CREATED_AT, direction: DESC}) {
+    nodes { comments { totalCount } }
+  }
+  recentPullRequests: pullRequests(first: 20, orderBy: {field: CREATED_AT, direction: DESC}) {
+    nodes { state mergedAt }
+  }
+  defaultBranchRef {
+    target { ... on Commit { history(first: 10) { nodes { author { date } } } } }
+  }
+  readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+}
+"""
+
+
+def _graphql_to_rest(node: dict) -> tuple:
+    """Convert a RepoHealth node to the REST shapes used by the scorers."""
+    # Same repo mapping as the CLI's batched info fetch
+    info = _graphql_repo_to_rest(node)
+    
+    target = (node.get("defaultBranchRef") or {}).get("target") or {}
+    history = (target.get("history") or {}).get("nodes", [])
+    commits = [{"commit": {"author": c.get("author") or {}}} for c in history]
+    
+    issues = [
+        {"comments": i.get("comments", {}).get("totalCount", 0)}
+        for i in node.get("recentIssues", {}).get("nodes", [])
+    ]
+    
+    prs = [
+        {"state": "open" if pr.get("state") == "OPEN" else "closed", "merged_at": pr.get("mergedAt")}
+        for pr in node.get("recentPullRequests", {}).get("nodes", [])
+    ]
+    
+    # Scored as UTF-8 bytes, like the REST README, so length bands count the same unit
+    text = (node.get("readme") or {}).get("text")
+    readme = text.encode("utf-8") if text is not None else None
+    
+    return info, commits, issues, prs, readme
+
+
+def fetch_repos_graphql(titles: list) -> dict:
+    """Fetch analysis data for many repos with one GraphQL request per batch.
+    
+    Returns {owner/repo: (info, commits, issues, prs, readme)}. Repos GitHub
+    reports as missing map to {"_error": "not_found"}; repos from failed
+    batches are left out so callers can fall back to REST.
+    """
+    batches = [titles[i:i + GRAPHQL_BATCH_SIZE] for i in range(0, len(titles), GRAPHQL_BATCH_SIZE)]
+    
+    def run_batch(batch):
+        params, fields, variables = [], [], {}
+        for i, title in enumerate(batch):
+            owner, name = title.split("/", 1)
+            params.append(f"$o{i}: String!, $n{i}: String!")
+            fields.append(f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoHealth }}")
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+        query = f"query({', '.join(params)}) {{\n" + "\n".join(fields) + "\n}\n" + _REPO_FRAGMENT
+        
+        data = graphql_query(query, variables)
+        if "_error" in data:
+            return {}
+        
+        found = {}
+        for i, title in enumerate(batch):
+            node = data.get(f"r{i}")
+            found[title] = _graphql_to_rest(node) if node else {"_error": "not_found"}
+        return found
+    
+    results = {}
+    if batches:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(batches))) as pool:
+            for found in pool.map(run_batch, batches):
+                results.update(found)
+    return results
+
+
 # =============================================================================
 # Scoring Functions
 # =============================================================================
 
+_UTC = timezone.utc
+
+
+# README keyword detection: plain substring matches against one lowercased copy.
+# str.__contains__ is a fast C substring search; an IGNORECASE alternation
+# regex has no literal prefix to skip ahead with and steps through every
+# character. str keywords for GraphQL blob text, bytes for REST base64 content.
+_INSTALL_KEYWORDS = ("install", "npm", "pip", "cargo", "setup")
+_USAGE_KEYWORDS = ("usage", "example", "getting started", "quick start")
+_README_KEYWORDS = {
+    str: (_INSTALL_KEYWORDS, _USAGE_KEYWORDS, "!["),
+    bytes: (tuple(k.encode() for k in _INSTALL_KEYWORDS),
+            tuple(k.encode() for k in _USAGE_KEYWORDS), b"!["),
+}
+_README_LENGTH_BANDS = ((0, "minimal"), (3, "basic"), (5, "detailed"))
+
+# Commit age bands: under 7 days is Active, under 30 Recent, and so on
+_COMMIT_AGE_DAYS = (7, 30, 90, 180)
+_COMMIT_AGE_BANDS = ((20, "Active"), (15, "Recent"), (10, "Moderate"), (5, "Stale"), (0, "Inactive"))
+
+# Issue response bands: above 20% of issues answered scores 5, above 50% 10, above 80% 15
+_RESPONSE_RATE_THRESHOLDS = (0.2, 0.5, 0.8)
+_RESPONSE_RATE_SCORES = (0, 5, 10, 15)
+
+# PR merge bands: above 30% of closed PRs merged scores 5, above 50% 10, above 70% 15
+_MERGE_RATE_THRESHOLDS = (0.3, 0.5, 0.7)
+_MERGE_RATE_SCORES = (0, 5, 10, 15)
+
+# Health bands: under 20 open issues scores 10, under 100 7, under 500 3;
+# over 100 stars 4, over 1000 7, over 10000 10
+_OPEN_ISSUES_LIMITS = (20, 100, 500)
+_OPEN_ISSUES_SCORES = (10, 7, 3, 0)
+_STARS_THRESHOLDS = (100, 1000, 10000)
+_STARS_SCORES = (2, 4, 7, 10)
+
+
 def score_recent_commits(commits: list) -> tuple[int, str]:
     """Score based on commit recency and frequency."""
     if not commits:
@@ -173,57 +539,44 @@ def score_recent_commits(commits: list) -> tuple[int, str]:
     try:
         latest = commits[0].get("commit", {}).get("author", {}).get("date", "")
         if latest:
-            latest_date = datetime.fromisoformat(latest.replace("Z", "+00:00"))
-            days_ago = (datetime.now(latest_date.tzinfo) - latest_date).days
+            latest_date = parse_github_date(latest)
+            now = datetime.now(_UTC if latest_date.tzinfo else None)
+            days_ago = (now - latest_date).days
             
-            if days_ago < 7:
-                return 20, f"Active ({days_ago}d ago)"
-            elif days_ago < 30:
-                return 15, f"Recent ({days_ago}d ago)"
-            elif days_ago < 90:
-                return 10, f"Moderate ({days_ago}d ago)"
-            elif days_ago < 180:
-                return 5, f"Stale ({days_ago}d ago)"
-            else:
-                return 0, f"Inactive ({days_ago}d ago)"
+            score, label = _COMMIT_AGE_BANDS[bisect.bisect_right(_COMMIT_AGE_DAYS, days_ago)]
+            return score, f"{label} ({days_ago}d ago)"
     except (ValueError, TypeError, KeyError):
         pass
     
     return 10, "Unknown activity"
 
 
-def score_readme(readme: Optional[str]) -> tuple[int, str]:
-    """Score README quality."""
+@lru_cache(maxsize=256)
+def score_readme(readme) -> tuple[int, str]:
+    """Score README quality (str or undecoded UTF-8 bytes; cached per content)."""
     if not readme:
         return 0, "No README"
     
+    install_keywords, usage_keywords, badge = _README_KEYWORDS[type(readme)]
     length = len(readme)
-    has_install = any(x in readme.lower() for x in ["install", "npm", "pip", "cargo", "setup"])
-    has_usage = any(x in readme.lower() for x in ["usage", "example", "getting started", "quick start"])
-    has_badges = "![" in readme or "[![" in readme
-    
-    score = 0
-    notes = []
-    
-    if length > 2000:
-        score += 5
-        notes.append("detailed")
-    elif length > 500:
-        score += 3
-        notes.append("basic")
-    else:
-        notes.append("minimal")
+    lowered = readme.lower()
+    has_install = any(k in lowered for k in install_keywords)
+    has_usage = any(k in lowered for k in usage_keywords)
+    has_badges = badge in readme  # also covers linked badges "[!["
+    
+    # Length band: >2000 detailed, >500 basic, else minimal
+    score, length_note = _README_LENGTH_BANDS[(length > 500) + (length > 2000)]
+    
+    # 5 + 4 + 4 + 2 = 15 at most, so no cap is needed
+    score += 4 * has_install + 4 * has_usage + 2 * has_badges
     
+    notes = length_note
     if has_install:
-        score += 4
-        notes.append("install docs")
+        notes += ", install docs"
     if has_usage:
-        score += 4
-        notes.append("usage docs")
-    if has_badges:
-        score += 2
+        notes += ", usage docs"
     
-    return min(score, 15), ", ".join(notes) if notes else "Present"
+    return score, notes
 
 
 def score_issue_response(issues: list) -> tuple[int, str]:
@@ -233,16 +586,13 @@ def score_issue_response(issues: list) -> tuple[int, str]:
     
     # Check if issues have comments (indicates response)
     responded = sum(1 for i in issues if i.get("comments", 0) > 0)
-    rate = responded / len(issues) if issues else 0
-    
-    if rate > 0.8:
-        return 15, f"{int(rate*100)}% responded"
-    elif rate > 0.5:
-        return 10, f"{int(rate*100)}% responded"
-    elif rate > 0.2:
-        return 5, f"{int(rate*100)}% responded"
-    else:
-        return 0, f"Low response rate"
+    rate = responded / len(issues)
+    
+    # bisect_left counts the thresholds strictly below the rate
+    band = bisect.bisect_left(_RESPONSE_RATE_THRESHOLDS, rate)
+    if not band:
+        return 0, "Low response rate"
+    return _RESPONSE_RATE_SCORES[band], f"{int(rate*100)}% responded"
 
 
 def score_pr_merge_rate(prs: list) -> tuple[int, str]:
@@ -258,14 +608,10 @@ def score_pr_merge_rate(prs: list) -> tuple[int, str]:
     
     rate = merged / closed
     
-    if rate > 0.7:
-        return 15, f"{int(rate*100)}% merged"
-    elif rate > 0.5:
-        return 10, f"{int(rate*100)}% merged"
-    elif rate > 0.3:
-        return 5, f"{int(rate*100)}% merged"
-    else:
-        return 0, f"Low merge rate"
+    band = bisect.bisect_left(_MERGE_RATE_THRESHOLDS, rate)
+    if not band:
+        return 0, "Low merge rate"
+    return _MERGE_RATE_SCORES[band], f"{int(rate*100)}% merged"
 
 
 def score_repo_health(info: dict) -> dict:
@@ -286,25 +632,13 @@ def score_repo_health(info: dict) -> dict:
     
     # Open issues ratio
     open_issues = info.get("open_issues_count", 0)
-    if open_issues < 20:
-        scores["low_open_issues"] = (10, f"{open_issues} open")
-    elif open_issues < 100:
-        scores["low_open_issues"] = (7, f"{open_issues} open")
-    elif open_issues < 500:
-        scores["low_open_issues"] = (3, f"{open_issues} open")
-    else:
-        scores["low_open_issues"] = (0, f"{open_issues} open (overloaded)")
+    band = bisect.bisect_right(_OPEN_ISSUES_LIMITS, open_issues)
+    note = f"{open_issues} open" if band < len(_OPEN_ISSUES_LIMITS) else f"{open_issues} open (overloaded)"
+    scores["low_open_issues"] = (_OPEN_ISSUES_SCORES[band], note)
     
     # Stars velocity (using watchers as proxy for recent interest)
     stars = info.get("stargazers_count", 0)
-    if stars > 10000:
-        scores["stars_velocity"] = (10, f"{stars:,}⭐")
-    elif stars > 1000:
-        scores["stars_velocity"] = (7, f"{stars:,}⭐")
-    elif stars > 100:
-        scores["stars_velocity"] = (4, f"{stars:,}⭐")
-    else:
-        scores["stars_velocity"] = (2, f"{stars:,}⭐")
+    scores["stars_velocity"] = (_STARS_SCORES[bisect.bisect_left(_STARS_THRESHOLDS, stars)], f"{stars:,}⭐")
     
     return scores
 
@@ -313,70 +647,105 @@ def score_repo_health(info: dict) -> dict:
 # Main Analysis
 # =============================================================================
 
-def analyze_repo(owner_repo: str, verbose: bool = False) -> dict:
-    """Analyze a single repository and return scores."""
+def analyze_repo(owner_repo: str, verbose: bool = False, parallel: bool = True,
+                 use_cache: bool = True) -> dict:
+    """Analyze a single repository and return scores.
+    
+    Results are cached for the "analysis" TTL; use_cache=False recomputes
+    and overwrites the cached copy. parallel=False fetches the endpoints one
+    after another on the calling thread, for callers (analyze_repos) that
+    already run repos in a pool.
+    """
+    if use_cache:
+        cached = read_cache("analysis", owner_repo)
+        if cached is not None:
+            return dict(cached)  # cached envelopes are shared - callers may add keys
+    
+    result, complete = _fetch_and_score(owner_repo, parallel)
+    # A score built around a failed endpoint is shown but not kept
+    if complete:
+        write_cache("analysis", owner_repo, result)
+    return result
+
+
+def _fetch_and_score(owner_repo: str, parallel: bool) -> tuple:
+    """Fetch a repo's endpoints over REST and score them (analyze_repo minus caching).
+    
+    Returns (result, complete); complete is False when any endpoint failed
+    (rate limit, 5xx, timeout) and the result scored it as empty.
+    """
     parts = owner_repo.split("/")
     if len(parts) != 2:
-        return {"error": f"Invalid repo format: {owner_repo}"}
+        return {"error": f"Invalid repo format: {owner_repo}"}, False
     
     owner, repo = parts
     
-    result = {
-        "repo": owner_repo,
-        "scores": {},
-        "total": 0,
-        "grade": "?",
-        "details": {},
-    }
-    
     # Fetch data
     info = get_repo_info(owner, repo)
     if "_error" in info:
-        return {"error": info["_error"], "repo": owner_repo}
-    
-    commits = get_commits(owner, repo)
-    issues_data = get_open_issues(owner, repo)
-    prs = get_pull_requests(owner, repo)
-    readme = get_readme(owner, repo)
-    
-    # Calculate scores
-    score, note = score_recent_commits(commits)
-    result["scores"]["recent_commits"] = score
-    result["details"]["recent_commits"] = note
-    
-    score, note = score_readme(readme)
-    result["scores"]["readme_quality"] = score
-    result["details"]["readme_quality"] = note
-    
-    score, note = score_issue_response(issues_data.get("items", []))
-    result["scores"]["issue_response"] = score
-    result["details"]["issue_response"] = note
-    
-    score, note = score_pr_merge_rate(prs)
-    result["scores"]["pr_merge_rate"] = score
-    result["details"]["pr_merge_rate"] = note
-    
-    # Health scores
-    health_scores = score_repo_health(info)
-    for key, (score, note) in health_scores.items():
-        result["scores"][key] = score
-        result["details"][key] = note
+        return {"error": info["_error"], "repo": owner_repo}, False
+    
+    # An empty repo has no commits, README, issues or PRs to fetch. size 0
+    # alone is no proof, since REST reports 0 for a while after a first
+    # push. pushed_at only moves on a push, so pushed_at == created_at
+    # means nothing has been pushed since the repo was created.
+    if info.get("size") == 0 and info.get("created_at") and info.get("pushed_at") == info["created_at"]:
+        return score_repo(owner_repo, info, [], [], [], None), True
+    
+    fetchers = [get_commits, get_pull_requests, get_readme]
+    # open_issues_count covers issues and PRs; zero means nothing to list
+    if info.get("open_issues_count", 1):
+        fetchers.append(get_open_issues)
+    
+    if parallel:
+        # The remaining endpoints are independent - fetch them concurrently
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as pool:
+            fetched = list(pool.map(lambda fetch: fetch(owner, repo), fetchers))
+    else:
+        # Stay on this thread so its keep-alive connection is reused
+        fetched = [fetch(owner, repo) for fetch in fetchers]
+    
+    complete = not any(map(_fetch_failed, fetched))
+    if not complete:
+        # Score the failed endpoints as empty
+        blanks = ([], [], None, {})
+        fetched = [blank if _fetch_failed(data) else data for data, blank in zip(fetched, blanks)]
+    
+    commits, prs, readme = fetched[:3]
+    issues = fetched[3].get("items", []) if len(fetched) > 3 else []
+    
+    return score_repo(owner_repo, info, commits, issues, prs, readme), complete
+
+
+def score_repo(owner_repo: str, info: dict, commits: list, issues: list,
+               prs: list, readme=None) -> dict:
+    """Score a repository from already-fetched data (REST-shaped dicts)."""
+    health = score_repo_health(info)
+    
+    # (score, note) per metric, in SCORE_KEYS order
+    pairs = (
+        score_recent_commits(commits),
+        score_readme(readme),
+        score_issue_response(issues),
+        score_pr_merge_rate(prs),
+        health["has_license"],
+        health["not_archived"],
+        health["low_open_issues"],
+        health["stars_velocity"],
+    )
+    scores = [score for score, _ in pairs]
+    total = sum(scores)
     
-    # Calculate total
-    result["total"] = sum(result["scores"].values())
+    result = {
+        "repo": owner_repo,
+        "scores": dict(zip(SCORE_KEYS, scores)),
+        "total": total,
+        "grade": "?",
+        "details": dict(zip(SCORE_KEYS, (note for _, note in pairs))),
+    }
     
     # Assign grade
-    total = result["total"]
-    if total >= 85:
-        result["grade"] = "A"
-    elif total >= 70:
-        result["grade"] = "B"
-    elif total >= 55:
-        result["grade"] = "C"
-    elif total >= 40:
-        result["grade"] = "D"
-    else:
-        result["grade"] = "F"
+    result["grade"] = GRADE_LETTERS[bisect.bisect_right(GRADE_THRESHOLDS, total)]
     
     # Add repo metadata
     result["meta"] = {
@@ -389,43 +758,87 @@ def analyze_repo(owner_repo: str, verbose: bool = False) -> dict:
     return result
 
 
-def analyze_repos(repos: list, verbose: bool = False) -> list:
-    """Analyze multiple repositories."""
+def analyze_repos(repos: list, verbose: bool = False, use_cache: bool = True) -> list:
+    """Analyze multiple repositories (cached analyses are reused unless use_cache=False)."""
     results = []
     
-    # Check rate limit first
-    rate = get_rate_limit()
-    remaining = rate.get("remaining", 0)
-    
-    # Each repo needs ~5 API calls
-    needed = len(repos) * 5
-    
-    if remaining < needed and not GITHUB_TOKEN:
-        print(f"⚠️  Rate limit: {remaining} remaining, need ~{needed}")
-        print("   Set GITHUB_TOKEN env var for 5000/hr limit")
-        print(f"   Analyzing first {remaining // 5} repos only...\n")
-        repos = repos[:max(1, remaining // 5)]
+    # Extract owner/repo from trending data
+    jobs = [
+        (i, repo_info) for i, repo_info in enumerate(repos)
+        if "/" in repo_info.get("title", "")
+    ]
     
-    for i, repo_info in enumerate(repos):
-        # Extract owner/repo from trending data
-        title = repo_info.get("title", "")
-        if not title or "/" not in title:
-            continue
+    # Repos analyzed within the TTL need no API calls at all
+    cached = {}
+    if use_cache:
+        for _, repo_info in jobs:
+            hit = read_cache("analysis", repo_info["title"])
+            if hit is not None:
+                cached[repo_info["title"]] = hit
+    pending = [repo_info["title"] for _, repo_info in jobs if repo_info["title"] not in cached]
+    
+    # Check rate limit first; with several tokens this is their combined budget
+    if pending:
+        rate = get_rate_limit()
+        remaining = rate.get("remaining", 0)
         
+        # Each repo needs ~5 API calls
+        needed = len(pending) * 5
+        
+        if remaining < needed:
+            print(f"⚠️  Rate limit: {remaining} remaining, need ~{needed}")
+            if GITHUB_TOKEN:
+                print("   Add tokens to GITHUB_TOKENS (comma-separated) to pool their limits")
+            else:
+                print("   Set GITHUB_TOKEN env var for 5000/hr limit")
+            print(f"   Analyzing first {remaining // 5} repos only...\n")
+            pending = pending[:max(1, remaining // 5)]
+            allowed = cached.keys() | set(pending)
+            jobs = [job for job in jobs if job[1]["title"] in allowed]
+    
+    # With a token, GraphQL collapses the 5 REST calls per repo into one
+    # request per batch of repos
+    prefetched = {}
+    if GITHUB_TOKEN and pending:
+        prefetched = fetch_repos_graphql(pending)
+    
+    def analyze_one(indexed):
+        i, repo_info = indexed
+        title = repo_info["title"]
         if verbose:
             print(f"  Analyzing {i+1}/{len(repos)}: {title}...")
         
-        result = analyze_repo(title)
+        data = prefetched.get(title)
+        if title in cached:
+            result = dict(cached[title])
+        elif data is None:
+            # With several repos in flight the outer pool already overlaps requests
+            result = analyze_repo(title, parallel=len(jobs) == 1, use_cache=False)
+        elif isinstance(data, dict):
+            result = {"error": data["_error"], "repo": title}
+        else:
+            info, commits, issues, prs, readme = data
+            complete = True
+            if readme is None:
+                # Not at HEAD:README.md (e.g. README.rst) - let REST find it
+                readme = get_readme(*title.split("/", 1))
+                if _fetch_failed(readme):
+                    complete, readme = False, None
+            result = score_repo(title, info, commits, issues, prs, readme)
+            if complete:
+                write_cache("analysis", title, result)
         # Pass through trending metadata (avoids re-fetching)
         result["trending"] = {
             "stars": repo_info.get("stars", ""),
             "todayStars": repo_info.get("todayStars", repo_info.get("addStars", "")),
             "language": repo_info.get("language", ""),
         }
-        results.append(result)
-
-        # Small delay to be nice to API
-        time.sleep(0.2)
+        return result
+    
+    if jobs:
+        # I/O bound: analyze repos concurrently, bounded by the pool size
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(jobs))) as pool:
+            results = list(pool.map(analyze_one, jobs))
     
     # Sort by total score
     results.sort(key=lambda x: x.get("total", 0), reverse=True)
@@ -437,53 +850,57 @@ def analyze_repos(repos: list, verbose: bool = False) -> list:
 # Output Formatting
 # =============================================================================
 
-def format_analysis_table(results: list) -> str:
-    """Format analysis results as a table."""
-    lines = []
-    
-    # Header
-    lines.append("┌" + "─" * 78 + "┐")
-    lines.append("│" + " TRENDING DIGEST ".center(78) + "│")
-    lines.append("├" + "─" * 35 + "┬" + "─" * 7 + "┬" + "─" * 6 + "┬" + "─" * 27 + "┤")
-    lines.append("│" + " Repo".ljust(35) + "│" + " Score ".center(7) + "│" + " Grade ".center(6) + "│" + " Notes".ljust(27) + "│")
-    lines.append("├" + "─" * 35 + "┼" + "─" * 7 + "┼" + "─" * 6 + "┼" + "─" * 27 + "┤")
-    
-    for r in results:
-        if "error" in r:
-            repo = r.get("repo", "?")[:33]
-            lines.append(f"│ {repo:<33} │   -   │   ?   │ {'Error: ' + r['error'][:20]:<25} │")
-            continue
-        
-        repo = r.get("repo", "?")[:33]
-        score = r.get("total", 0)
-        grade = r.get("grade", "?")
-        
-        # Pick most interesting note
-        details = r.get("details", {})
-        trending = r.get("trending", {})
-        today_stars = trending.get("todayStars", "")
+# Table chrome is identical on every render - build it once
+_ANSI_RESET = "\033[0m"
+_GRADE_COLORS = {"A": "\033[92m", "B": "\033[93m", "C": "\033[33m", "D": "\033[91m", "F": "\033[91m"}
+_COLORED_GRADES = {grade: f"{color}{grade}{_ANSI_RESET}" for grade, color in _GRADE_COLORS.items()}
+_TABLE_HEADER = "\n".join((
+    "┌" + "─" * 78 + "┐",
+    "│" + " TRENDING DIGEST ".center(78) + "│",
+    "├" + "─" * 35 + "┬" + "─" * 7 + "┬" + "─" * 6 + "┬" + "─" * 27 + "┤",
+    "│" + " Repo".ljust(35) + "│" + " Score ".center(7) + "│" + " Grade ".center(6) + "│" + " Notes".ljust(27) + "│",
+    "├" + "─" * 35 + "┼" + "─" * 7 + "┼" + "─" * 6 + "┼" + "─" * 27 + "┤",
+))
+_TABLE_FOOTER = "└" + "─" * 35 + "┴" + "─" * 7 + "┴" + "─" * 6 + "┴" + "─" * 27 + "┘"
 
-        note = details.get("recent_commits", "")
-        if "Archived" in details.get("not_archived", ""):
-            note = "⚠️ Archived"
-        elif "No README" in details.get("readme_quality", ""):
-            note = "Missing docs"
 
-        if today_stars:
-            note = f"+{today_stars}⭐ {note}"
+_ROW_FMT = "│ {:<33} │ {:>5} │   {}   │ {:<25} │"
 
-        note = note[:25]
-        
-        # Color grade
-        grade_colors = {"A": "\033[92m", "B": "\033[93m", "C": "\033[33m", "D": "\033[91m", "F": "\033[91m"}
-        reset = "\033[0m"
-        colored_grade = f"{grade_colors.get(grade, '')}{grade}{reset}"
-        
-        lines.append(f"│ {repo:<33} │ {score:>5} │   {colored_grade}   │ {note:<25} │")
+
+def _table_row(r: dict) -> tuple:
+    """(repo, score, colored grade, note) cells for one analysis result."""
+    repo = r.get("repo", "?")[:33]
+    if "error" in r:
+        # Pre-centered so the score column reads "  -  "
+        return repo, "  -  ", "?", f"Error: {r['error'][:20]}"
     
-    lines.append("└" + "─" * 35 + "┴" + "─" * 7 + "┴" + "─" * 6 + "┴" + "─" * 27 + "┘")
+    # Pick most interesting note
+    details = r.get("details", {})
+    today_stars = r.get("trending", {}).get("todayStars", "")
     
-    return "\n".join(lines)
+    note = details.get("recent_commits", "")
+    if "Archived" in details.get("not_archived", ""):
+        note = "⚠️ Archived"
+    elif "No README" in details.get("readme_quality", ""):
+        note = "Missing docs"
+    
+    if today_stars:
+        note = f"+{today_stars}⭐ {note}"
+    
+    grade = r.get("grade", "?")
+    colored_grade = _COLORED_GRADES.get(grade) or f"{grade}{_ANSI_RESET}"
+    return repo, r.get("total", 0), colored_grade, note[:25]
+
+
+def format_analysis_table(results: list) -> str:
+    """Format analysis results as a table."""
+    rows = "".join(_ROW_FMT.format(*_table_row(r)) + "\n" for r in results)
+    return f"{_TABLE_HEADER}\n{rows}{_TABLE_FOOTER}"
+
+
+# Score labels and the 11 possible 10-cell progress bars
+_LABELS = {key: key.replace("_", " ").title() for key in WEIGHTS}
+_BARS = tuple("█" * filled + "░" * (10 - filled) for filled in range(11))
 
 
 def format_analysis_detail(result: dict) -> str:
@@ -506,11 +923,12 @@ def format_analysis_detail(result: dict) -> str:
     lines.append("")
     
     # Score breakdown
+    details = result.get("details", {})
     for key, score in result.get("scores", {}).items():
-        detail = result.get("details", {}).get(key, "")
-        label = key.replace("_", " ").title()
+        detail = details.get(key, "")
+        label = _LABELS.get(key) or key.replace("_", " ").title()
         max_score = WEIGHTS.get(key, 10)
-        bar = "█" * (score * 10 // max_score) + "░" * (10 - score * 10 // max_score)
+        bar = _BARS[score * 10 // max_score]
         lines.append(f"   {label:<20} [{bar}] {score:>2}/{max_score:<2}  {detail}")
     
     lines.append("")
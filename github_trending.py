@@ -13,17 +13,27 @@ Usage:
 
 import argparse
 import csv
+import fnmatch
 import hashlib
+import heapq
+import http.client
+import io
 import json
 import os
 import re
+import shutil
 import subprocess
 import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from functools import lru_cache
+from json.encoder import encode_basestring
 from pathlib import Path
 from typing import Optional
-from urllib.request import urlopen, Request
+from urllib.parse import urljoin, urlsplit
 from urllib.error import URLError, HTTPError
 
 
@@ -55,10 +65,13 @@ CACHE_TTL = {
     "trending": 3600,      # 1 hour for trending data
     "search": 1800,        # 30 minutes for general search results
     "repo_info": 86400,    # 24 hours for repo info
+    "repo_info_batch": 86400,  # 24 hours for GraphQL-batched repo info
     "readme": 86400,       # 24 hours for README
     "tree": 86400,         # 24 hours for file tree
     "deps": 86400,         # 24 hours for dependencies
     "issues": 1800,        # 30 minutes for issues
+    "api": 3600,           # 1 hour for other analyzer API responses
+    "analysis": 21600,     # 6 hours for whole-repo analysis results
 }
 
 # Rate limiting
@@ -66,6 +79,7 @@ RATE_LIMIT_DELAY = 0.5  # seconds between API calls
 _last_api_call = 0
 
 USE_COLOR = True
+USE_CACHE = True  # --no-cache: read_cache misses, fresh results are still written
 
 LANGUAGES = [
     "all", "python", "javascript", "typescript", "rust", "go", "java", 
@@ -102,21 +116,67 @@ DEPENDENCY_FILES = [
 
 def get_cache_path(cache_type: str, key: str) -> Path:
     """Get the cache file path for a given type and key."""
-    # Create a safe filename from the key
-    safe_key = hashlib.md5(key.encode()).hexdigest()
-    return CACHE_DIR / cache_type / f"{safe_key}.json"
+    # CACHE_DIR is part of the memo key, so rebinding it (as tests do) needs no cache_clear
+    return _cache_path(CACHE_DIR, cache_type, key)
+
+
+@lru_cache(maxsize=1024)
+def _cache_path(cache_dir: Path, cache_type: str, key: str) -> Path:
+    """Build a cache path (memoized: the same keys are looked up on every run)."""
+    # Create a safe filename from the key. blake2b is built into CPython, so
+    # unlike OpenSSL's md5 it is not blocked on FIPS-mode systems
+    safe_key = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return cache_dir / cache_type / f"{safe_key}.json"
+
+
+# Decoded cache files, reused while the file is unchanged: path -> ((mtime_ns, size), envelope).
+# Least recently used first; bounded so long-running callers do not grow it forever
+DECODED_CACHE_SIZE = 256
+_decoded_cache = OrderedDict()
+_decoded_lock = threading.Lock()
+
+
+def _remember_decoded(cache_path: Path, signature: tuple, envelope: dict) -> None:
+    """Store a decoded envelope, evicting the least recently used beyond DECODED_CACHE_SIZE."""
+    with _decoded_lock:
+        _decoded_cache[cache_path] = (signature, envelope)
+        _decoded_cache.move_to_end(cache_path)
+        while len(_decoded_cache) > DECODED_CACHE_SIZE:
+            _decoded_cache.popitem(last=False)
+
+
+def load_cache_file(cache_path: Path) -> dict:
+    """Load a cache file's envelope, decoding it only when the file has changed.
+    
+    Hot re-reads within a process cost one stat() instead of a read + JSON
+    parse. The returned envelope is shared between callers.
+    Raises OSError/ValueError for missing or corrupt files.
+    """
+    st = os.stat(cache_path)
+    signature = (st.st_mtime_ns, st.st_size)
+    
+    hit = _decoded_cache.get(cache_path)
+    if hit and hit[0] == signature:
+        with _decoded_lock:
+            if cache_path in _decoded_cache:
+                _decoded_cache.move_to_end(cache_path)
+        return hit[1]
+    
+    # Decode straight from bytes - skips the text-mode decoding layer
+    with open(cache_path, 'rb') as f:
+        data = json.loads(f.read())
+    _remember_decoded(cache_path, signature, data)
+    return data
 
 
 def read_cache(cache_type: str, key: str) -> Optional[dict]:
     """Read from cache if not expired."""
-    cache_path = get_cache_path(cache_type, key)
-    
-    if not cache_path.exists():
+    if not USE_CACHE:
         return None
+    cache_path = get_cache_path(cache_type, key)
     
     try:
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_cache_file(cache_path)
         
         # Check TTL
         cached_at = data.get("_cached_at", 0)
@@ -126,12 +186,23 @@ def read_cache(cache_type: str, key: str) -> Optional[dict]:
             return None  # Cache expired
         
         return data.get("_data")
-    except (OSError, json.JSONDecodeError, KeyError):
+    except (OSError, ValueError, KeyError):  # ValueError covers bad JSON and bad UTF-8
         return None
 
 
-def write_cache(cache_type: str, key: str, data) -> None:
-    """Write data to cache."""
+def read_stale_cache(cache_type: str, key: str) -> Optional[dict]:
+    """Read a cache entry ignoring TTL, for revalidation (has "_data" and maybe "_etag")."""
+    if not USE_CACHE:
+        return None
+    try:
+        data = load_cache_file(get_cache_path(cache_type, key))
+        return data if isinstance(data, dict) and "_data" in data else None
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache(cache_type: str, key: str, data, etag: str = None) -> None:
+    """Write data to cache, with the response ETag when there is one."""
     cache_path = get_cache_path(cache_type, key)
     
     try:
@@ -142,16 +213,25 @@ def write_cache(cache_type: str, key: str, data) -> None:
             "_key": key,
             "_data": data
         }
+        if etag:
+            cache_data["_etag"] = etag
         
         with open(cache_path, 'w', encoding='utf-8') as f:
             json.dump(cache_data, f, ensure_ascii=False)
     except (OSError, TypeError):
         pass  # Cache write failure is not critical
+    finally:
+        # A same-size rewrite within a coarse mtime tick (1s on HFS+, ext3,
+        # many network mounts) keeps the old signature - drop the old copy
+        with _decoded_lock:
+            _decoded_cache.pop(cache_path, None)
 
 
 def clear_cache(cache_type: str = None) -> int:
     """Clear cache. If cache_type is None, clear all caches."""
     count = 0
+    with _decoded_lock:
+        _decoded_cache.clear()
     
     if cache_type:
         cache_dir = CACHE_DIR / cache_type
@@ -170,6 +250,138 @@ def clear_cache(cache_type: str = None) -> int:
     return count
 
 
+# =============================================================================
+# HTTP (keep-alive connections)
+# =============================================================================
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+DEFAULT_HEADERS = {"User-Agent": "github-trending-cli"}
+
+# One connection per (scheme, host) per thread, reused across requests
+_http_local = threading.local()
+
+
+def _get_connection(scheme: str, host: str, timeout: float):
+    """Return this thread's open connection to host, creating it on first use."""
+    conns = getattr(_http_local, "conns", None)
+    if conns is None:
+        conns = _http_local.conns = {}
+    
+    conn = conns.get((scheme, host))
+    if conn is None:
+        conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = conns[(scheme, host)] = conn_class(host, timeout=timeout)
+    else:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+    return conn
+
+
+def http_request(url: str, headers: dict = None, data: bytes = None,
+                 timeout: float = 15, max_redirects: int = 5) -> tuple:
+    """Send a GET (or POST when data is given) over a reused keep-alive connection.
+    
+    Saves a TCP + TLS handshake on every request after the first to a host.
+    Returns (status, headers, body_bytes); redirects are followed. Like
+    urlopen, statuses >= 400 raise HTTPError and connection failures raise
+    URLError.
+    """
+    method = "GET" if data is None else "POST"
+    
+    for _ in range(max_redirects + 1):
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        conn = _get_connection(parts.scheme, parts.netloc, timeout)
+        
+        # A reused connection may have been closed by the server - retry once on a fresh one
+        for attempt in (0, 1):
+            reused = conn.sock is not None
+            try:
+                conn.request(method, path, body=data, headers=headers or DEFAULT_HEADERS)
+                response = conn.getresponse()
+                body = response.read()
+                break
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                if attempt or not reused:
+                    raise URLError(e)
+        
+        if response.will_close:
+            conn.close()
+        
+        location = response.getheader("Location")
+        if response.status in REDIRECT_CODES and location:
+            url = urljoin(url, location)
+            if response.status == 303:
+                method, data = "GET", None
+            continue
+        
+        if response.status >= 400:
+            raise HTTPError(url, response.status, response.reason, response.headers, io.BytesIO(body))
+        return response.status, response.headers, body
+    
+    raise URLError(f"Too many redirects: {url}")
+
+
+# =============================================================================
+# GitHub API (token)
+# =============================================================================
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_JSON = "application/vnd.github+json"
+
+
+def _github_token() -> str:
+    """Token for direct API calls (GITHUB_TOKEN, or gh's GH_TOKEN); empty when unset."""
+    return os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN") or ""
+
+
+def github_api(path: str, accept: str = GITHUB_JSON, data: bytes = None) -> bytes:
+    """Call api.github.com with the env token over the shared keep-alive connection.
+    
+    Saves the gh process spawn (and its own TLS + auth) on every call.
+    Callers check _github_token() first and keep the gh CLI path for when
+    no token is set. Errors raise like http_request.
+    """
+    headers = dict(DEFAULT_HEADERS, Accept=accept, Authorization=f"Bearer {_github_token()}")
+    _, _, body = http_request(f"{GITHUB_API_URL}{path}", headers, data=data)
+    return body
+
+
+def github_api_revalidate(path: str, etag: str = None) -> tuple:
+    """GET an API path, sending If-None-Match when an ETag is cached.
+    
+    Returns (etag, body); body is None on 304 Not Modified, which GitHub
+    does not count against the rate limit.
+    """
+    headers = dict(DEFAULT_HEADERS, Accept=GITHUB_JSON, Authorization=f"Bearer {_github_token()}")
+    if etag:
+        headers["If-None-Match"] = etag
+    status, response_headers, body = http_request(f"{GITHUB_API_URL}{path}", headers)
+    return response_headers.get("ETag") or etag, None if status == 304 else body
+
+
+def github_graphql(query: str, **variables) -> Optional[dict]:
+    """Run a GraphQL query: POSTed directly with a token, else via gh api graphql.
+    
+    Returns the "data" object, or None when the query itself fails.
+    """
+    try:
+        if _github_token():
+            payload = {"query": query, "variables": variables}
+            body = github_api("/graphql", data=json.dumps(payload).encode())
+        else:
+            cmd = ['gh', 'api', 'graphql', '-f', f'query={query}']
+            for key, value in variables.items():
+                # -F sends numbers typed; -f always sends strings
+                cmd += ['-F' if isinstance(value, int) else '-f', f'{key}={value}']
+            body = subprocess.run(cmd, capture_output=True).stdout
+        return json.loads(body or b"{}").get("data")
+    except (OSError, ValueError):  # includes URLError/HTTPError
+        return None
+
+
 # =============================================================================
 # Rate Limiting
 # =============================================================================
@@ -189,84 +401,119 @@ def rate_limit():
 # Fallback Scraper
 # =============================================================================
 
+# Trending page markup, anchored on the element each field lives in so no
+# pattern has to scan past unrelated markup (no [\s\S]*? backtracking).
+# Kept as separate patterns: each starts with a literal, which re scans for
+# far faster than it can step one combined alternation through the markup.
+_TITLE_RE = re.compile(rb'<h2[^>]*>\s*<a[^>]*?href="/([^/"]+/[^/"]+)"')
+_DESC_RE = re.compile(rb'<p class="[^"]*col-9[^"]*"[^>]*>([^<]+)</p>')
+_LANG_RE = re.compile(rb'itemprop="programmingLanguage">([^<]+)<')
+# Counts follow an optional octicon: <a href=".../stargazers"><svg>...</svg> 1,234</a>
+_STARGAZERS_RE = re.compile(rb'/stargazers"[^>]*>\s*(?:<svg.*?</svg>)?\s*([\d,]+)', re.DOTALL)
+_PERIOD_STARS_RE = re.compile(rb'float-sm-right"[^>]*>\s*(?:<svg.*?</svg>)?\s*([\d,]+)\s*stars?', re.DOTALL)
+
+
 def scrape_trending(language: str = "", since: str = "daily") -> list:
     """Fallback: Scrape trending directly from GitHub if API fails."""
     url = f"{GITHUB_TRENDING_URL}/{language}?since={since}"
     
     try:
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(req, timeout=15) as response:
-            html = response.read().decode('utf-8')
+        _, _, body = http_request(url, {"User-Agent": "Mozilla/5.0"})
     except Exception as e:
         print(f"❌ Scraping failed: {e}")
         return []
     
-    repos = []
+    return parse_trending_html(body)
+
+
+_ARTICLE_OPEN = b'<article class="Box-row"'
+_ARTICLE_CLOSE = b'</article>'
+
+
+def _iter_articles(html: bytes):
+    """Yield each <article class="Box-row">...</article> block with two bytes.find scans."""
+    pos = 0
+    while True:
+        start = html.find(_ARTICLE_OPEN, pos)
+        if start < 0:
+            return
+        end = html.find(_ARTICLE_CLOSE, start)
+        if end < 0:
+            return
+        pos = end + len(_ARTICLE_CLOSE)
+        yield html[start:pos]
+
+
+def parse_trending_html(html) -> list:
+    """Parse the repo entries of a github.com/trending page (simple parser, no dependencies).
     
-    # Parse repo entries using regex (simple parser, no dependencies)
-    repo_pattern = r'<article class="Box-row".*?</article>'
-    matches = re.findall(repo_pattern, html, re.DOTALL)
+    Works on the raw response bytes; only the extracted fields are decoded.
+    """
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+    repos = []
     
-    for match in matches:
-        try:
-            # Extract repo path
-            path_match = re.search(r'href="/([^/]+/[^"]+)"', match)
-            if not path_match:
-                continue
-            
-            full_path = path_match.group(1).strip()
-            if '/' not in full_path:
-                continue
-            
-            # Extract description
-            desc_match = re.search(r'<p class="[^"]*col-9[^"]*"[^>]*>([^<]+)</p>', match)
-            description = desc_match.group(1).strip() if desc_match else ""
-            
-            # Extract stars
-            stars_match = re.search(r'(\d[\d,]*)\s*stars', match, re.IGNORECASE)
-            if not stars_match:
-                stars_match = re.search(r'stargazers[^>]*>[\s\S]*?(\d[\d,]*)', match)
-            stars = stars_match.group(1) if stars_match else "0"
-            
-            # Extract language
-            lang_match = re.search(r'itemprop="programmingLanguage">([^<]+)<', match)
-            language_name = lang_match.group(1).strip() if lang_match else ""
-            
-            # Extract today's stars
-            today_match = re.search(r'(\d[\d,]*)\s*stars?\s*today', match, re.IGNORECASE)
-            today_stars = today_match.group(1) if today_match else ""
-            
-            repos.append({
-                "title": full_path,
-                "description": description,
-                "stars": stars,
-                "language": language_name,
-                "todayStars": today_stars,
-                "link": f"https://github.com/{full_path}"
-            })
-        except (AttributeError, IndexError, ValueError):
+    for match in _iter_articles(html):
+        # Repo path from the <h2> heading link
+        path_match = _TITLE_RE.search(match)
+        if not path_match:
             continue
+        full_path = path_match.group(1).decode('utf-8', 'replace').strip()
+        
+        # Every other field follows the heading, so skip the Star/Sponsor
+        # buttons ahead of it
+        body = path_match.end()
+        desc_match = _DESC_RE.search(match, body)
+        lang_match = _LANG_RE.search(match, body)
+        stars_match = _STARGAZERS_RE.search(match, body)
+        # "N stars today" / "this week" / "this month" for the selected period
+        today_match = _PERIOD_STARS_RE.search(match, body)
+        
+        stars = stars_match.group(1).decode('ascii') if stars_match else "0"
+        today = today_match.group(1).decode('ascii') if today_match else ""
+        repos.append({
+            "title": full_path,
+            "description": desc_match.group(1).decode('utf-8', 'replace').strip() if desc_match else "",
+            "stars": stars,
+            "_stars_int": parse_stars(stars),
+            "language": lang_match.group(1).decode('utf-8', 'replace').strip() if lang_match else "",
+            "todayStars": today,
+            "_today_int": parse_stars(today),
+            "link": f"https://github.com/{full_path}"
+        })
     
     return repos
 
 
 def fetch_trending(since: str, language: str, use_cache: bool = True) -> dict:
-    """Fetch trending data from the API with caching and fallback."""
+    """Fetch trending data from the API with caching and fallback.
+    
+    An expired cache entry is revalidated with its ETag, so an unchanged
+    trending file costs a bodiless 304 instead of a download.
+    """
     cache_key = f"{since}_{language}"
     
     # Check cache first
+    stale = None
     if use_cache:
         cached = read_cache("trending", cache_key)
         if cached:
             return cached
+        stale = read_stale_cache("trending", cache_key)
     
     url = f"{BASE_URL}/{since}/{language.lower()}.json"
+    etag = stale.get("_etag") if stale else None
+    headers = dict(DEFAULT_HEADERS, **{"If-None-Match": etag}) if etag else None
     
     try:
         rate_limit()
-        with urlopen(url, timeout=15) as response:
-            data = json.loads(response.read().decode('utf-8'))
-
+        status, response_headers, body = http_request(url, headers)
+        if status == 304:
+            data = stale["_data"]
+        else:
+            data = json.loads(body)
+            etag = response_headers.get("ETag")
+            
             # Normalize API field names to internal schema
             if 'items' in data:
                 for item in data['items']:
@@ -274,11 +521,15 @@ def fetch_trending(since: str, language: str, use_cache: bool = True) -> dict:
                         item['link'] = item['url']
                     if 'addStars' in item and 'todayStars' not in item:
                         item['todayStars'] = item['addStars']
-
-            # Cache the result
-            write_cache("trending", cache_key, data)
-            return data
-            
+                    # Parsed once here and cached, so filter_repos and
+                    # sort_repos never re-parse
+                    item['_stars_int'] = parse_stars(item.get('stars', '0'))
+                    item['_today_int'] = parse_stars(item.get('todayStars', '0'))
+        
+        # Cache the result (a 304 just restarts the TTL)
+        write_cache("trending", cache_key, data, etag)
+        return data
+        
     except HTTPError as e:
         if e.code == 404:
             print(f"⚠️  Language '{language}' not found in API, trying scraper...")
@@ -341,7 +592,8 @@ def fetch_search(query: str, language: str = "all", sort: str = "", top: int = 1
 
     try:
         rate_limit()
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # JSON is parsed straight from the output bytes; no text-mode decode pass
+        result = subprocess.run(cmd, capture_output=True)
     except FileNotFoundError:
         print("❌ GitHub CLI (gh) not found. Search requires gh — install from https://cli.github.com/")
         sys.exit(1)
@@ -350,12 +602,12 @@ def fetch_search(query: str, language: str = "all", sort: str = "", top: int = 1
         sys.exit(1)
 
     if result.returncode != 0:
-        print(f"❌ Search failed: {result.stderr.strip()}")
+        print(f"❌ Search failed: {result.stderr.decode('utf-8', 'replace').strip()}")
         sys.exit(1)
 
     try:
-        results = json.loads(result.stdout or "[]")
-    except json.JSONDecodeError:
+        results = json.loads(result.stdout or b"[]")
+    except ValueError:  # bad JSON or bad UTF-8
         print("❌ Could not parse search results.")
         sys.exit(1)
 
@@ -366,8 +618,10 @@ def fetch_search(query: str, language: str = "all", sort: str = "", top: int = 1
             "title": r.get("fullName", ""),
             "description": (r.get("description") or "").strip(),
             "stars": str(r.get("stargazersCount", 0)),
+            "_stars_int": r.get("stargazersCount", 0),
             "language": r.get("language", "") or "",
             "todayStars": "",
+            "_today_int": 0,
             "link": r.get("url", ""),
             "forks": r.get("forksCount", 0),
             "license": lic.get("key", "") if isinstance(lic, dict) else "",
@@ -384,108 +638,193 @@ def fetch_search(query: str, language: str = "all", sort: str = "", top: int = 1
     return data
 
 
+def parse_stars(value) -> int:
+    """Parse a star count such as "12,345" (or an int); blank or unparseable counts as 0."""
+    if isinstance(value, int):
+        return value
+    if not value:
+        return 0
+    # str.replace + int run in C - faster than walking the digits in Python
+    try:
+        return int(str(value).replace(',', ''))
+    except ValueError:
+        return 0  # the third-party feed is not trusted to send numbers
+
+
+@lru_cache(maxsize=1024)
+def parse_github_date(value: str) -> datetime:
+    """Parse a GitHub ISO-8601 timestamp (cached; trending repos repeat across runs)."""
+    # fromisoformat only accepts a trailing "Z" from Python 3.11
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def time_ago(timestamp: str) -> str:
+    """Render a GitHub timestamp as "3d ago" / "5h ago" / "12m ago" (its date if unparseable)."""
+    try:
+        diff = datetime.now(timezone.utc) - parse_github_date(timestamp)
+    except (ValueError, TypeError):
+        return timestamp[:10]
+    if diff.days > 0:
+        return f"{diff.days}d ago"
+    elif diff.seconds > 3600:
+        return f"{diff.seconds // 3600}h ago"
+    return f"{diff.seconds // 60}m ago"
+
+
 def filter_repos(repos: list, min_stars: int = 0, max_stars: int = None,
                  search: str = None) -> list:
-    """Filter repositories by various criteria."""
-    filtered = []
+    """Filter repositories by various criteria.
     
+    Returns a new list of the same dicts (no copies); each gets its parsed
+    '_stars_int' stored in place.
+    """
+    # Fetchers store the parsed count; only older cache entries need parsing
     for repo in repos:
-        # Parse stars (remove commas)
-        stars = int(repo.get('stars', '0').replace(',', ''))
-        
-        # Apply filters
-        if stars < min_stars:
-            continue
-        if max_stars and stars > max_stars:
-            continue
-        if search:
-            search_lower = search.lower()
-            title = repo.get('title', '').lower()
-            desc = repo.get('description', '').lower()
-            if search_lower not in title and search_lower not in desc:
-                continue
-        
-        # Add parsed stars for sorting
-        repo['_stars_int'] = stars
-        filtered.append(repo)
+        if repo.get('_stars_int') is None:
+            repo['_stars_int'] = parse_stars(repo.get('stars', '0'))
+    
+    # One comprehension per filter that is set, each over the previous
+    # survivors; the usual no-filter call is just the copy
+    filtered = list(repos)
+    if min_stars or max_stars:
+        upper = max_stars or float('inf')
+        filtered = [repo for repo in filtered if min_stars <= repo['_stars_int'] <= upper]
+    if search:
+        search_lower = search.lower()
+        filtered = [repo for repo in filtered
+                    if search_lower in repo.get('title', '').lower()
+                    or search_lower in repo.get('description', '').lower()]
     
     return filtered
 
 
+def _today_stars(repo: dict) -> int:
+    """Stars gained this period, parsed by the fetchers (older cache entries parse here)."""
+    today = repo.get('_today_int')
+    return parse_stars(repo.get('todayStars', '0')) if today is None else today
+
+
+# Sort key and default direction (descending?) for the --sort choices sorted locally
+_SORT_KEYS = {
+    'stars': (lambda x: x.get('_stars_int', 0), True),
+    'name': (lambda x: x.get('title', '').lower(), False),
+    'today': (_today_stars, True),
+}
+
+
+def sort_repos(repos: list, sort: str = None, reverse: bool = False, top: int = None) -> list:
+    """Sort repos for --sort/--reverse and keep the first top of them.
+    
+    With a limit, heapq keeps only top candidates instead of sorting the
+    whole list; ties stay in their original order, as with a stable sort.
+    """
+    if sort in _SORT_KEYS:
+        key, descending = _SORT_KEYS[sort]
+        if top is not None and top >= 0:
+            pick = heapq.nlargest if descending != reverse else heapq.nsmallest
+            return pick(top, repos, key=key)
+        repos = sorted(repos, key=key, reverse=descending != reverse)
+    return repos[:top]
+
+EXPORT_BUFFER_SIZE = 1 << 20  # 1 MiB, so rows are written in large chunks
+
+
+def _json_record(record: dict, indent: str = "") -> str:
+    """json.dumps(record, indent=2, ensure_ascii=False) for a flat record nested at indent.
+    
+    The json module only uses its C encoder without indent=; here the
+    str/int fields (all of them, in practice) go through the C string
+    encoder and anything else through json.dumps.
+    """
+    inner = indent + "  "
+    return "{\n" + inner + (",\n" + inner).join([
+        f"{encode_basestring(key)}: " + (
+            encode_basestring(value) if type(value) is str else str(value) if type(value) is int
+            else json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n" + inner))
+        for key, value in record.items()]) + "\n" + indent + "}"
+
+
+# CSV columns, and the repo key each one after 'rank' is read from
+_CSV_FIELDS = ('rank', 'title', 'stars', 'today_stars', 'language', 'description', 'url')
+_CSV_SOURCE_KEYS = ('title', 'stars', 'todayStars', 'language', 'description', 'link')
+
+
 def export_csv(repos: list, filename: str):
     """Export repositories to CSV file."""
     if not repos:
         print("❌ No repositories to export.")
         return
     
-    fieldnames = ['rank', 'title', 'stars', 'today_stars', 'language', 'description', 'url']
-    
-    with open(filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
+    with open(filename, 'w', newline='', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(_CSV_FIELDS)
         
-        for i, repo in enumerate(repos, 1):
-            writer.writerow({
-                'rank': i,
-                'title': repo.get('title', ''),
-                'stars': repo.get('stars', ''),
-                'today_stars': repo.get('todayStars', ''),
-                'language': repo.get('language', ''),
-                'description': repo.get('description', ''),
-                'url': repo.get('link', '')
-            })
+        # Rows as tuples in column order: no per-row dict for DictWriter to
+        # take apart again. One writerows call consumes them lazily
+        writer.writerows((i, *[repo.get(key, '') for key in _CSV_SOURCE_KEYS])
+                         for i, repo in enumerate(repos, 1))
     
     print(f"✅ Exported {len(repos)} repositories to {filename}")
 
 
 def export_json(repos: list, filename: str):
-    """Export repositories to JSON file."""
+    """Export repositories to JSON file, one record at a time."""
     if not repos:
         print("❌ No repositories to export.")
         return
 
-    clean_repos = []
-    for i, repo in enumerate(repos, 1):
-        title = repo.get('title', '')
-        clean_repos.append({
-            'rank': i,
-            'title': title,
-            'url': repo.get('link', f"https://github.com/{title}"),
-            'description': repo.get('description', ''),
-            'language': repo.get('language', ''),
-            'stars': repo.get('stars', '0'),
-            'stars_today': repo.get('todayStars', ''),
-        })
-
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(clean_repos, f, indent=2, ensure_ascii=False)
+    with open(filename, 'w', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as f:
+        # Same layout as json.dump(records, indent=2) without holding every record
+        f.write("[\n  ")
+        for i, repo in enumerate(repos, 1):
+            title = repo.get('title', '')
+            record = {
+                'rank': i,
+                'title': title,
+                'url': repo.get('link', f"https://github.com/{title}"),
+                'description': repo.get('description', ''),
+                'language': repo.get('language', ''),
+                'stars': repo.get('stars', '0'),
+                'stars_today': repo.get('todayStars', ''),
+            }
+            if i > 1:
+                f.write(",\n  ")
+            f.write(_json_record(record, "  "))
+        f.write("\n]")
 
     print(f"✅ Exported {len(repos)} repositories to {filename}")
 
 
-def clone_repo(repo: dict, target_dir: str = None, shallow: bool = False) -> bool:
-    """Clone a repository using git."""
+CLONE_WORKERS = 8  # concurrent git clones when several repos are selected
+
+
+def _prepare_clone(repo: dict, target_dir: str = None, shallow: bool = False) -> Optional[tuple]:
+    """Resolve a repo's clone path and git command, asking before overwriting.
+    
+    Returns (title, clone_path, cmd), or None when there is nothing to clone.
+    """
     title = repo.get('title', '')
     if not title:
         print("❌ Invalid repository")
-        return False
+        return None
     
     # Build clone URL
     clone_url = f"https://github.com/{title}.git"
     
     # Determine target directory
     if target_dir:
-        clone_path = os.path.join(target_dir, title.split('/')[-1])
+        clone_path = os.path.join(target_dir, title.rpartition('/')[2])
     else:
-        clone_path = title.split('/')[-1]
+        clone_path = title.rpartition('/')[2]
     
     # Check if already exists
     if os.path.exists(clone_path):
         print(f"⚠️  Directory already exists: {clone_path}")
         response = input("   Overwrite? (y/N): ").strip().lower()
         if response != 'y':
-            return False
-        import shutil
+            return None
         shutil.rmtree(clone_path)
     
     # Build git command
@@ -493,21 +832,70 @@ def clone_repo(repo: dict, target_dir: str = None, shallow: bool = False) -> boo
     if shallow:
         cmd.extend(['--depth', '1'])
     cmd.extend([clone_url, clone_path])
-    
-    print(f"📦 Cloning {title}...")
-    print(f"   → {clone_path}")
-    
+    return title, clone_path, cmd
+
+
+def _run_clone(title: str, clone_path: str, cmd: list) -> tuple:
+    """Run git clone without printing; returns (success, result message)."""
     try:
         result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"✅ Successfully cloned {title}")
-            return True
-        else:
-            print(f"❌ Failed to clone: {result.stderr.strip()}")
-            return False
     except FileNotFoundError:
-        print("❌ Git is not installed or not in PATH")
+        return False, "❌ Git is not installed or not in PATH"
+    if result.returncode == 0:
+        return True, f"✅ Successfully cloned {title}"
+    return False, f"❌ Failed to clone {title}: {result.stderr.strip()}"
+
+
+def clone_repo(repo: dict, target_dir: str = None, shallow: bool = False) -> bool:
+    """Clone a repository using git."""
+    job = _prepare_clone(repo, target_dir, shallow)
+    if not job:
         return False
+    
+    title, clone_path, _ = job
+    print(f"📦 Cloning {title}...")
+    print(f"   → {clone_path}")
+    
+    ok, message = _run_clone(*job)
+    print(message)
+    return ok
+
+
+def clone_repos(repos: list, target_dir: str = None, shallow: bool = False) -> int:
+    """Clone several repositories concurrently and return how many succeeded.
+    
+    Overwrite prompts are answered up front, one at a time; only the git
+    clones run in parallel, and each reports on its own line as it finishes.
+    """
+    jobs = []
+    claimed = set()
+    for repo in repos:
+        job = _prepare_clone(repo, target_dir, shallow)
+        if not job:
+            continue
+        title, clone_path, _ = job
+        if clone_path in claimed:
+            print(f"⚠️  Skipping {title}: {clone_path} is taken by another selected repo")
+            continue
+        claimed.add(clone_path)
+        jobs.append(job)
+    
+    if not jobs:
+        return 0
+    
+    for title, clone_path, _ in jobs:
+        print(f"📦 Cloning {title}...")
+        print(f"   → {clone_path}")
+    print()
+    
+    success = 0
+    with ThreadPoolExecutor(max_workers=min(CLONE_WORKERS, len(jobs))) as pool:
+        for future in as_completed([pool.submit(_run_clone, *job) for job in jobs]):
+            ok, message = future.result()
+            print(message)
+            success += ok
+    print()
+    return success
 
 
 def interactive_clone(repos: list, target_dir: str = None, shallow: bool = False):
@@ -562,11 +950,7 @@ def interactive_clone(repos: list, target_dir: str = None, shallow: bool = False
     
     # Clone selected repos
     print(f"\n📥 Cloning {len(indices)} repositories...\n")
-    success = 0
-    for i in indices:
-        if clone_repo(repos[i], target_dir, shallow):
-            success += 1
-        print()
+    success = clone_repos([repos[i] for i in indices], target_dir, shallow)
     
     print("=" * 60)
     print(f"✅ Cloned {success}/{len(indices)} repositories")
@@ -574,6 +958,27 @@ def interactive_clone(repos: list, target_dir: str = None, shallow: bool = False
         print(f"📁 Location: {os.path.abspath(target_dir)}")
 
 
+# One --clone-nums entry: "3" or "3-5" (spaces allowed around either number)
+_NUMBER_RANGE_RE = re.compile(r"\s*(\d+)\s*(?:-\s*(\d+)\s*)?")
+CLONE_NUMBERS_LIMIT = 1000  # more numbers than any listing holds; stops "1-999999999"
+
+
+def parse_clone_numbers(spec: str) -> Optional[list]:
+    """Parse "1,3-5,7" into [1, 3, 4, 5, 7]; None when malformed or over CLONE_NUMBERS_LIMIT."""
+    numbers = []
+    for part in spec.split(','):
+        match = _NUMBER_RANGE_RE.fullmatch(part)
+        if not match:
+            return None
+        start = int(match.group(1))
+        end = int(match.group(2) or start)
+        # Checked before expanding, so a huge range is never materialized
+        if len(numbers) + end - start >= CLONE_NUMBERS_LIMIT:
+            return None
+        numbers.extend(range(start, end + 1))
+    return numbers
+
+
 def clone_by_number(repos: list, numbers: list, target_dir: str = None, shallow: bool = False):
     """Clone specific repositories by their number in the list."""
     if not repos:
@@ -583,19 +988,38 @@ def clone_by_number(repos: list, numbers: list, target_dir: str = None, shallow:
     if target_dir:
         os.makedirs(target_dir, exist_ok=True)
     
-    success = 0
+    selected = []
     for num in numbers:
         idx = num - 1
         if 0 <= idx < len(repos):
-            if clone_repo(repos[idx], target_dir, shallow):
-                success += 1
-            print()
+            selected.append(repos[idx])
         else:
             print(f"❌ Invalid number: {num} (valid: 1-{len(repos)})")
     
+    success = clone_repos(selected, target_dir, shallow)
     print(f"✅ Cloned {success}/{len(numbers)} repositories")
 
 
+def _inspect_clone(item_path: str, name: str) -> dict:
+    """Describe one cloned repository (remote URL and size)."""
+    # Get remote URL to identify the repo
+    try:
+        result = subprocess.run(
+            ['git', '-C', item_path, 'remote', 'get-url', 'origin'],
+            capture_output=True, text=True
+        )
+        remote = result.stdout.strip() if result.returncode == 0 else "unknown"
+    except OSError:
+        remote = "unknown"
+    
+    return {
+        'name': name,
+        'path': item_path,
+        'remote': remote,
+        'size': get_dir_size(item_path)
+    }
+
+
 def list_cloned_repos(clone_dir: str = None) -> list:
     """List all cloned repositories in the clone directory."""
     target = clone_dir or "."
@@ -603,45 +1027,40 @@ def list_cloned_repos(clone_dir: str = None) -> list:
     if not os.path.exists(target):
         return []
     
-    clones = []
-    for item in os.listdir(target):
-        item_path = os.path.join(target, item)
-        git_path = os.path.join(item_path, ".git")
-        if os.path.isdir(item_path) and os.path.exists(git_path):
-            # Get remote URL to identify the repo
-            try:
-                result = subprocess.run(
-                    ['git', '-C', item_path, 'remote', 'get-url', 'origin'],
-                    capture_output=True, text=True
-                )
-                remote = result.stdout.strip() if result.returncode == 0 else "unknown"
-            except OSError:
-                remote = "unknown"
-            
-            # Get size
-            size = get_dir_size(item_path)
-            
-            clones.append({
-                'name': item,
-                'path': item_path,
-                'remote': remote,
-                'size': size
-            })
+    # One directory read gives each entry's type; only directories get a .git stat
+    candidates = []
+    with os.scandir(target) as entries:
+        for entry in entries:
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, ".git")):
+                candidates.append((entry.path, entry.name))
+    
+    if not candidates:
+        return []
     
-    return clones
+    # git subprocesses and tree walks are independent - inspect clones in parallel
+    with ThreadPoolExecutor(max_workers=min(CLONE_WORKERS, len(candidates))) as pool:
+        return list(pool.map(lambda candidate: _inspect_clone(*candidate), candidates))
 
 
 def get_dir_size(path: str) -> str:
     """Get human-readable directory size."""
+    # scandir entries carry file types from the directory read, so only
+    # regular files cost a stat call (symlinks are not followed)
     total = 0
-    try:
-        for dirpath, dirnames, filenames in os.walk(path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                if os.path.exists(fp):
-                    total += os.path.getsize(fp)
-    except OSError:
-        return "?"
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue  # Unreadable or vanished directory
     
     # Convert to human readable
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -653,8 +1072,6 @@ def get_dir_size(path: str) -> str:
 
 def cleanup_repo(repo_path: str) -> bool:
     """Remove a cloned repository."""
-    import shutil
-    
     if not os.path.exists(repo_path):
         print(f"❌ Path not found: {repo_path}")
         return False
@@ -800,7 +1217,7 @@ def explore_repo(repo: dict, clone_dir: str = None, shallow: bool = False,
         return False
     
     # Determine path
-    repo_name = title.split('/')[-1]
+    repo_name = title.rpartition('/')[2]
     if clone_dir:
         repo_path = os.path.join(clone_dir, repo_name)
     else:
@@ -856,56 +1273,77 @@ def explore_by_number(repos: list, number: int, clone_dir: str = None,
         print(f"❌ Invalid number: {number} (valid: 1-{len(repos)})")
 
 
+def print_json(data) -> None:
+    """Print data as indented JSON, streamed to stdout chunk by chunk.
+    
+    Same output as print(json.dumps(data, indent=2)) without first building
+    the whole string - a --raw tree of a large repo runs to tens of MB.
+    """
+    json.dump(data, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
 def output_json(repos: list, data: dict):
     """Output repos as JSON for agent consumption."""
-    output = {
-        "updated": data.get("pubDate", ""),
-        "count": len(repos),
-        "repositories": []
-    }
-    
+    repositories = []
     for i, repo in enumerate(repos, 1):
-        output["repositories"].append({
+        title = repo.get("title", "")
+        author, _, name = title.rpartition("/")
+        repositories.append({
             "rank": i,
-            "title": repo.get("title", ""),
-            "author": repo.get("title", "").split("/")[0] if "/" in repo.get("title", "") else "",
-            "name": repo.get("title", "").split("/")[-1] if "/" in repo.get("title", "") else repo.get("title", ""),
-            "url": f"https://github.com/{repo.get('title', '')}",
-            "clone_url": f"https://github.com/{repo.get('title', '')}.git",
+            "title": title,
+            "author": author.split("/")[0],
+            "name": name,
+            "url": f"https://github.com/{title}",
+            "clone_url": f"https://github.com/{title}.git",
             "description": repo.get("description", ""),
             "language": repo.get("language", ""),
             "stars": repo.get("stars", ""),
             "stars_today": repo.get("todayStars", "")
         })
     
-    print(json.dumps(output, indent=2, ensure_ascii=False))
+    # Same text as json.dumps({"updated", "count", "repositories"}, indent=2,
+    # ensure_ascii=False), with the records built by the faster _json_record
+    text = (f'{{\n  "updated": {json.dumps(data.get("pubDate", ""), ensure_ascii=False)},\n'
+            f'  "count": {len(repos)},\n  "repositories": ')
+    if repositories:
+        text += "[\n    " + ",\n    ".join([_json_record(r, "    ") for r in repositories]) + "\n  ]\n}"
+    else:
+        text += "[]\n}"
+    
+    # Hand UTF-8 bytes straight to the binary layer - skips print's text
+    # layer (and a non-UTF-8 console codec) for large agent payloads
+    stream = getattr(sys.stdout, "buffer", None)
+    if stream is None:
+        print(text)
+        return
+    sys.stdout.flush()
+    stream.write(text.encode("utf-8") + b"\n")
+    stream.flush()
 
 
 def fetch_readme(repo_title: str) -> str:
     """Fetch README from GitHub using gh CLI without cloning."""
     try:
-        # Try to get README using gh api
+        # Try to get README using gh api; the raw media type returns the file
+        # body itself instead of base64 inside a JSON envelope
         result = subprocess.run(
-            ['gh', 'api', f'repos/{repo_title}/readme', '--jq', '.content'],
-            capture_output=True, text=True
+            ['gh', 'api', '-H', 'Accept: application/vnd.github.raw', f'repos/{repo_title}/readme'],
+            capture_output=True
         )
         
         if result.returncode == 0 and result.stdout.strip():
-            # README is base64 encoded
-            import base64
-            content = base64.b64decode(result.stdout.strip()).decode('utf-8')
-            return content
+            return result.stdout.decode('utf-8')
         else:
-            # Fallback: try raw URL
+            # Fallback: try raw URL (both branches share one keep-alive connection)
             readme_url = f"https://raw.githubusercontent.com/{repo_title}/main/README.md"
             try:
-                with urlopen(readme_url, timeout=10) as response:
-                    return response.read().decode('utf-8')
+                _, _, body = http_request(readme_url, timeout=10)
             except (URLError, HTTPError):
                 # Try master branch
                 readme_url = f"https://raw.githubusercontent.com/{repo_title}/master/README.md"
-                with urlopen(readme_url, timeout=10) as response:
-                    return response.read().decode('utf-8')
+                _, _, body = http_request(readme_url, timeout=10)
+            return body.decode('utf-8')
     except FileNotFoundError:
         print("❌ GitHub CLI (gh) not found. Install from https://cli.github.com/")
         return None
@@ -914,6 +1352,19 @@ def fetch_readme(repo_title: str) -> str:
         return None
 
 
+README_WORKERS = 8  # concurrent README fetches for bulk (agent) flows
+
+
+def fetch_readmes_bulk(titles: list) -> dict:
+    """Fetch several READMEs concurrently; maps each title to its README (None on failure)."""
+    titles = list(dict.fromkeys(titles))
+    if not titles:
+        return {}
+    # Each worker thread keeps its own keep-alive connection for the raw fallback
+    with ThreadPoolExecutor(max_workers=min(README_WORKERS, len(titles))) as pool:
+        return dict(zip(titles, pool.map(fetch_readme, titles)))
+
+
 def show_readme(repo_title: str, max_lines: int = None, raw: bool = False):
     """Display README for a repository."""
     print(f"\n📄 Fetching README for {repo_title}...")
@@ -1012,16 +1463,25 @@ def readme_by_number(repos: list, number: int, max_lines: int = None, raw: bool
 
 def fetch_repo_info(repo_title: str) -> dict:
     """Fetch repository information using gh CLI."""
+    # Same key and payload as the analyzer's /repos/{owner}/{repo} request
+    cache_key = f"/repos/{repo_title}"
+    cached = read_cache("repo_info", cache_key)
+    if cached:
+        return cached
+    
     try:
         result = subprocess.run(
             ['gh', 'api', f'repos/{repo_title}'],
-            capture_output=True, text=True
+            capture_output=True
         )
         
         if result.returncode == 0:
-            return json.loads(result.stdout)
+            # json.loads takes the raw bytes - no locale decode pass
+            info = json.loads(result.stdout)
+            write_cache("repo_info", cache_key, info)
+            return info
         else:
-            print(f"❌ Failed to fetch repo info: {result.stderr.strip()}")
+            print(f"❌ Failed to fetch repo info: {result.stderr.decode('utf-8', 'replace').strip()}")
             return None
     except FileNotFoundError:
         print("❌ GitHub CLI (gh) not found. Install from https://cli.github.com/")
@@ -1031,6 +1491,97 @@ def fetch_repo_info(repo_title: str) -> dict:
         return None
 
 
+# Repos per `gh api graphql` call (aliased repository fields)
+INFO_BATCH_SIZE = 20
+
+# Every REST repo field the info/detail views read, in one GraphQL selection
+_INFO_FIELDS = """
+  nameWithOwner description url homepageUrl diskUsage
+  stargazerCount forkCount isFork isArchived
+  createdAt updatedAt pushedAt
+  watchers { totalCount }
+  issues(states: OPEN) { totalCount }
+  pullRequests(states: OPEN) { totalCount }
+  primaryLanguage { name }
+  licenseInfo { spdxId }
+  defaultBranchRef { name }
+  repositoryTopics(first: 20) { nodes { topic { name } } }
+"""
+
+
+def _graphql_repo_to_rest(node: dict) -> dict:
+    """Map a GraphQL repository node onto the REST field names callers use."""
+    license_info = node.get("licenseInfo")
+    return {
+        "full_name": node.get("nameWithOwner", ""),
+        "description": node.get("description"),
+        "html_url": node.get("url", ""),
+        "clone_url": f"{node.get('url', '')}.git",
+        "homepage": node.get("homepageUrl"),
+        "size": node.get("diskUsage"),  # None when GitHub did not report it
+        "stargazers_count": node.get("stargazerCount", 0),
+        "forks_count": node.get("forkCount", 0),
+        "subscribers_count": (node.get("watchers") or {}).get("totalCount", 0),
+        # REST counts open PRs as issues too
+        "open_issues_count": ((node.get("issues") or {}).get("totalCount", 0)
+                              + (node.get("pullRequests") or {}).get("totalCount", 0)),
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "license": {"spdx_id": license_info.get("spdxId") or "NOASSERTION"} if license_info else None,
+        "topics": [t["topic"]["name"] for t in (node.get("repositoryTopics") or {}).get("nodes", [])],
+        "created_at": node.get("createdAt", ""),
+        "updated_at": node.get("updatedAt", ""),
+        "pushed_at": node.get("pushedAt", ""),
+        "default_branch": (node.get("defaultBranchRef") or {}).get("name", "main"),
+        "fork": node.get("isFork", False),
+        "archived": node.get("isArchived", False),
+    }
+
+
+def fetch_repos_info_batch(titles: list) -> dict:
+    """Fetch repo info for many repos with one gh GraphQL call per batch.
+    
+    Returns {owner/repo: info} in fetch_repo_info's REST shape. Cached repos
+    are served from cache; repos that fail or do not exist are left out so
+    callers can fall back to fetch_repo_info. The mapped GraphQL records
+    lack REST-only fields, so they are cached on their own ("repo_info_batch")
+    and never stand in for a full REST payload.
+    """
+    infos = {}
+    missing = []
+    for title in titles:
+        key = f"/repos/{title}"
+        cached = read_cache("repo_info", key) or read_cache("repo_info_batch", key)
+        if cached:
+            infos[title] = cached
+        elif title.count("/") == 1:
+            missing.append(title)
+    
+    for start in range(0, len(missing), INFO_BATCH_SIZE):
+        batch = missing[start:start + INFO_BATCH_SIZE]
+        # json.dumps quoting is valid GraphQL string syntax
+        aliases = "\n".join(
+            f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{{_INFO_FIELDS}}}"
+            for i, (owner, name) in enumerate(title.split("/") for title in batch)
+        )
+        try:
+            result = subprocess.run(
+                ['gh', 'api', 'graphql', '-f', f'query={{{aliases}}}'],
+                capture_output=True
+            )
+            # Missing repos come back as null nodes next to the found ones
+            data = json.loads(result.stdout or b"{}").get("data") or {}
+        except (OSError, ValueError):
+            break  # gh missing or unusable - fall back per repo
+        
+        for i, title in enumerate(batch):
+            node = data.get(f"r{i}")
+            if node:
+                info = infos[title] = _graphql_repo_to_rest(node)
+                write_cache("repo_info_batch", f"/repos/{title}", info)
+    
+    return infos
+
+
 def show_repo_info(repo_title: str, raw: bool = False):
     """Display repository information."""
     info = fetch_repo_info(repo_title)
@@ -1059,7 +1610,7 @@ def show_repo_info(repo_title: str, raw: bool = False):
             "is_archived": info.get("archived", False),
             "homepage": info.get("homepage", "")
         }
-        print(json.dumps(output, indent=2))
+        print_json(output)
         return
     
     # Human-readable format
@@ -1076,26 +1627,11 @@ def show_repo_info(repo_title: str, raw: bool = False):
     homepage = info.get("homepage", "")
     
     # Parse pushed_at to relative time
-    if pushed_at:
-        try:
-            from datetime import datetime, timezone
-            pushed = datetime.fromisoformat(pushed_at.replace('Z', '+00:00'))
-            now = datetime.now(timezone.utc)
-            diff = now - pushed
-            if diff.days > 0:
-                last_push = f"{diff.days}d ago"
-            elif diff.seconds > 3600:
-                last_push = f"{diff.seconds // 3600}h ago"
-            else:
-                last_push = f"{diff.seconds // 60}m ago"
-        except (ValueError, TypeError):
-            last_push = pushed_at[:10]
-    else:
-        last_push = "Unknown"
+    last_push = time_ago(pushed_at) if pushed_at else "Unknown"
     
-    print(f"\n{'=' * 60}")
+    print("\n" + "=" * 60)
     print(f"📊 Repository Info: {repo_title}")
-    print(f"{'=' * 60}")
+    print("=" * 60)
     print(f"  ⭐ Stars:       {stars:,}")
     print(f"  🍴 Forks:       {forks:,}")
     print(f"  🐛 Open Issues: {issues:,}")
@@ -1114,13 +1650,26 @@ def show_repo_info(repo_title: str, raw: bool = False):
         print(f"  🏷️  Topics:      {', '.join(topics[:8])}")
     
     print(f"  🔗 URL:         https://github.com/{repo_title}")
-    print(f"{'=' * 60}")
+    print("=" * 60)
+
+
+_TREE_FIELDS = ("path", "type", "size")  # all the display, --raw and deps lookups read
+
+
+def _slim_tree(payload: bytes) -> list:
+    """Parse a git/trees response, keeping only _TREE_FIELDS of each entry.
+    
+    sha, mode and url make up most of a recursive tree's bytes but are never
+    read, so dropping them shrinks both the in-memory list and the cache file.
+    """
+    return [{k: item[k] for k in _TREE_FIELDS if k in item}
+            for item in json.loads(payload).get("tree", [])]
 
 
 def fetch_repo_tree(repo_title: str, branch: str = None) -> list:
     """Fetch repository file tree using gh CLI."""
     try:
-        # First get default branch if not specified
+        # First get default branch if not specified (repo info is cached)
         if not branch:
             info = fetch_repo_info(repo_title)
             if info:
@@ -1128,26 +1677,33 @@ def fetch_repo_tree(repo_title: str, branch: str = None) -> list:
             else:
                 branch = "main"
         
+        cache_key = f"/repos/{repo_title}/git/trees/{branch}"
+        cached = read_cache("tree", cache_key)
+        if cached:
+            return cached
+        
         result = subprocess.run(
             ['gh', 'api', f'repos/{repo_title}/git/trees/{branch}?recursive=1'],
-            capture_output=True, text=True
+            capture_output=True
         )
         
         if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return data.get("tree", [])
+            tree = _slim_tree(result.stdout)
+            write_cache("tree", cache_key, tree)
+            return tree
         else:
             # Try 'master' if 'main' failed
             if branch == "main":
                 result = subprocess.run(
                     ['gh', 'api', f'repos/{repo_title}/git/trees/master?recursive=1'],
-                    capture_output=True, text=True
+                    capture_output=True
                 )
                 if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    return data.get("tree", [])
+                    tree = _slim_tree(result.stdout)
+                    write_cache("tree", cache_key, tree)
+                    return tree
             
-            print(f"❌ Failed to fetch tree: {result.stderr.strip()}")
+            print(f"❌ Failed to fetch tree: {result.stderr.decode('utf-8', 'replace').strip()}")
             return None
     except FileNotFoundError:
         print("❌ GitHub CLI (gh) not found. Install from https://cli.github.com/")
@@ -1180,60 +1736,138 @@ def show_repo_tree(repo_title: str, max_depth: int = 2, max_items: int = 50, raw
                 "type": item.get("type", ""),  # "blob" = file, "tree" = dir
                 "size": item.get("size", 0) if item.get("type") == "blob" else None
             })
-        print(json.dumps(output, indent=2))
+        print_json(output)
         return
     
     # Build tree structure for display
-    print(f"\n{'=' * 60}")
+    print("\n" + "=" * 60)
     print(f"📁 File Tree: {repo_title}")
-    print(f"{'=' * 60}")
+    print("=" * 60)
     
-    # Filter and sort
+    # Filter to (depth, is_file, path, size) tuples in one pass; their natural
+    # order sorts directories first, then files, alphabetically - no key
+    # function, and only the shown items are ordered
     items = []
     for item in tree:
         path = item.get("path", "")
-        item_type = item.get("type", "")
         depth = path.count('/')
-        
         if depth < max_depth:
-            items.append({
-                "path": path,
-                "type": item_type,
-                "depth": depth,
-                "size": item.get("size", 0)
-            })
+            items.append((depth, item.get("type", "") != "tree", path, item.get("size", 0)))
     
-    # Sort: directories first, then files, alphabetically
-    items.sort(key=lambda x: (x["depth"], x["type"] != "tree", x["path"]))
-    
-    shown = 0
-    for item in items:
-        if shown >= max_items:
-            remaining = len(items) - shown
-            print(f"  ... and {remaining} more items")
-            break
-        
-        path = item["path"]
-        depth = item["depth"]
+    # Pure formatting from here; the lines go out in one print
+    lines = []
+    for depth, is_file, path, size in heapq.nsmallest(max_items, items):
         indent = "  " * (depth + 1)
-        name = path.split('/')[-1]
-        
-        if item["type"] == "tree":
-            print(f"{indent}📁 {name}/")
-        else:
+        name = path.rpartition('/')[2]
+        if is_file:
             # Add file size for larger files
-            size = item.get("size", 0)
-            if size > 100000:
-                size_str = f" ({size // 1024}KB)"
-            else:
-                size_str = ""
-            print(f"{indent}📄 {name}{size_str}")
-        
-        shown += 1
+            lines.append(f"{indent}📄 {name}{f' ({size // 1024}KB)' if size > 100000 else ''}")
+        else:
+            lines.append(f"{indent}📁 {name}/")
+    if len(items) > max_items:
+        lines.append(f"  ... and {len(items) - max_items} more items")
+    if lines:
+        print("\n".join(lines))
     
-    print(f"\n{'=' * 60}")
+    print("\n" + "=" * 60)
     print(f"📊 Total: {len(tree)} files/folders")
-    print(f"{'=' * 60}")
+    print("=" * 60)
+
+
+# Glob entries (*.csproj) name no single path, so they are matched against
+# the root file names instead of being looked up directly
+_DEP_FILE_PATTERNS = [dep_file for dep_file in DEPENDENCY_FILES if "*" in dep_file]
+_DEP_FILE_NAMES = [dep_file for dep_file in DEPENDENCY_FILES if dep_file not in _DEP_FILE_PATTERNS]
+
+# One aliased object() lookup per literal file name, plus the root entries
+# for the glob entries (json.dumps quoting is valid GraphQL)
+_DEPS_QUERY = (
+    "query($owner: String!, $name: String!) { repository(owner: $owner, name: $name) { "
+    + " ".join(f"f{i}: object(expression: {json.dumps('HEAD:' + dep_file)}) {{ ... on Blob {{ text }} }}"
+               for i, dep_file in enumerate(_DEP_FILE_NAMES))
+    + ' root: object(expression: "HEAD:") { ... on Tree { entries { name type } } } } }'
+)
+
+
+def _fetch_deps_graphql(repo_title: str) -> Optional[dict]:
+    """Fetch every DEPENDENCY_FILES entry in one GraphQL round-trip.
+    
+    Files matching a glob entry are only known once the root listing is
+    back, so those few are fetched over REST afterwards.
+    Returns None when the query itself fails (gh missing, not logged in).
+    """
+    owner, _, name = repo_title.partition("/")
+    data = github_graphql(_DEPS_QUERY, owner=owner, name=name)
+    if data is None:
+        return None
+    
+    # Absent files (and binary blobs) come back as null nodes
+    repo = data.get("repository") or {}
+    deps = {}
+    for i, dep_file in enumerate(_DEP_FILE_NAMES):
+        text = (repo.get(f"f{i}") or {}).get("text")
+        if text and text.strip():
+            deps[dep_file] = text
+    
+    entries = (repo.get("root") or {}).get("entries") or []
+    root = [entry["name"] for entry in entries if entry.get("type") == "blob"]
+    globbed = [name for pattern in _DEP_FILE_PATTERNS for name in fnmatch.filter(root, pattern)]
+    if globbed:
+        deps.update(_probe_deps(repo_title, globbed))
+    return deps
+
+
+DEPS_WORKERS = 6  # concurrent REST probes; bounded to stay clear of secondary rate limits
+
+
+def _probe_dep(repo_title: str, dep_file: str) -> tuple:
+    """Fetch one dependency file over REST; returns (dep_file, content or None)."""
+    try:
+        if _github_token():
+            body = github_api(f"/repos/{repo_title}/contents/{dep_file}", "application/vnd.github.raw+json")
+            return dep_file, body.decode('utf-8', 'replace') if body.strip() else None
+        result = subprocess.run(
+            ['gh', 'api', f'repos/{repo_title}/contents/{dep_file}',
+             '-H', 'Accept: application/vnd.github.raw+json'],
+            capture_output=True, text=True
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return dep_file, result.stdout
+    except Exception:
+        pass
+    return dep_file, None
+
+
+def _probe_deps(repo_title: str, dep_files: list) -> dict:
+    """Fetch dep_files over REST, a few at a time; returns {name: content} for those found."""
+    probe = lambda dep_file: _probe_dep(repo_title, dep_file)
+    with ThreadPoolExecutor(max_workers=DEPS_WORKERS) as pool:
+        return {name: content for name, content in pool.map(probe, dep_files) if content}
+
+
+def _root_file_names(repo_title: str) -> Optional[list]:
+    """Names of the files at the repo root, or None when they cannot be listed.
+    
+    Taken from the cached --tree listing when there is one, else from one
+    contents call - either way far fewer requests than probing every name.
+    """
+    info = read_cache("repo_info", f"/repos/{repo_title}")
+    if info and info.get("default_branch"):
+        tree = read_cache("tree", f"/repos/{repo_title}/git/trees/{info['default_branch']}")
+        if tree:
+            return sorted(item["path"] for item in tree if item.get("type") == "blob" and "/" not in item["path"])
+    
+    try:
+        if _github_token():
+            body = github_api(f"/repos/{repo_title}/contents/")
+        else:
+            result = subprocess.run(['gh', 'api', f'repos/{repo_title}/contents/'], capture_output=True)
+            if result.returncode != 0:
+                return None
+            body = result.stdout
+        return sorted(entry["name"] for entry in json.loads(body) if entry.get("type") == "file")
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
 
 
 def fetch_deps(repo_title: str) -> dict:
@@ -1246,20 +1880,16 @@ def fetch_deps(repo_title: str) -> dict:
     if cached:
         return cached
     
-    deps = {}
-    
-    for dep_file in DEPENDENCY_FILES:
-        try:
-            # Try to fetch each dependency file
-            result = subprocess.run(
-                ['gh', 'api', f'repos/{repo_title}/contents/{dep_file}',
-                 '-H', 'Accept: application/vnd.github.raw+json'],
-                capture_output=True, text=True
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                deps[dep_file] = result.stdout
-        except Exception:
-            continue
+    deps = _fetch_deps_graphql(repo_title)
+    if deps is None:
+        # GraphQL unavailable - probe over REST only the candidates the root
+        # listing shows (or every literal name without one)
+        root = _root_file_names(repo_title)
+        if root is None:
+            candidates = _DEP_FILE_NAMES
+        else:
+            candidates = [name for pattern in DEPENDENCY_FILES for name in fnmatch.filter(root, pattern)]
+        deps = _probe_deps(repo_title, candidates)
     
     # Cache the results
     if deps:
@@ -1286,30 +1916,56 @@ def show_deps(repo_title: str, raw: bool = False):
             "deps": deps,
             "files_found": list(deps.keys())
         }
-        print(json.dumps(output, indent=2))
+        print_json(output)
         return
     
-    print(f"\n{'=' * 60}")
-    print(f"📦 Dependencies: {repo_title}")
-    print(f"{'=' * 60}")
+    # Collected and printed at once rather than one print() per line
+    out = ["\n" + "=" * 60, f"📦 Dependencies: {repo_title}", "=" * 60]
     
     for filename, content in deps.items():
-        print(f"\n📄 {filename}")
-        print("-" * 40)
+        out.append(f"\n📄 {filename}")
+        out.append("-" * 40)
         
         # Truncate if very long
         lines = content.strip().split('\n')
-        if len(lines) > 50:
-            for line in lines[:40]:
-                print(f"  {line}")
-            print(f"  ... ({len(lines) - 40} more lines)")
-        else:
-            for line in lines:
-                print(f"  {line}")
-    
-    print(f"\n{'=' * 60}")
-    print(f"📊 Found {len(deps)} dependency file(s)")
-    print(f"{'=' * 60}")
+        truncated = len(lines) > 50
+        out.extend(f"  {line}" for line in (lines[:40] if truncated else lines))
+        if truncated:
+            out.append(f"  ... ({len(lines) - 40} more lines)")
+    
+    out.append("\n" + "=" * 60)
+    out.append(f"📊 Found {len(deps)} dependency file(s)")
+    out.append("=" * 60)
+    print("\n".join(out))
+
+
+def _rest_issue_to_gh(issue: dict) -> dict:
+    """Map a REST issue (or comment) onto the gh --json field names used for display and --raw."""
+    out = {
+        "author": {"login": (issue.get("user") or {}).get("login", "")},
+        "body": issue.get("body") or "",
+        "createdAt": issue.get("created_at", ""),
+        "url": issue.get("html_url", ""),
+    }
+    if "number" in issue:
+        out.update({
+            "number": issue["number"],
+            "title": issue.get("title", ""),
+            "state": issue.get("state", "").upper(),
+            "labels": [{"name": l.get("name", ""), "description": l.get("description") or "",
+                        "color": l.get("color", "")} for l in issue.get("labels", [])],
+        })
+    return out
+
+
+def _names(items, key: str = "name") -> list:
+    """Names from gh/REST label lists, which hold dicts or plain strings."""
+    return [x.get(key, "") if isinstance(x, dict) else x for x in (items or [])]
+
+
+def _login(author) -> str:
+    """Login from an author field that may be a {"login": ...} dict or a plain string."""
+    return author.get('login', 'unknown') if isinstance(author, dict) else author
 
 
 def fetch_issues(repo_title: str, limit: int = 10) -> list:
@@ -1323,11 +1979,26 @@ def fetch_issues(repo_title: str, limit: int = 10) -> list:
         return cached[:limit]
     
     try:
+        if _github_token():
+            # An expired entry is revalidated with its ETag
+            stale = read_stale_cache("issues", cache_key)
+            etag, body = github_api_revalidate(f"/repos/{repo_title}/issues?state=open&per_page=50",
+                                               stale.get("_etag") if stale else None)
+            if body is None:
+                issues = stale["_data"]
+            else:
+                # The issues endpoint also lists PRs; gh issue list leaves them out
+                issues = [_rest_issue_to_gh(issue) for issue in json.loads(body)
+                          if "pull_request" not in issue][:20]
+            if issues:
+                write_cache("issues", cache_key, issues, etag)
+            return issues[:limit]
+        
         # Use gh issue list which works reliably
         result = subprocess.run(
             ['gh', 'issue', 'list', '-R', repo_title, '--limit', '20', '--json', 
              'number,title,state,author,labels,createdAt,url'],
-            capture_output=True, text=True
+            capture_output=True
         )
         
         if result.returncode == 0 and result.stdout.strip():
@@ -1336,14 +2007,19 @@ def fetch_issues(repo_title: str, limit: int = 10) -> list:
             return issues[:limit]
         
         return []
+    except HTTPError as e:
+        if e.code != 404:
+            print(f"❌ Error fetching issues: {e}")
+        return []
     except Exception as e:
         print(f"❌ Error fetching issues: {e}")
         return []
 
 
-def show_issues(repo_title: str, limit: int = 10, raw: bool = False):
-    """Display recent issues and PRs for a repository."""
-    issues = fetch_issues(repo_title, limit)
+def show_issues(repo_title: str, limit: int = 10, raw: bool = False, issues: list = None):
+    """Display recent issues and PRs for a repository (fetched unless passed in)."""
+    if issues is None:
+        issues = fetch_issues(repo_title, limit)
     
     if not issues:
         if raw:
@@ -1358,73 +2034,152 @@ def show_issues(repo_title: str, limit: int = 10, raw: bool = False):
             "total": len(issues),
             "issues": issues
         }
-        print(json.dumps(output, indent=2))
+        print_json(output)
         return
     
-    print(f"\n{'=' * 60}")
+    print("\n" + "=" * 60)
     print(f"📋 Recent Issues: {repo_title}")
-    print(f"{'=' * 60}")
+    print("=" * 60)
     
     for issue in issues:
         number = issue.get('number', '?')
         title = issue.get('title', 'Unknown')
         state = issue.get('state', 'unknown')
-        author = issue.get('author', {})
-        if isinstance(author, dict):
-            author = author.get('login', 'unknown')
+        author = _login(issue.get('author', {}))
         
-        # Check if it's a PR
-        is_pr = issue.get('pull_request') is not None or 'pullRequest' in str(issue)
+        # Check if it's a PR: REST marks it with pull_request, gh/GraphQL
+        # shapes with a pullRequest/isPullRequest key or a /pull/ URL
+        is_pr = (issue.get('pull_request') is not None or 'pullRequest' in issue
+                 or issue.get('isPullRequest', False) or '/pull/' in issue.get('url', ''))
         icon = "🔀" if is_pr else ("🟢" if state == "open" else "🔴")
         
-        labels = issue.get('labels', [])
-        if labels and isinstance(labels[0], dict):
-            label_names = [l.get('name', '') for l in labels]
-        else:
-            label_names = labels
-        label_str = f" [{', '.join(label_names[:3])}]" if label_names else ""
+        label_names = _names(issue.get('labels'))[:3]
+        label_str = f" [{', '.join(label_names)}]" if label_names else ""
         
         print(f"\n{icon} #{number}: {title[:60]}{'...' if len(title) > 60 else ''}")
         print(f"   Author: {author} | State: {state}{label_str}")
     
-    print(f"\n{'=' * 60}")
+    print("\n" + "=" * 60)
     print(f"📊 Showing {len(issues)} issue(s)")
-    print(f"{'=' * 60}")
+    print("=" * 60)
+
+
+# Same fields (and names) as gh issue view --json ...; issueOrPullRequest covers both kinds
+_ISSUE_DETAIL_FIELDS = (
+    "number title state body createdAt url author { login } "
+    "labels(first: 20) { nodes { name description color } } "
+    "comments(first: 100) { nodes { author { login } body createdAt url } }"
+)
+_ISSUE_DETAIL_QUERY = (
+    "query($owner: String!, $name: String!, $number: Int!) { repository(owner: $owner, name: $name) { "
+    "issueOrPullRequest(number: $number) { "
+    f"... on Issue {{ {_ISSUE_DETAIL_FIELDS} }} ... on PullRequest {{ {_ISSUE_DETAIL_FIELDS} }} }} }} }}"
+)
 
 
 def fetch_issue_detail(repo_title: str, issue_number: int) -> dict:
     """Fetch full details of a single issue including body."""
     rate_limit()
     
+    cache_key = f"issue_{repo_title.replace('/', '_')}_{issue_number}"
+    cached = read_cache("issues", cache_key)
+    if cached:
+        return cached
+    
     try:
-        result = subprocess.run(
-            ['gh', 'issue', 'view', str(issue_number), '-R', repo_title, '--json',
-             'number,title,state,author,body,labels,createdAt,url,comments'],
-            capture_output=True, text=True
-        )
-        
-        if result.returncode == 0 and result.stdout.strip():
-            return json.loads(result.stdout)
+        if _github_token():
+            # An expired entry is revalidated with the issue's ETag; new
+            # comments bump the issue, so a 304 covers them too
+            stale = read_stale_cache("issues", cache_key)
+            # Works for PRs too - they share the issue number space
+            etag, body = github_api_revalidate(f"/repos/{repo_title}/issues/{issue_number}",
+                                               stale.get("_etag") if stale else None)
+            if body is None:
+                detail = stale["_data"]
+            else:
+                issue = json.loads(body)
+                comments = []
+                if issue.get("comments"):
+                    comments = json.loads(github_api(f"/repos/{repo_title}/issues/{issue_number}/comments?per_page=100"))
+                detail = _rest_issue_to_gh(issue)
+                detail["comments"] = [_rest_issue_to_gh(c) for c in comments]
+            write_cache("issues", cache_key, detail, etag)
+            return detail
         
-        # Try as PR if issue not found
+        # One query answers for issues and PRs alike (no gh issue/pr view fallback pair)
+        owner, _, name = repo_title.partition("/")
         result = subprocess.run(
-            ['gh', 'pr', 'view', str(issue_number), '-R', repo_title, '--json',
-             'number,title,state,author,body,labels,createdAt,url,comments'],
-            capture_output=True, text=True
+            ['gh', 'api', 'graphql', '-f', f'query={_ISSUE_DETAIL_QUERY}',
+             '-f', f'owner={owner}', '-f', f'name={name}', '-F', f'number={int(issue_number)}'],
+            capture_output=True
         )
+        data = json.loads(result.stdout or b"{}").get("data") or {}
+        node = (data.get("repository") or {}).get("issueOrPullRequest")
+        if not node:
+            return {}
         
-        if result.returncode == 0 and result.stdout.strip():
-            return json.loads(result.stdout)
-        
+        detail = dict(node, labels=node["labels"]["nodes"], comments=node["comments"]["nodes"])
+        write_cache("issues", cache_key, detail)
+        return detail
+    except HTTPError as e:
+        if e.code != 404:
+            print(f"❌ Error fetching issue: {e}")
         return {}
     except Exception as e:
         print(f"❌ Error fetching issue: {e}")
         return {}
 
 
-def show_issue_detail(repo_title: str, issue_number: int, raw: bool = False):
-    """Display full details of a single issue."""
-    issue = fetch_issue_detail(repo_title, issue_number)
+# gh issue list's default listing (open, newest first) next to one issue's full detail
+_ISSUES_WITH_DETAIL_QUERY = (
+    "query($owner: String!, $name: String!, $number: Int!) { repository(owner: $owner, name: $name) { "
+    "issues(first: 20, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) { nodes { "
+    "number title state author { login } labels(first: 20) { nodes { name description color } } createdAt url } } "
+    "target: issueOrPullRequest(number: $number) { "
+    f"... on Issue {{ {_ISSUE_DETAIL_FIELDS} }} ... on PullRequest {{ {_ISSUE_DETAIL_FIELDS} }} }} }} }}"
+)
+
+
+def fetch_issues_with_detail(repo_title: str, limit: int = 10, issue_number: int = None) -> tuple:
+    """Fetch recent issues and one issue's full detail in a single GraphQL query.
+    
+    Returns (issues, detail) shaped like fetch_issues/fetch_issue_detail, and
+    fills both of their cache entries. Falls back to the two separate fetches
+    when the query fails.
+    """
+    if issue_number is None:
+        return fetch_issues(repo_title, limit), {}
+    
+    repo_ = repo_title.replace('/', '_')
+    list_key, detail_key = f"issues_{repo_}", f"issue_{repo_}_{issue_number}"
+    issues, detail = read_cache("issues", list_key), read_cache("issues", detail_key)
+    if issues and detail:
+        return issues[:limit], detail
+    
+    rate_limit()
+    owner, _, name = repo_title.partition("/")
+    data = github_graphql(_ISSUES_WITH_DETAIL_QUERY, owner=owner, name=name, number=int(issue_number))
+    if data is None:
+        return fetch_issues(repo_title, limit), fetch_issue_detail(repo_title, issue_number)
+    
+    repo = data.get("repository") or {}
+    issues = [dict(node, labels=node["labels"]["nodes"])
+              for node in (repo.get("issues") or {}).get("nodes") or []]
+    if issues:
+        write_cache("issues", list_key, issues)
+    
+    detail = {}
+    node = repo.get("target")
+    if node:
+        detail = dict(node, labels=node["labels"]["nodes"], comments=node["comments"]["nodes"])
+        write_cache("issues", detail_key, detail)
+    return issues[:limit], detail
+
+
+def show_issue_detail(repo_title: str, issue_number: int, raw: bool = False, issue: dict = None):
+    """Display full details of a single issue (fetched unless passed in)."""
+    if issue is None:
+        issue = fetch_issue_detail(repo_title, issue_number)
     
     if not issue:
         if raw:
@@ -1435,78 +2190,93 @@ def show_issue_detail(repo_title: str, issue_number: int, raw: bool = False):
         return
     
     if raw:
-        print(json.dumps(issue, indent=2))
+        print_json(issue)
         return
     
     title = issue.get('title', 'Unknown')
     number = issue.get('number', issue_number)
     state = issue.get('state', 'unknown')
-    author = issue.get('author', {})
-    if isinstance(author, dict):
-        author = author.get('login', 'unknown')
+    author = _login(issue.get('author', {}))
     body = issue.get('body', 'No description provided.')
     url = issue.get('url', '')
     created = issue.get('createdAt', '')[:10] if issue.get('createdAt') else ''
     
-    labels = issue.get('labels', [])
-    if labels and isinstance(labels[0], dict):
-        label_names = [l.get('name', '') for l in labels]
-    else:
-        label_names = labels
+    label_names = _names(issue.get('labels'))
     
     comments = issue.get('comments', [])
     
-    print(f"\n{'=' * 70}")
-    print(f"📋 Issue #{number}: {title}")
-    print(f"{'=' * 70}")
-    print(f"   Repo:    {repo_title}")
-    print(f"   State:   {state.upper()}")
-    print(f"   Author:  {author}")
-    print(f"   Created: {created}")
+    # Collected and printed at once rather than one print() per line
+    out = [
+        "\n" + "=" * 70,
+        f"📋 Issue #{number}: {title}",
+        "=" * 70,
+        f"   Repo:    {repo_title}",
+        f"   State:   {state.upper()}",
+        f"   Author:  {author}",
+        f"   Created: {created}",
+    ]
     if label_names:
-        print(f"   Labels:  {', '.join(label_names)}")
-    print(f"   URL:     {url}")
-    print(f"\n{'─' * 70}")
-    print("📝 Description:")
-    print(f"{'─' * 70}")
+        out.append(f"   Labels:  {', '.join(label_names)}")
+    out += [f"   URL:     {url}", "\n" + "─" * 70, "📝 Description:", "─" * 70]
     
-    # Print body with some formatting
+    # Body with some formatting
     if body:
         # Limit very long bodies
         if len(body) > 5000:
-            print(body[:5000])
-            print(f"\n... (truncated, {len(body) - 5000} more characters)")
+            out.append(body[:5000])
+            out.append(f"\n... (truncated, {len(body) - 5000} more characters)")
         else:
-            print(body)
+            out.append(body)
     else:
-        print("(No description)")
+        out.append("(No description)")
     
     # Show comments summary
     if comments:
-        print(f"\n{'─' * 70}")
-        print(f"💬 Comments ({len(comments)}):")
-        print(f"{'─' * 70}")
-        for i, comment in enumerate(comments[:5]):  # Show first 5 comments
-            c_author = comment.get('author', {})
-            if isinstance(c_author, dict):
-                c_author = c_author.get('login', 'unknown')
+        out += ["\n" + "─" * 70, f"💬 Comments ({len(comments)}):", "─" * 70]
+        for comment in comments[:5]:  # Show first 5 comments
+            c_author = _login(comment.get('author', {}))
             c_body = comment.get('body', '')[:200]
             if len(comment.get('body', '')) > 200:
                 c_body += '...'
-            print(f"\n  [{c_author}]:")
-            print(f"  {c_body}")
+            out.append(f"\n  [{c_author}]:")
+            out.append(f"  {c_body}")
         if len(comments) > 5:
-            print(f"\n  ... and {len(comments) - 5} more comments")
+            out.append(f"\n  ... and {len(comments) - 5} more comments")
     
-    print(f"\n{'=' * 70}")
+    out.append("\n" + "=" * 70)
+    print("\n".join(out))
 
 
-def print_repos(repos: list, verbose: bool = False):
-    """Print repositories to console."""
+def show_issues_with_detail(repo_title: str, issue_number: int, limit: int = 10, raw: bool = False):
+    """Display recent issues and one issue's detail, fetched together."""
+    issues, issue = fetch_issues_with_detail(repo_title, limit, issue_number)
+    if raw:
+        # One JSON document, so agents can parse stdout as a whole
+        print_json({"repo": repo_title, "total": len(issues), "issues": issues, "issue": issue or None})
+        return
+    show_issues(repo_title, limit=limit, raw=raw, issues=issues)
+    show_issue_detail(repo_title, issue_number, raw=raw, issue=issue)
+
+
+# print_repos line templates (rank/title, stars, description, URL), keyed by USE_COLOR
+_REPO_LINE_FORMATS = {
+    True: ("\n\033[93m{}.\033[0m \033[97m{}\033[0m", "   ⭐ {}{}\033[95m{}\033[0m",
+           "   \033[90m{}\033[0m", "   \033[36m🔗 {}\033[0m"),
+    False: ("\n{}. {}", "   ⭐ {}{}{}", "   {}", "   🔗 {}"),
+}
+
+
+def print_repos(repos: list, verbose: bool = False, file=None):
+    """Print repositories to console (or to file)."""
     if not repos:
-        print("No repositories found matching your criteria.")
+        print("No repositories found matching your criteria.", file=file)
         return
     
+    # Color or plain is settled once per listing rather than at every line
+    title_fmt, stars_fmt, desc_fmt, url_fmt = _REPO_LINE_FORMATS[USE_COLOR]
+    
+    # Collected and written at once rather than one print() per line
+    out = []
     for i, repo in enumerate(repos, 1):
         title = repo.get('title', 'Unknown')
         stars = repo.get('stars', '0')
@@ -1519,25 +2289,17 @@ def print_repos(repos: list, verbose: bool = False):
         today_str = f" (+{today_stars} today)" if today_stars else ""
         lang_str = f" [{language}]" if language else ""
         
-        if USE_COLOR:
-            print(f"\n\033[93m{i}.\033[0m \033[97m{title}\033[0m")
-            print(f"   ⭐ {stars}{today_str}\033[95m{lang_str}\033[0m")
-        else:
-            print(f"\n{i}. {title}")
-            print(f"   ⭐ {stars}{today_str}{lang_str}")
+        out.append(title_fmt.format(i, title))
+        out.append(stars_fmt.format(stars, today_str, lang_str))
         
         if description:
             desc = description[:100] + "..." if len(description) > 100 else description
-            if USE_COLOR:
-                print(f"   \033[90m{desc}\033[0m")
-            else:
-                print(f"   {desc}")
+            out.append(desc_fmt.format(desc))
         
         if verbose and url:
-            if USE_COLOR:
-                print(f"   \033[36m🔗 {url}\033[0m")
-            else:
-                print(f"   🔗 {url}")
+            out.append(url_fmt.format(url))
+    
+    print("\n".join(out), file=file)
 
 
 def print_repos_detailed(repos: list):
@@ -1548,6 +2310,9 @@ def print_repos_detailed(repos: list):
 
     print(f"\n🔍 Fetching details for {len(repos)} repositories...\n")
 
+    # One GraphQL request per batch instead of a gh call per repo
+    infos = fetch_repos_info_batch([repo.get('title', '') for repo in repos])
+
     for i, repo in enumerate(repos, 1):
         title = repo.get('title', 'Unknown')
         stars = repo.get('stars', '0')
@@ -1573,7 +2338,7 @@ def print_repos_detailed(repos: list):
                 print(f"   {desc}")
 
         # Fetch extra details from GitHub API
-        info = fetch_repo_info(title)
+        info = infos.get(title) or fetch_repo_info(title)
         if info:
             forks = info.get("forks_count", 0)
             issues = info.get("open_issues_count", 0)
@@ -1582,20 +2347,7 @@ def print_repos_detailed(repos: list):
             topics = info.get("topics", [])
             pushed_at = info.get("pushed_at", "")
 
-            last_push = ""
-            if pushed_at:
-                try:
-                    pushed = datetime.fromisoformat(pushed_at.replace('Z', '+00:00'))
-                    now = datetime.now(timezone.utc)
-                    diff = now - pushed
-                    if diff.days > 0:
-                        last_push = f"{diff.days}d ago"
-                    elif diff.seconds > 3600:
-                        last_push = f"{diff.seconds // 3600}h ago"
-                    else:
-                        last_push = f"{diff.seconds // 60}m ago"
-                except (ValueError, TypeError):
-                    last_push = pushed_at[:10]
+            last_push = time_ago(pushed_at) if pushed_at else ""
 
             detail_parts = [f"🍴 {forks:,}", f"🐛 {issues:,}", f"📜 {license_name}"]
             if last_push:
@@ -1616,6 +2368,27 @@ def print_repos_detailed(repos: list):
         print()
 
 
+_ANALYZER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analyzer.py")
+
+
+@lru_cache(maxsize=None)
+def _load_analyzer():
+    """Import the analyzer module once; loaded by path when it is not importable by name."""
+    # analyzer imports this module by name. When running as a script, hand it
+    # this instance rather than letting it execute a second copy that would
+    # not see this run's settings (USE_CACHE) or reuse its connections
+    sys.modules.setdefault("github_trending", sys.modules[__name__])
+    try:
+        import analyzer
+    except ImportError:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location("analyzer", _ANALYZER_PATH)
+        analyzer = importlib.util.module_from_spec(spec)
+        sys.modules["analyzer"] = analyzer
+        spec.loader.exec_module(analyzer)
+    return analyzer
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="🚀 GitHub Trending CLI - Fetch trending repositories",
@@ -1662,6 +2435,7 @@ Analysis mode (health scoring):
   %(prog)s --analyze                    # Analyze top 10 with health scores
   %(prog)s -a -t 5 -l rust              # Analyze top 5 Rust repos
   %(prog)s --analyze-detail 1           # Detailed breakdown for #1
+  %(prog)s --analyze --force            # Recompute instead of using cached scores
   
   Note: Set GITHUB_TOKEN env var for higher API rate limits (5000/hr vs 60/hr)
 
@@ -1772,6 +2546,11 @@ Cache management:
         action='store_true',
         help='Disable colored output'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore cached data and fetch fresh (results are still cached)'
+    )
     
     # List languages
     parser.add_argument(
@@ -1982,9 +2761,17 @@ Cache management:
         metavar='NUM',
         help='Show detailed analysis for repo #NUM'
     )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-run analysis instead of reusing cached scores (with --analyze)'
+    )
     
     args = parser.parse_args()
     
+    global USE_CACHE
+    USE_CACHE = not args.no_cache
+    
     # Handle --list-languages
     if args.list_languages:
         print("Available languages:")
@@ -2041,11 +2828,15 @@ Cache management:
     
     # Handle --issues-repo (direct repo issues, no trending fetch needed)
     if args.issues_repo:
-        show_issues(args.issues_repo, limit=args.issues_limit, raw=args.raw)
+        if args.issue and args.issue_repo in (None, args.issues_repo):
+            # Both for one repo: one combined query instead of two round-trips
+            show_issues_with_detail(args.issues_repo, args.issue, args.issues_limit, raw=args.raw)
+        else:
+            show_issues(args.issues_repo, limit=args.issues_limit, raw=args.raw)
         return
     
-    # Handle --issue (single issue detail)
-    if args.issue:
+    # Handle --issue (single issue detail; with --issues N it applies to that repo)
+    if args.issue and not args.issues:
         if not args.issue_repo:
             print("❌ --issue requires --issue-repo (e.g., --issue-repo VectifyAI/PageIndex --issue 79)")
             return
@@ -2095,16 +2886,8 @@ Cache management:
         search=args.search
     )
     
-    # Apply sorting
-    if args.sort == 'stars':
-        repos.sort(key=lambda x: x.get('_stars_int', 0), reverse=not args.reverse)
-    elif args.sort == 'name':
-        repos.sort(key=lambda x: x.get('title', '').lower(), reverse=args.reverse)
-    elif args.sort == 'today':
-        repos.sort(key=lambda x: int(str(x.get('todayStars', '0')).replace(',', '') or '0'), reverse=not args.reverse)
-    
-    # Limit results
-    repos = repos[:args.top]
+    # Apply sorting and limit results
+    repos = sort_repos(repos, args.sort, args.reverse, args.top)
     
     # Export or print
     if args.csv:
@@ -2115,20 +2898,10 @@ Cache management:
         output_json(repos, data)
         return  # Skip footer for clean JSON
     elif args.analyze or args.analyze_detail:
-        # Import analyzer module
-        try:
-            from analyzer import analyze_repos, analyze_repo, format_analysis_table, format_analysis_detail
-        except ImportError:
-            # Try relative import
-            import importlib.util
-            spec = importlib.util.spec_from_file_location("analyzer", 
-                os.path.join(os.path.dirname(__file__), "analyzer.py"))
-            analyzer = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(analyzer)
-            analyze_repos = analyzer.analyze_repos
-            analyze_repo = analyzer.analyze_repo
-            format_analysis_table = analyzer.format_analysis_table
-            format_analysis_detail = analyzer.format_analysis_detail
+        analyzer = _load_analyzer()
+        analyze_repos, analyze_repo = analyzer.analyze_repos, analyzer.analyze_repo
+        format_analysis_table = analyzer.format_analysis_table
+        format_analysis_detail = analyzer.format_analysis_detail
         
         if args.analyze_detail:
             # Show detailed analysis for specific repo
@@ -2138,9 +2911,9 @@ Cache management:
                 if title:
                     if not args.raw:
                         print(f"\n🔍 Analyzing {title}...")
-                    result = analyze_repo(title)
+                    result = analyze_repo(title, use_cache=not args.force)
                     if args.raw:
-                        print(json.dumps(result, indent=2))
+                        print_json(result)
                     else:
                         print(format_analysis_detail(result))
             else:
@@ -2150,9 +2923,9 @@ Cache management:
             if not args.raw:
                 print(f"\n🔍 Analyzing {len(repos)} trending repositories...")
                 print("   (This may take a moment - fetching from GitHub API)\n")
-            results = analyze_repos(repos, verbose=not args.raw)
+            results = analyze_repos(repos, verbose=not args.raw, use_cache=not args.force)
             if args.raw:
-                print(json.dumps(results, indent=2))
+                print_json(results)
             else:
                 print()
                 print(format_analysis_table(results))
@@ -2198,8 +2971,14 @@ Cache management:
         idx = args.issues - 1
         if 0 <= idx < len(repos):
             title = repos[idx].get('title', '')
-            if title:
-                show_issues(title, limit=args.issues_limit, raw=args.raw)
+            if args.issue and args.issue_repo in (None, title):
+                show_issues_with_detail(title, args.issue, args.issues_limit, raw=args.raw)
+            else:
+                if title:
+                    show_issues(title, limit=args.issues_limit, raw=args.raw)
+                if args.issue:
+                    # --issue-repo names another repo; show that issue as well
+                    show_issue_detail(args.issue_repo, args.issue, raw=args.raw)
         else:
             print(f"❌ Invalid number: {args.issues} (valid: 1-{len(repos)})")
         return
@@ -2210,7 +2989,7 @@ Cache management:
         if 0 <= idx < len(repos):
             repo = repos[idx]
             title = repo.get('title', '')
-            repo_name = title.split('/')[-1]
+            repo_name = title.rpartition('/')[2]
             
             if args.clone_dir:
                 repo_path = os.path.join(args.clone_dir, repo_name)
@@ -2230,14 +3009,10 @@ Cache management:
         interactive_clone(repos, args.clone_dir, args.shallow)
     elif args.clone_nums:
         # Parse clone numbers (supports "1,3,5" or "1-5" or "1,3-5,7")
-        numbers = []
-        for part in args.clone_nums.split(','):
-            part = part.strip()
-            if '-' in part:
-                start, end = part.split('-', 1)
-                numbers.extend(range(int(start), int(end) + 1))
-            else:
-                numbers.append(int(part))
+        numbers = parse_clone_numbers(args.clone_nums)
+        if numbers is None:
+            print(f"❌ Invalid --clone-nums: {args.clone_nums} (e.g., 1,3-5,7; at most {CLONE_NUMBERS_LIMIT} numbers)")
+            return
         print_repos(repos, verbose=True)
         clone_by_number(repos, numbers, args.clone_dir, args.shallow)
     elif args.detailed:
@@ -2246,16 +3021,15 @@ Cache management:
         print_repos(repos, verbose=args.verbose)
 
     # Print footer
-    print("\n" + "=" * 60)
     pub_date = data.get('pubDate', 'Unknown')
-    print(f"📅 Updated: {pub_date}")
     available = len(data.get('items', []))
     if len(repos) < args.top and len(repos) < available:
-        print(f"📊 Showing {len(repos)} repositories (filtered from {available} available)")
+        showing = f"📊 Showing {len(repos)} repositories (filtered from {available} available)"
     elif args.top > available:
-        print(f"📊 Showing {len(repos)} repositories ({args.top} requested, {available} available)")
+        showing = f"📊 Showing {len(repos)} repositories ({args.top} requested, {available} available)"
     else:
-        print(f"📊 Showing {len(repos)} repositories")
+        showing = f"📊 Showing {len(repos)} repositories"
+    print("\n".join(("\n" + "=" * 60, f"📅 Updated: {pub_date}", showing)))
 
 
 if __name__ == '__main__':
@@ -2,6 +2,7 @@
 """Tests for github_trending.py and analyzer.py pure functions."""
 
 import csv
+import io
 import json
 import os
 import tempfile
@@ -14,6 +15,10 @@ from unittest.mock import patch
 # Import functions under test
 from github_trending import (
     filter_repos,
+    sort_repos,
+    parse_stars,
+    http_request,
+    parse_trending_html,
     fetch_search,
     sanitize_repo_dir_name,
     get_cache_path,
@@ -26,6 +31,12 @@ from github_trending import (
     get_dir_size,
 )
 from analyzer import (
+    analyze_repo,
+    analyze_repos,
+    api_cache_type,
+    api_request,
+    fetch_repos_graphql,
+    score_repo,
     score_readme,
     score_issue_response,
     score_pr_merge_rate,
@@ -76,6 +87,39 @@ SAMPLE_REPOS = [
 ]
 
 
+def use_temp_cache_dir(test: unittest.TestCase) -> str:
+    """Point github_trending.CACHE_DIR at a fresh temp dir until the test's cleanups run.
+    
+    Restored by addCleanup even when setUp fails part-way, so no test leaks
+    its cache directory into whichever test a runner (or worker) picks next.
+    """
+    import github_trending
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    patcher = patch.object(github_trending, "CACHE_DIR", Path(tmp.name))
+    patcher.start()
+    test.addCleanup(patcher.stop)
+    return tmp.name
+
+
+class TempDirPerClass:
+    """One TemporaryDirectory per test class; each test names its files after its own id()."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.tmpdir = cls._tmp.name
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+        super().tearDownClass()
+
+    def tmp_path(self, suffix: str) -> str:
+        return os.path.join(self.tmpdir, self.id().rpartition(".")[2] + suffix)
+
+
 # =============================================================================
 # filter_repos
 # =============================================================================
@@ -136,12 +180,83 @@ class TestFilterRepos(unittest.TestCase):
         self.assertEqual(result[0]["_stars_int"], 12345)
         self.assertEqual(result[2]["_stars_int"], 45000)
 
+    def test_star_bounds_inclusive(self):
+        result = filter_repos(SAMPLE_REPOS, min_stars=12345, max_stars=12345)
+        self.assertEqual([r["title"] for r in result], ["owner/repo-a"])
+
+    def test_returns_new_list_of_same_dicts(self):
+        repos = [dict(r) for r in SAMPLE_REPOS]
+        result = filter_repos(repos, min_stars=500)
+        self.assertIsNot(result, repos)
+        self.assertTrue(all(any(r is orig for orig in repos) for r in result))
+        self.assertEqual(repos[1]["_stars_int"], 890)  # filtered out, still annotated
+
     def test_combined_filters(self):
         result = filter_repos(SAMPLE_REPOS, min_stars=500, search="framework")
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]["title"], "owner/repo-a")
 
 
+class TestSortRepos(unittest.TestCase):
+    def setUp(self):
+        # filter_repos fills in _stars_int, as in main
+        self.repos = filter_repos(SAMPLE_REPOS)
+
+    def titles(self, repos):
+        return [r["title"] for r in repos]
+
+    def test_stars_descending_with_limit(self):
+        self.assertEqual(self.titles(sort_repos(self.repos, "stars", top=2)), ["user/repo-c", "owner/repo-a"])
+
+    def test_reverse_and_name(self):
+        self.assertEqual(self.titles(sort_repos(self.repos, "stars", reverse=True, top=1)), ["dev/repo-d"])
+        self.assertEqual(self.titles(sort_repos(self.repos, "name", top=10)),
+                         ["dev/repo-d", "org/repo-b", "owner/repo-a", "user/repo-c"])
+
+    def test_matches_full_sort_then_slice(self):
+        repos = [{"title": f"o/r{i}", "todayStars": str(i % 3)} for i in range(20)]
+        expected = sorted(repos, key=lambda r: int(r["todayStars"]), reverse=True)[:7]
+        self.assertEqual(sort_repos(repos, "today", top=7), expected)
+
+    def test_today_prefers_parsed_count(self):
+        repos = [{"title": "o/a", "todayStars": "9", "_today_int": 1}, {"title": "o/b", "todayStars": "2"}]
+        self.assertEqual(self.titles(sort_repos(repos, "today")), ["o/b", "o/a"])
+
+    def test_unsorted_keeps_trending_order(self):
+        self.assertEqual(sort_repos(self.repos, None, top=3), self.repos[:3])
+        self.assertEqual(sort_repos(self.repos, "forks", top=3), self.repos[:3])
+
+
+class TestTimeAgo(unittest.TestCase):
+    def test_relative_units(self):
+        from datetime import datetime, timedelta, timezone
+        from github_trending import time_ago
+        now = datetime.now(timezone.utc)
+        self.assertEqual(time_ago((now - timedelta(days=3, minutes=1)).strftime("%Y-%m-%dT%H:%M:%SZ")), "3d ago")
+        self.assertEqual(time_ago((now - timedelta(hours=5, minutes=1)).isoformat()), "5h ago")
+        self.assertEqual(time_ago((now - timedelta(minutes=12, seconds=5)).isoformat()), "12m ago")
+
+    def test_unparseable_falls_back_to_date(self):
+        from github_trending import time_ago
+        # Naive timestamps cannot be compared with the aware clock either
+        self.assertEqual(time_ago("2024-01-01T00:00:00"), "2024-01-01")
+        self.assertEqual(time_ago("not a timestamp"), "not a time")
+
+
+class TestParseStars(unittest.TestCase):
+    def test_formats(self):
+        self.assertEqual(parse_stars("12,345"), 12345)
+        self.assertEqual(parse_stars("1,234,567"), 1234567)
+        self.assertEqual(parse_stars("42"), 42)
+        self.assertEqual(parse_stars(7), 7)
+        self.assertEqual(parse_stars(""), 0)
+        self.assertEqual(parse_stars(None), 0)
+
+    def test_unparseable_counts_as_zero(self):
+        self.assertEqual(parse_stars("n/a"), 0)
+        self.assertEqual(parse_stars("1.2k"), 0)
+
+
 # =============================================================================
 # fetch_search (general GitHub search via gh)
 # =============================================================================
@@ -166,7 +281,7 @@ class TestFetchSearch(unittest.TestCase):
     @patch("github_trending.subprocess.run")
     @patch("github_trending.rate_limit")
     def test_normalizes_results(self, _rl, mock_run, _rc, _wc):
-        mock_run.return_value = type("R", (), {"returncode": 0, "stdout": self.GH_OUTPUT, "stderr": ""})()
+        mock_run.return_value = type("R", (), {"returncode": 0, "stdout": self.GH_OUTPUT.encode(), "stderr": b""})()
         data = fetch_search("ai", top=5, use_cache=False)
         self.assertEqual(data["_source"], "search")
         repo = data["items"][0]
@@ -184,13 +299,707 @@ class TestFetchSearch(unittest.TestCase):
     @patch("github_trending.subprocess.run")
     @patch("github_trending.rate_limit")
     def test_builds_star_range(self, _rl, mock_run, _rc, _wc):
-        mock_run.return_value = type("R", (), {"returncode": 0, "stdout": "[]", "stderr": ""})()
+        mock_run.return_value = type("R", (), {"returncode": 0, "stdout": b"[]", "stderr": b""})()
         fetch_search("ai", min_stars=100, max_stars=500, use_cache=False)
         cmd = mock_run.call_args[0][0]
         self.assertIn("--stars", cmd)
         self.assertIn("100..500", cmd)
 
 
+# =============================================================================
+# fetch_repo_info / fetch_repo_tree caching
+# =============================================================================
+
+
+class TestRepoInfoTreeCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = use_temp_cache_dir(self)
+        # Exercise the gh CLI path even when a token is set in the environment
+        token = patch("github_trending._github_token", return_value="")
+        token.start()
+        self.addCleanup(token.stop)
+
+    def _gh(self, payload):
+        return type("R", (), {"returncode": 0, "stdout": json.dumps(payload).encode(), "stderr": b""})()
+
+    @patch("github_trending.subprocess.run")
+    def test_tree_reuses_cached_info(self, mock_run):
+        from github_trending import fetch_repo_info, fetch_repo_tree
+        mock_run.side_effect = [
+            self._gh({"full_name": "o/r", "default_branch": "dev"}),
+            self._gh({"tree": [{"path": "README.md", "type": "blob"}]}),
+        ]
+        self.assertEqual(fetch_repo_info("o/r")["default_branch"], "dev")
+        self.assertEqual(fetch_repo_tree("o/r"), [{"path": "README.md", "type": "blob"}])
+        # Info came from cache, so only the tree needed a second gh call
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertIn("repos/o/r/git/trees/dev?recursive=1", mock_run.call_args[0][0])
+        # Both are cached now
+        fetch_repo_tree("o/r")
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("github_trending.subprocess.run")
+    def test_tree_keeps_only_used_fields(self, mock_run):
+        from github_trending import fetch_repo_tree
+        entry = {"path": "a.py", "mode": "100644", "type": "blob", "sha": "f" * 40, "size": 12,
+                 "url": "https://api.github.com/repos/o/r/git/blobs/" + "f" * 40}
+        mock_run.return_value = self._gh({"sha": "t", "tree": [entry, {"path": "src", "type": "tree", "sha": "s"}]})
+        expected = [{"path": "a.py", "type": "blob", "size": 12}, {"path": "src", "type": "tree"}]
+        self.assertEqual(fetch_repo_tree("o/r", branch="main"), expected)
+        self.assertEqual(read_cache("tree", "/repos/o/r/git/trees/main"), expected)
+
+    @patch("github_trending.subprocess.run")
+    def test_no_cache_refetches(self, mock_run):
+        from github_trending import fetch_repo_info
+        mock_run.return_value = self._gh({"full_name": "o/r"})
+        fetch_repo_info("o/r")
+        with patch("github_trending.USE_CACHE", False):
+            fetch_repo_info("o/r")
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("github_trending.subprocess.run")
+    def test_gh_error_output_decoded(self, mock_run):
+        from github_trending import fetch_repo_info
+        mock_run.return_value = type("R", (), {"returncode": 1, "stdout": b"", "stderr": "HTTP 404: Nöt Found\n".encode()})()
+        with patch("builtins.print") as mock_print:
+            self.assertIsNone(fetch_repo_info("o/missing"))
+        self.assertEqual(mock_print.call_args[0][0], "❌ Failed to fetch repo info: HTTP 404: Nöt Found")
+        self.assertNotIn("text", mock_run.call_args[1])
+
+    @patch("github_trending.subprocess.run")
+    def test_batch_info_one_call_and_rest_shape(self, mock_run):
+        from github_trending import fetch_repo_info, fetch_repos_info_batch
+        node = {
+            "nameWithOwner": "o/a", "url": "https://github.com/o/a", "stargazerCount": 10,
+            "forkCount": 2, "issues": {"totalCount": 3}, "pullRequests": {"totalCount": 1},
+            "licenseInfo": {"spdxId": "MIT"}, "defaultBranchRef": {"name": "dev"},
+            "repositoryTopics": {"nodes": [{"topic": {"name": "cli"}}]},
+            "pushedAt": "2026-01-01T00:00:00Z", "isArchived": False,
+        }
+        mock_run.return_value = self._gh({"data": {"r0": node, "r1": None}})
+        infos = fetch_repos_info_batch(["o/a", "o/gone"])
+        self.assertEqual(list(infos), ["o/a"])
+        info = infos["o/a"]
+        self.assertEqual(info["open_issues_count"], 4)
+        self.assertEqual(info["license"], {"spdx_id": "MIT"})
+        self.assertEqual(info["topics"], ["cli"])
+        self.assertEqual(info["default_branch"], "dev")
+        mock_run.assert_called_once()
+        self.assertEqual(mock_run.call_args[0][0][:3], ["gh", "api", "graphql"])
+        # No diskUsage in the node: size is unknown, not 0
+        self.assertIsNone(info["size"])
+        # Batch results are cached on their own, outside the REST repo_info cache
+        self.assertEqual(fetch_repos_info_batch(["o/a"]), {"o/a": info})
+        mock_run.assert_called_once()
+        self.assertIsNone(read_cache("repo_info", "/repos/o/a"))
+        mock_run.return_value = self._gh({"full_name": "o/a", "size": 42})
+        self.assertEqual(fetch_repo_info("o/a")["size"], 42)
+
+    @patch("github_trending.rate_limit")
+    @patch("github_trending.subprocess.run")
+    def test_deps_single_graphql_query(self, mock_run, _):
+        from github_trending import DEPENDENCY_FILES, fetch_deps
+        i = DEPENDENCY_FILES.index("package.json")
+        mock_run.return_value = self._gh({"data": {"repository": {
+            "f0": {"text": "requests\n"}, f"f{i}": {"text": "{}"}, "f1": None, "f2": {"text": None},
+        }}})
+        self.assertEqual(fetch_deps("o/r"), {"requirements.txt": "requests\n", "package.json": "{}"})
+        mock_run.assert_called_once()
+        self.assertEqual(mock_run.call_args[0][0][:3], ["gh", "api", "graphql"])
+        self.assertIn("name=r", mock_run.call_args[0][0])
+        # Cached under the same key as before
+        fetch_deps("o/r")
+        mock_run.assert_called_once()
+
+    @patch("github_trending.rate_limit")
+    @patch("github_trending.subprocess.run")
+    def test_deps_graphql_globs_matched_from_root_listing(self, mock_run, _):
+        from github_trending import _DEPS_QUERY, fetch_deps
+        self.assertNotIn("*", _DEPS_QUERY)
+        graphql = self._gh({"data": {"repository": {
+            "f0": {"text": "requests\n"},
+            "root": {"entries": [{"name": "App.csproj", "type": "blob"}, {"name": "requirements.txt", "type": "blob"},
+                                 {"name": "Lib.fsproj", "type": "tree"}]},
+        }}})
+        probe = type("R", (), {"returncode": 0, "stdout": "<Project/>"})()
+        mock_run.side_effect = lambda cmd, **kw: graphql if cmd[2] == "graphql" else probe
+        self.assertEqual(fetch_deps("o/r"), {"requirements.txt": "requests\n", "App.csproj": "<Project/>"})
+        # The one GraphQL query, then a REST fetch for the single glob match
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(mock_run.call_args[0][0][2], "repos/o/r/contents/App.csproj")
+
+    @patch("github_trending.rate_limit")
+    @patch("github_trending.subprocess.run")
+    def test_issue_detail_one_query_for_issue_or_pr(self, mock_run, _):
+        from github_trending import fetch_issue_detail
+        node = {"number": 5, "title": "Add x", "state": "MERGED", "body": "b", "createdAt": "2026-01-01T00:00:00Z",
+                "url": "https://github.com/o/r/pull/5", "author": {"login": "alice"},
+                "labels": {"nodes": [{"name": "feat", "description": None, "color": "fff"}]},
+                "comments": {"nodes": [{"author": {"login": "bob"}, "body": "lgtm",
+                                        "createdAt": "2026-01-02T00:00:00Z", "url": "u"}]}}
+        mock_run.return_value = self._gh({"data": {"repository": {"issueOrPullRequest": node}}})
+        detail = fetch_issue_detail("o/r", 5)
+        self.assertEqual(detail["state"], "MERGED")
+        self.assertEqual(detail["labels"], [{"name": "feat", "description": None, "color": "fff"}])
+        self.assertEqual(detail["comments"][0]["author"], {"login": "bob"})
+        mock_run.assert_called_once()
+        self.assertIn("number=5", mock_run.call_args[0][0])
+        
+        mock_run.return_value = self._gh({"data": {"repository": {"issueOrPullRequest": None}}})
+        self.assertEqual(fetch_issue_detail("o/r", 6), {})
+
+    @patch("github_trending.rate_limit")
+    @patch("github_trending.subprocess.run")
+    def test_issues_with_detail_one_query(self, mock_run, _):
+        from github_trending import fetch_issue_detail, fetch_issues, fetch_issues_with_detail
+        label = {"name": "bug", "description": None, "color": "f00"}
+        listed = [{"number": n, "title": f"t{n}", "state": "OPEN", "author": {"login": "a"},
+                   "labels": {"nodes": [label]}, "createdAt": "2026-01-01T00:00:00Z", "url": f"u{n}"}
+                  for n in (9, 8, 7)]
+        target = {"number": 8, "title": "t8", "state": "OPEN", "body": "b", "createdAt": "2026-01-01T00:00:00Z",
+                  "url": "u8", "author": {"login": "a"}, "labels": {"nodes": [label]},
+                  "comments": {"nodes": [{"author": {"login": "b"}, "body": "c", "createdAt": "x", "url": "y"}]}}
+        mock_run.return_value = self._gh({"data": {"repository": {"issues": {"nodes": listed}, "target": target}}})
+        issues, detail = fetch_issues_with_detail("o/r", 2, 8)
+        self.assertEqual([i["number"] for i in issues], [9, 8])
+        self.assertEqual(issues[0]["labels"], [label])
+        self.assertEqual(detail["comments"], [{"author": {"login": "b"}, "body": "c", "createdAt": "x", "url": "y"}])
+        mock_run.assert_called_once()
+        self.assertIn("number=8", mock_run.call_args[0][0])
+        # Both separate fetches are answered from the entries it wrote
+        self.assertEqual(len(fetch_issues("o/r", 10)), 3)
+        self.assertEqual(fetch_issue_detail("o/r", 8), detail)
+        mock_run.assert_called_once()
+
+    @patch("github_trending.rate_limit")
+    @patch("github_trending.subprocess.run")
+    def test_deps_fall_back_to_parallel_rest_probes(self, mock_run, _):
+        from github_trending import DEPENDENCY_FILES, fetch_deps
+        failed = type("R", (), {"returncode": 1, "stdout": b"", "stderr": b"auth required"})()
+        rest_miss = type("R", (), {"returncode": 1, "stdout": ""})()
+        rest_hit = type("R", (), {"returncode": 0, "stdout": "[package]\n"})()
+        mock_run.side_effect = lambda cmd, **kw: (
+            failed if cmd[2] == "graphql" else rest_hit if cmd[2].endswith("/Cargo.toml") else rest_miss)
+        self.assertEqual(fetch_deps("o/r"), {"Cargo.toml": "[package]\n"})
+        # GraphQL, the (failed) root listing, then every literal name (no globs)
+        literal = [dep_file for dep_file in DEPENDENCY_FILES if "*" not in dep_file]
+        self.assertEqual(mock_run.call_count, 2 + len(literal))
+
+    @patch("github_trending.rate_limit")
+    @patch("github_trending.subprocess.run")
+    def test_deps_rest_probes_only_listed_files(self, mock_run, _):
+        from github_trending import fetch_deps
+        failed = type("R", (), {"returncode": 1, "stdout": b"", "stderr": b"auth required"})()
+        listing = self._gh([{"name": "Cargo.toml", "type": "file"}, {"name": "App.csproj", "type": "file"},
+                            {"name": "README.md", "type": "file"}, {"name": "go.mod", "type": "dir"}])
+        hit = lambda body: type("R", (), {"returncode": 0, "stdout": body})()
+        probes = {"Cargo.toml": hit("[package]\n"), "App.csproj": hit("<Project/>")}
+        mock_run.side_effect = lambda cmd, **kw: (
+            failed if cmd[2] == "graphql" else listing if cmd[2].endswith("/contents/")
+            else probes[cmd[2].rpartition("/")[2]])
+        self.assertEqual(fetch_deps("o/r"), {"Cargo.toml": "[package]\n", "App.csproj": "<Project/>"})
+        self.assertEqual(mock_run.call_count, 4)
+
+    @patch("github_trending.rate_limit")
+    @patch("github_trending.subprocess.run")
+    def test_deps_rest_probes_use_cached_tree(self, mock_run, _):
+        from github_trending import _root_file_names
+        write_cache("repo_info", "/repos/o/r", {"default_branch": "dev"})
+        write_cache("tree", "/repos/o/r/git/trees/dev", [
+            {"path": "setup.py", "type": "blob"}, {"path": "src", "type": "tree"},
+            {"path": "src/package.json", "type": "blob"}])
+        self.assertEqual(_root_file_names("o/r"), ["setup.py"])
+        mock_run.assert_not_called()
+
+
+class TestIssuesRouting(unittest.TestCase):
+    def _main(self, *argv):
+        import contextlib
+        import github_trending
+        out = io.StringIO()
+        with patch("sys.argv", ["gt", *argv]), patch.object(github_trending, "USE_COLOR", False), \
+                patch.object(github_trending, "USE_CACHE", True), contextlib.redirect_stdout(out):
+            github_trending.main()
+        return out.getvalue()
+
+    @patch("github_trending.fetch_issues_with_detail")
+    def test_raw_issues_with_detail_is_one_json_document(self, mock_fetch):
+        issue = {"number": 8, "title": "t8", "comments": []}
+        mock_fetch.return_value = ([{"number": 9}, issue], issue)
+        payload = json.loads(self._main("--issues-repo", "o/r", "--issue", "8", "--raw"))
+        self.assertEqual(payload, {"repo": "o/r", "total": 2, "issues": [{"number": 9}, issue], "issue": issue})
+
+    @patch("github_trending.show_issues_with_detail")
+    @patch("github_trending.show_issue_detail")
+    @patch("github_trending.show_issues")
+    @patch("github_trending.fetch_trending")
+    def test_issue_for_other_repo_not_dropped(self, mock_trending, mock_issues, mock_detail, mock_combined):
+        mock_trending.return_value = {"items": [dict(SAMPLE_REPOS[0])]}
+        self._main("--issues", "1", "--issue", "5", "--issue-repo", "other/repo")
+        mock_combined.assert_not_called()
+        mock_issues.assert_called_once_with("owner/repo-a", limit=10, raw=False)
+        mock_detail.assert_called_once_with("other/repo", 5, raw=False)
+
+    @patch("github_trending.show_issues_with_detail")
+    @patch("github_trending.fetch_trending")
+    def test_issue_for_listed_repo_uses_combined_fetch(self, mock_trending, mock_combined):
+        mock_trending.return_value = {"items": [dict(SAMPLE_REPOS[0])]}
+        self._main("--issues", "1", "--issue", "5")
+        mock_combined.assert_called_once_with("owner/repo-a", 5, 10, raw=False)
+
+
+class TestPrintRepos(unittest.TestCase):
+    @patch("github_trending.USE_COLOR", False)
+    def test_listing_written_in_one_call(self):
+        from github_trending import print_repos
+        out = io.StringIO()
+        with patch.object(out, "write", wraps=out.write) as write:
+            print_repos(SAMPLE_REPOS[:2], verbose=True, file=out)
+        self.assertEqual(write.call_count, 2)  # the listing, then print's end="\n"
+        self.assertEqual(out.getvalue().splitlines()[1:5], [
+            "1. owner/repo-a", "   ⭐ 12,345 (+200 today) [Python]",
+            "   A great Python framework", "   🔗 https://github.com/owner/repo-a"])
+
+
+class TestShowIssues(unittest.TestCase):
+    def _icons(self, issues):
+        from github_trending import show_issues
+        with patch("github_trending.fetch_issues", return_value=issues), patch("builtins.print") as mock_print:
+            show_issues("o/r")
+        return [c[0][0].split()[0] for c in mock_print.call_args_list if c[0] and "#" in str(c[0][0])]
+
+    def test_pr_detection_uses_keys_not_text(self):
+        issues = [
+            {"number": 1, "title": "Mentions pullRequest in the title", "state": "open", "url": "https://github.com/o/r/issues/1"},
+            {"number": 2, "title": "REST PR", "state": "open", "pull_request": {"url": "x"}},
+            {"number": 3, "title": "gh PR", "state": "OPEN", "url": "https://github.com/o/r/pull/3"},
+        ]
+        self.assertEqual(self._icons(issues), ["🟢", "🔀", "🔀"])
+
+
+class TestIssueFieldHelpers(unittest.TestCase):
+    def test_names_from_dicts_strings_or_none(self):
+        from github_trending import _names
+        self.assertEqual(_names([{"name": "bug"}, {"color": "fff"}, "plain"]), ["bug", "", "plain"])
+        self.assertEqual(_names(None), [])
+
+    def test_login(self):
+        from github_trending import _login
+        self.assertEqual(_login({"login": "alice"}), "alice")
+        self.assertEqual(_login({}), "unknown")
+        self.assertEqual(_login("bob"), "bob")
+
+
+class TestGitHubApiToken(unittest.TestCase):
+    """With a token set, helpers call api.github.com directly instead of spawning gh."""
+
+    def setUp(self):
+        self.tmpdir = use_temp_cache_dir(self)
+        for target, value in (("github_trending._github_token", "tok"), ("github_trending.rate_limit", None)):
+            patcher = patch(target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    REST_ISSUE = {
+        "number": 7, "title": "Bug", "state": "open", "user": {"login": "alice"},
+        "labels": [{"name": "bug", "color": "d73a4a", "description": None}],
+        "created_at": "2026-01-02T00:00:00Z", "html_url": "https://github.com/o/r/issues/7",
+        "body": None, "comments": 1,
+    }
+
+    @patch("github_trending.subprocess.run")
+    @patch("github_trending.http_request")
+    def test_issues_mapped_to_gh_shape_without_prs(self, mock_http, mock_run):
+        from github_trending import fetch_issues
+        pr = dict(self.REST_ISSUE, number=8, pull_request={"url": "..."})
+        mock_http.return_value = (200, {}, json.dumps([self.REST_ISSUE, pr]).encode())
+        issues = fetch_issues("o/r")
+        self.assertEqual(issues, [{
+            "author": {"login": "alice"}, "body": "", "createdAt": "2026-01-02T00:00:00Z",
+            "url": "https://github.com/o/r/issues/7", "number": 7, "title": "Bug", "state": "OPEN",
+            "labels": [{"name": "bug", "description": "", "color": "d73a4a"}],
+        }])
+        url, headers = mock_http.call_args[0]
+        self.assertTrue(url.startswith("https://api.github.com/repos/o/r/issues?"))
+        self.assertEqual(headers["Authorization"], "Bearer tok")
+        mock_run.assert_not_called()
+
+    @patch("github_trending.subprocess.run")
+    @patch("github_trending.http_request")
+    def test_issue_detail_includes_comments(self, mock_http, mock_run):
+        from github_trending import fetch_issue_detail
+        comment = {"user": {"login": "bob"}, "body": "Same here", "created_at": "2026-01-03T00:00:00Z",
+                   "html_url": "https://github.com/o/r/issues/7#c1"}
+        mock_http.side_effect = [(200, {}, json.dumps(self.REST_ISSUE).encode()),
+                                 (200, {}, json.dumps([comment]).encode())]
+        detail = fetch_issue_detail("o/r", 7)
+        self.assertEqual(detail["title"], "Bug")
+        self.assertEqual(detail["comments"][0]["author"], {"login": "bob"})
+        self.assertEqual(detail["comments"][0]["body"], "Same here")
+        self.assertIn("/repos/o/r/issues/7/comments", mock_http.call_args[0][0])
+        mock_run.assert_not_called()
+
+    @patch("github_trending.http_request")
+    def test_issue_detail_not_found_is_quiet(self, mock_http):
+        from urllib.error import HTTPError
+        from github_trending import fetch_issue_detail
+        mock_http.side_effect = HTTPError("u", 404, "Not Found", {}, None)
+        with patch("builtins.print") as mock_print:
+            self.assertEqual(fetch_issue_detail("o/r", 99), {})
+        mock_print.assert_not_called()
+
+    def _expire(self, key):
+        import github_trending
+        path = github_trending.get_cache_path("issues", key)
+        entry = json.loads(path.read_text())
+        entry["_cached_at"] = 0
+        path.write_text(json.dumps(entry))
+
+    @patch("github_trending.http_request")
+    def test_expired_issues_revalidated_with_etag(self, mock_http):
+        from github_trending import fetch_issues
+        mock_http.return_value = (200, {"ETag": 'W/"i1"'}, json.dumps([self.REST_ISSUE]).encode())
+        first = fetch_issues("o/r")
+        self._expire("issues_o_r")
+        
+        mock_http.return_value = (304, {}, b"")
+        self.assertEqual(fetch_issues("o/r"), first)
+        self.assertEqual(mock_http.call_args[0][1]["If-None-Match"], 'W/"i1"')
+        # The 304 refreshed the entry, so the next call is a plain cache hit
+        fetch_issues("o/r")
+        self.assertEqual(mock_http.call_count, 2)
+
+    @patch("github_trending.http_request")
+    def test_issue_detail_cached_and_revalidated(self, mock_http):
+        from github_trending import fetch_issue_detail
+        issue = dict(self.REST_ISSUE, comments=0)
+        mock_http.return_value = (200, {"ETag": '"d1"'}, json.dumps(issue).encode())
+        first = fetch_issue_detail("o/r", 7)
+        self.assertEqual(fetch_issue_detail("o/r", 7), first)
+        mock_http.assert_called_once()
+        
+        self._expire("issue_o_r_7")
+        mock_http.return_value = (304, {}, b"")
+        self.assertEqual(fetch_issue_detail("o/r", 7), first)
+        self.assertEqual(mock_http.call_args[0][1]["If-None-Match"], '"d1"')
+
+    @patch("github_trending.subprocess.run")
+    @patch("github_trending.http_request")
+    def test_deps_graphql_posted_directly(self, mock_http, mock_run):
+        from github_trending import fetch_deps
+        mock_http.return_value = (200, {}, json.dumps({"data": {"repository": {"f0": {"text": "x\n"}}}}).encode())
+        self.assertEqual(fetch_deps("o/r"), {"requirements.txt": "x\n"})
+        url, _ = mock_http.call_args[0]
+        self.assertEqual(url, "https://api.github.com/graphql")
+        self.assertEqual(json.loads(mock_http.call_args[1]["data"])["variables"], {"owner": "o", "name": "r"})
+        mock_run.assert_not_called()
+
+
+class TestFetchReadme(unittest.TestCase):
+    @patch("github_trending.http_request")
+    @patch("github_trending.subprocess.run")
+    def test_raw_media_type_needs_no_decoding(self, mock_run, mock_http):
+        from github_trending import fetch_readme
+        mock_run.return_value = type("R", (), {"returncode": 0, "stdout": "# Tïtle\n".encode()})()
+        self.assertEqual(fetch_readme("o/r"), "# Tïtle\n")
+        self.assertIn("Accept: application/vnd.github.raw", mock_run.call_args[0][0])
+        mock_http.assert_not_called()
+
+    @patch("github_trending.http_request")
+    @patch("github_trending.subprocess.run")
+    def test_falls_back_to_master_branch(self, mock_run, mock_http):
+        from urllib.error import HTTPError
+        from github_trending import fetch_readme
+        mock_run.return_value = type("R", (), {"returncode": 1, "stdout": b""})()
+        mock_http.side_effect = [HTTPError("u", 404, "Not Found", {}, None), (200, {}, b"master readme")]
+        self.assertEqual(fetch_readme("o/r"), "master readme")
+        self.assertTrue(mock_http.call_args[0][0].endswith("/master/README.md"))
+
+    @patch("github_trending.fetch_readme")
+    def test_bulk_fetch_maps_titles_in_order(self, mock_fetch):
+        from github_trending import fetch_readmes_bulk
+        mock_fetch.side_effect = lambda title: None if title == "o/missing" else f"# {title}"
+        result = fetch_readmes_bulk(["o/a", "o/missing", "o/b", "o/a"])
+        self.assertEqual(list(result), ["o/a", "o/missing", "o/b"])
+        self.assertEqual(result["o/b"], "# o/b")
+        self.assertIsNone(result["o/missing"])
+        self.assertEqual(mock_fetch.call_count, 3)
+        self.assertEqual(fetch_readmes_bulk([]), {})
+
+
+# =============================================================================
+# parse_trending_html (fallback scraper)
+# =============================================================================
+
+STAR_SVG = ('<svg aria-label="star" height="16" viewBox="0 0 16 16" width="16">'
+            '<path d="M8 .25a.75.75 0 0 1 .673.418l1.882 3.815 4.21.612"></path></svg>')
+
+TRENDING_HTML = f"""
+<div class="Box">
+<article class="Box-row">
+  <div class="float-right d-flex">
+    <a href="/login?return_to=%2Fowner%2Frepo-a" class="btn-sm btn">Star</a>
+  </div>
+  <h2 class="h3 lh-condensed">
+    <a data-hydro-click="{{&quot;event_type&quot;:&quot;explore.click&quot;}}" href="/owner/repo-a" class="Link">
+      owner / repo-a
+    </a>
+  </h2>
+  <p class="col-9 color-fg-muted my-1 pr-4">
+        A Python project
+      </p>
+  <div class="f6 color-fg-muted mt-2">
+    <span class="d-inline-block ml-0 mr-3">
+      <span class="repo-language-color" style="background-color: #3572A5"></span>
+      <span itemprop="programmingLanguage">Python</span>
+    </span>
+    <a href="/owner/repo-a/stargazers" class="Link Link--muted d-inline-block mr-3">
+      {STAR_SVG}
+      12,345</a>
+    <a href="/owner/repo-a/forks" class="Link Link--muted d-inline-block mr-3">
+      {STAR_SVG}
+      1,000</a>
+    <span class="d-inline-block float-sm-right">
+      {STAR_SVG}
+      1,234 stars today
+    </span>
+  </div>
+</article>
+<article class="Box-row">
+  <h2 class="h3 lh-condensed"><a href="/org/repo-b" class="Link">org / repo-b</a></h2>
+  <div class="f6 color-fg-muted mt-2">
+    <a href="/org/repo-b/stargazers" class="Link Link--muted">{STAR_SVG} 99</a>
+    <span class="d-inline-block float-sm-right">{STAR_SVG} 7 stars this week</span>
+  </div>
+</article>
+</div>
+"""
+
+
+class TestParseTrendingHtml(unittest.TestCase):
+    def test_parses_fields_from_markup(self):
+        repos = parse_trending_html(TRENDING_HTML)
+        self.assertEqual([r["title"] for r in repos], ["owner/repo-a", "org/repo-b"])
+        first = repos[0]
+        self.assertEqual(first["description"], "A Python project")
+        self.assertEqual(first["language"], "Python")
+        self.assertEqual(first["stars"], "12,345")
+        self.assertEqual(first["_stars_int"], 12345)
+        self.assertEqual(first["todayStars"], "1,234")
+        self.assertEqual(first["_today_int"], 1234)
+        self.assertEqual(first["link"], "https://github.com/owner/repo-a")
+
+    def test_missing_fields_default(self):
+        second = parse_trending_html(TRENDING_HTML)[1]
+        self.assertEqual(second["description"], "")
+        self.assertEqual(second["language"], "")
+        self.assertEqual(second["stars"], "99")
+        self.assertEqual(second["todayStars"], "7")
+
+    def test_parses_raw_response_bytes(self):
+        html = TRENDING_HTML.replace("A Python project", "Ünïcode — 项目").encode("utf-8")
+        first = parse_trending_html(html)[0]
+        self.assertEqual(first["description"], "Ünïcode — 项目")
+        self.assertEqual(first["title"], "owner/repo-a")
+        self.assertEqual(first["stars"], "12,345")
+
+    def test_invalid_byte_does_not_abort_listing(self):
+        html = TRENDING_HTML.encode("utf-8").replace(b"A Python project", b"Bad \xff byte")
+        repos = parse_trending_html(html)
+        self.assertEqual([r["title"] for r in repos], ["owner/repo-a", "org/repo-b"])
+        self.assertEqual(repos[0]["description"], "Bad \ufffd byte")
+
+    def test_unclosed_article_ignored(self):
+        html = TRENDING_HTML + '<article class="Box-row"><h2><a href="/x/cut-off">'
+        self.assertEqual(len(parse_trending_html(html)), 2)
+
+    def test_article_without_heading_skipped(self):
+        html = '<article class="Box-row"><p class="col-9">orphan</p></article>'
+        self.assertEqual(parse_trending_html(html), [])
+
+
+class TestFetchTrending(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = use_temp_cache_dir(self)
+
+    @patch("github_trending.rate_limit")
+    @patch("github_trending.http_request")
+    def test_normalizes_api_fields_and_caches(self, mock_http, _rl):
+        from github_trending import fetch_trending
+        payload = {"items": [{"title": "o/r", "url": "https://github.com/o/r", "addStars": "5"}]}
+        mock_http.return_value = (200, {}, json.dumps(payload).encode())
+        data = fetch_trending("daily", "python")
+        self.assertEqual(data["items"][0]["link"], "https://github.com/o/r")
+        self.assertEqual(data["items"][0]["todayStars"], "5")
+        self.assertEqual(data["items"][0]["_stars_int"], 0)
+        self.assertEqual(data["items"][0]["_today_int"], 5)
+        self.assertEqual(fetch_trending("daily", "python"), data)
+        mock_http.assert_called_once()
+
+    @patch("github_trending.rate_limit")
+    @patch("github_trending.http_request")
+    def test_non_numeric_counts_do_not_break_listing(self, mock_http, _rl):
+        from github_trending import fetch_trending
+        payload = {"items": [{"title": "o/r", "url": "u", "stars": "lots", "addStars": "?"}]}
+        mock_http.return_value = (200, {}, json.dumps(payload).encode())
+        item = fetch_trending("daily", "go")["items"][0]
+        self.assertEqual((item["_stars_int"], item["_today_int"]), (0, 0))
+
+    @patch("github_trending.rate_limit")
+    @patch("github_trending.http_request")
+    def test_expired_entry_revalidated_with_etag(self, mock_http, _rl):
+        import github_trending
+        from github_trending import fetch_trending
+        payload = {"items": [{"title": "o/r", "link": "https://github.com/o/r"}]}
+        mock_http.return_value = (200, {"ETag": 'W/"v1"'}, json.dumps(payload).encode())
+        first = fetch_trending("weekly", "rust")
+        
+        path = github_trending.get_cache_path("trending", "weekly_rust")
+        entry = json.loads(path.read_text())
+        entry["_cached_at"] = 0
+        path.write_text(json.dumps(entry))
+        
+        mock_http.return_value = (304, {}, b"")
+        self.assertEqual(fetch_trending("weekly", "rust"), first)
+        self.assertEqual(mock_http.call_args[0][1]["If-None-Match"], 'W/"v1"')
+        self.assertEqual(github_trending.read_cache("trending", "weekly_rust"), first)
+
+    @patch("github_trending.rate_limit")
+    @patch("github_trending.http_request")
+    def test_no_cache_skips_revalidation(self, mock_http, _rl):
+        from github_trending import fetch_trending
+        payload = {"items": [{"title": "o/r", "link": "https://github.com/o/r"}]}
+        mock_http.return_value = (200, {"ETag": 'W/"v1"'}, json.dumps(payload).encode())
+        fetch_trending("weekly", "go")
+        with patch("github_trending.USE_CACHE", False):
+            fetch_trending("weekly", "go")
+        self.assertIsNone(mock_http.call_args[0][1])
+
+
+# =============================================================================
+# http_request (keep-alive connections)
+# =============================================================================
+
+
+class TestHttpRequest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path == "/moved":
+                    self.send_response(301)
+                    self.send_header("Location", "/echo")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = 404 if self.path == "/missing" else 200
+                body = json.dumps({"path": self.path, "client_port": self.client_address[1]}).encode()
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.server.daemon_threads = True
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_reuses_connection(self):
+        _, _, first = http_request(f"{self.base}/echo?a=1")
+        _, _, second = http_request(f"{self.base}/echo?b=2")
+        self.assertEqual(json.loads(first)["path"], "/echo?a=1")
+        self.assertEqual(json.loads(first)["client_port"], json.loads(second)["client_port"])
+
+    def test_follows_redirects(self):
+        status, _, body = http_request(f"{self.base}/moved")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["path"], "/echo")
+
+    def test_error_status_raises_http_error(self):
+        from urllib.error import HTTPError
+        with self.assertRaises(HTTPError) as ctx:
+            http_request(f"{self.base}/missing")
+        self.assertEqual(ctx.exception.code, 404)
+
+
+# =============================================================================
+# clone_repos (parallel clones)
+# =============================================================================
+
+
+class TestCloneRepos(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmpdir = tmp.name
+
+    @patch("github_trending.subprocess.run")
+    def test_clones_all_and_counts_successes(self, mock_run):
+        from github_trending import clone_repos
+        def fake_git(cmd, **kwargs):
+            code = 1 if cmd[-1].endswith("repo-b") else 0
+            return type("R", (), {"returncode": code, "stderr": "boom"})()
+        mock_run.side_effect = fake_git
+        with patch("builtins.print"):
+            success = clone_repos(SAMPLE_REPOS[:3], self.tmpdir, shallow=True)
+        self.assertEqual(success, 2)
+        self.assertEqual(mock_run.call_count, 3)
+        self.assertIn("--depth", mock_run.call_args[0][0])
+
+    @patch("github_trending.subprocess.run")
+    def test_same_directory_cloned_once(self, mock_run):
+        from github_trending import clone_repos
+        mock_run.return_value = type("R", (), {"returncode": 0, "stderr": ""})()
+        repos = [{"title": "alice/tool"}, {"title": "bob/tool"}]
+        with patch("builtins.print"):
+            self.assertEqual(clone_repos(repos, self.tmpdir), 1)
+        mock_run.assert_called_once()
+
+
+class TestParseCloneNumbers(unittest.TestCase):
+    def test_lists_and_ranges(self):
+        from github_trending import parse_clone_numbers
+        self.assertEqual(parse_clone_numbers("1,3-5,7"), [1, 3, 4, 5, 7])
+        self.assertEqual(parse_clone_numbers(" 2 , 4 - 5 "), [2, 4, 5])
+
+    def test_malformed_or_oversized(self):
+        from github_trending import CLONE_NUMBERS_LIMIT, parse_clone_numbers
+        for spec in ("x", "1,,2", "1-2-3", ""):
+            self.assertIsNone(parse_clone_numbers(spec), spec)
+        self.assertIsNone(parse_clone_numbers("1-999999999"))
+        self.assertEqual(len(parse_clone_numbers(f"1-{CLONE_NUMBERS_LIMIT}")), CLONE_NUMBERS_LIMIT)
+
+
+class TestListClonedRepos(unittest.TestCase):
+    @patch("github_trending.subprocess.run")
+    def test_lists_only_git_dirs(self, mock_run):
+        from github_trending import list_cloned_repos
+        mock_run.side_effect = lambda cmd, **kwargs: type(
+            "R", (), {"returncode": 0, "stdout": f"https://github.com/o/{os.path.basename(cmd[2])}.git\n"})()
+        with tempfile.TemporaryDirectory() as d:
+            for name in ("alpha", "beta"):
+                os.makedirs(os.path.join(d, name, ".git"))
+            os.makedirs(os.path.join(d, "not-a-repo"))
+            clones = list_cloned_repos(d)
+        names = sorted(c["name"] for c in clones)
+        self.assertEqual(names, ["alpha", "beta"])
+        remotes = {c["name"]: c["remote"] for c in clones}
+        self.assertEqual(remotes["beta"], "https://github.com/o/beta.git")
+
+
 # =============================================================================
 # sanitize_repo_dir_name
 # =============================================================================
@@ -235,26 +1044,28 @@ class TestSanitizeRepoDirName(unittest.TestCase):
 
 class TestCacheSystem(unittest.TestCase):
     def setUp(self):
-        self.tmpdir = tempfile.mkdtemp()
-        self._orig_cache_dir = None
-
-    def tearDown(self):
-        import shutil
-        shutil.rmtree(self.tmpdir, ignore_errors=True)
-        if self._orig_cache_dir is not None:
-            import github_trending
-            github_trending.CACHE_DIR = self._orig_cache_dir
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmpdir = tmp.name
 
     def _patch_cache_dir(self):
         import github_trending
-        self._orig_cache_dir = github_trending.CACHE_DIR
-        github_trending.CACHE_DIR = Path(self.tmpdir)
+        patcher = patch.object(github_trending, "CACHE_DIR", Path(self.tmpdir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_get_cache_path_deterministic(self):
         p1 = get_cache_path("trending", "python-daily")
         p2 = get_cache_path("trending", "python-daily")
         self.assertEqual(p1, p2)
 
+    def test_get_cache_path_follows_cache_dir(self):
+        before = get_cache_path("trending", "python-daily")
+        self._patch_cache_dir()
+        after = get_cache_path("trending", "python-daily")
+        self.assertEqual(after.parent.parent, Path(self.tmpdir))
+        self.assertEqual(after.name, before.name)
+
     def test_get_cache_path_different_keys(self):
         p1 = get_cache_path("trending", "python-daily")
         p2 = get_cache_path("trending", "rust-weekly")
@@ -267,6 +1078,21 @@ class TestCacheSystem(unittest.TestCase):
         result = read_cache("trending", "test-key")
         self.assertEqual(result, data)
 
+    def test_same_size_rewrite_within_mtime_tick_not_stale(self):
+        self._patch_cache_dir()
+        import github_trending
+        with patch("github_trending.time.time", return_value=1000.0):
+            write_cache("trending", "tick", {"v": "a"})
+            self.assertEqual(read_cache("trending", "tick"), {"v": "a"})
+            path = github_trending.get_cache_path("trending", "tick")
+            st = os.stat(path)
+            write_cache("trending", "tick", {"v": "b"})
+        # Back-date the rewrite to the old mtime, as a coarse clock would leave it
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertEqual(os.path.getsize(path), st.st_size)
+        with patch("github_trending.time.time", return_value=1000.0):
+            self.assertEqual(read_cache("trending", "tick"), {"v": "b"})
+
     def test_read_nonexistent_cache(self):
         self._patch_cache_dir()
         result = read_cache("trending", "nonexistent-key")
@@ -276,16 +1102,55 @@ class TestCacheSystem(unittest.TestCase):
         self._patch_cache_dir()
         import github_trending
 
-        # Write with a very short TTL
-        old_ttl = github_trending.CACHE_TTL.get("trending")
-        github_trending.CACHE_TTL["trending"] = 0  # expire immediately
-        try:
-            write_cache("trending", "expiry-key", {"test": True})
-            time.sleep(0.1)
-            result = read_cache("trending", "expiry-key")
-            self.assertIsNone(result)
-        finally:
-            github_trending.CACHE_TTL["trending"] = old_ttl
+        # Step the clock past the real TTL instead of sleeping through a short one
+        ttl = github_trending.CACHE_TTL["trending"]
+        written_at = time.time()
+        write_cache("trending", "expiry-key", {"test": True})
+        with patch("github_trending.time.time", return_value=written_at + ttl - 1):
+            self.assertEqual(read_cache("trending", "expiry-key"), {"test": True})
+        with patch("github_trending.time.time", return_value=written_at + ttl + 1):
+            self.assertIsNone(read_cache("trending", "expiry-key"))
+
+    def test_corrupt_cache_file(self):
+        self._patch_cache_dir()
+        path = get_cache_path("trending", "corrupt-key")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"\xff\xfe not json")
+        self.assertIsNone(read_cache("trending", "corrupt-key"))
+
+    def test_non_ascii_round_trip(self):
+        self._patch_cache_dir()
+        data = {"description": "Rust 工具 ⭐"}
+        write_cache("trending", "unicode-key", data)
+        self.assertEqual(read_cache("trending", "unicode-key"), data)
+
+    def test_hot_reread_skips_decode(self):
+        self._patch_cache_dir()
+        write_cache("trending", "hot-key", {"n": 1})
+        self.assertEqual(read_cache("trending", "hot-key"), {"n": 1})
+        with patch("github_trending.json.loads") as mock_loads:
+            self.assertEqual(read_cache("trending", "hot-key"), {"n": 1})
+        mock_loads.assert_not_called()
+
+    def test_rewrite_invalidates_decoded_copy(self):
+        self._patch_cache_dir()
+        write_cache("trending", "rewrite-key", {"n": 1})
+        self.assertEqual(read_cache("trending", "rewrite-key"), {"n": 1})
+        write_cache("trending", "rewrite-key", {"n": 22})
+        self.assertEqual(read_cache("trending", "rewrite-key"), {"n": 22})
+
+    def test_decoded_copies_bounded_lru(self):
+        import github_trending
+        self._patch_cache_dir()
+        with patch("github_trending.DECODED_CACHE_SIZE", 2):
+            for key in ("a", "b", "c"):
+                write_cache("trending", key, {"k": key})
+                read_cache("trending", key)
+            read_cache("trending", "b")  # b becomes most recent; a was evicted first
+            write_cache("trending", "d", {"k": "d"})
+            read_cache("trending", "d")
+            kept = {github_trending.load_cache_file(p)["_key"] for p in list(github_trending._decoded_cache)}
+        self.assertEqual(kept, {"b", "d"})
 
     def test_clear_cache(self):
         self._patch_cache_dir()
@@ -301,84 +1166,80 @@ class TestCacheSystem(unittest.TestCase):
 # =============================================================================
 
 
-class TestExportCSV(unittest.TestCase):
+class TestExportCSV(TempDirPerClass, unittest.TestCase):
     def test_export_csv_creates_file(self):
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False, mode="w") as f:
-            fname = f.name
-        try:
-            export_csv(SAMPLE_REPOS, fname)
-            with open(fname, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-            self.assertEqual(len(rows), 4)
-            self.assertEqual(rows[0]["title"], "owner/repo-a")
-            self.assertEqual(rows[0]["rank"], "1")
-            self.assertEqual(rows[0]["url"], "https://github.com/owner/repo-a")
-        finally:
-            os.unlink(fname)
+        fname = self.tmp_path(".csv")
+        export_csv(SAMPLE_REPOS, fname)
+        with open(fname, "r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["title"], "owner/repo-a")
+        self.assertEqual(rows[0]["rank"], "1")
+        self.assertEqual(rows[0]["url"], "https://github.com/owner/repo-a")
 
     def test_export_csv_empty_repos(self):
         """Empty repo list should not create a file."""
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False, mode="w") as f:
-            fname = f.name
-        os.unlink(fname)
+        fname = self.tmp_path(".csv")
         export_csv([], fname)
         self.assertFalse(os.path.exists(fname))
 
     def test_export_csv_fields(self):
-        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False, mode="w") as f:
-            fname = f.name
-        try:
-            export_csv(SAMPLE_REPOS[:1], fname)
-            with open(fname, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                row = next(reader)
-            self.assertIn("rank", row)
-            self.assertIn("title", row)
-            self.assertIn("stars", row)
-            self.assertIn("today_stars", row)
-            self.assertIn("language", row)
-            self.assertIn("description", row)
-            self.assertIn("url", row)
-        finally:
-            os.unlink(fname)
-
-
-class TestExportJSON(unittest.TestCase):
+        fname = self.tmp_path(".csv")
+        export_csv(SAMPLE_REPOS[:1], fname)
+        with open(fname, "r", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            row = next(reader)
+        self.assertIn("rank", row)
+        self.assertIn("title", row)
+        self.assertIn("stars", row)
+        self.assertIn("today_stars", row)
+        self.assertIn("language", row)
+        self.assertIn("description", row)
+        self.assertIn("url", row)
+
+
+class TestExportJSON(TempDirPerClass, unittest.TestCase):
     def test_export_json_creates_file(self):
-        with tempfile.NamedTemporaryFile(suffix=".json", delete=False, mode="w") as f:
-            fname = f.name
-        try:
-            export_json(SAMPLE_REPOS, fname)
-            with open(fname, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            self.assertEqual(len(data), 4)
-            self.assertEqual(data[0]["rank"], 1)
-            self.assertEqual(data[0]["title"], "owner/repo-a")
-            self.assertEqual(data[0]["url"], "https://github.com/owner/repo-a")
-        finally:
-            os.unlink(fname)
+        fname = self.tmp_path(".json")
+        export_json(SAMPLE_REPOS, fname)
+        with open(fname, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.assertEqual(len(data), 4)
+        self.assertEqual(data[0]["rank"], 1)
+        self.assertEqual(data[0]["title"], "owner/repo-a")
+        self.assertEqual(data[0]["url"], "https://github.com/owner/repo-a")
 
     def test_export_json_clean_schema(self):
         """Exported JSON should have clean keys, no raw API data."""
-        with tempfile.NamedTemporaryFile(suffix=".json", delete=False, mode="w") as f:
-            fname = f.name
-        try:
-            export_json(SAMPLE_REPOS, fname)
-            with open(fname, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            expected_keys = {"rank", "title", "url", "description", "language", "stars", "stars_today"}
-            self.assertEqual(set(data[0].keys()), expected_keys)
-        finally:
-            os.unlink(fname)
+        fname = self.tmp_path(".json")
+        export_json(SAMPLE_REPOS, fname)
+        with open(fname, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        expected_keys = {"rank", "title", "url", "description", "language", "stars", "stars_today"}
+        self.assertEqual(set(data[0].keys()), expected_keys)
+
+    def test_export_json_matches_json_dump_layout(self):
+        """Streamed output is byte-identical to dumping the whole list at once."""
+        fname = self.tmp_path(".json")
+        export_json(SAMPLE_REPOS, fname)
+        with open(fname, "r", encoding="utf-8") as f:
+            raw = f.read()
+        self.assertEqual(raw, json.dumps(json.loads(raw), indent=2, ensure_ascii=False))
 
     def test_export_json_empty_repos(self):
-        with tempfile.NamedTemporaryFile(suffix=".json", delete=False, mode="w") as f:
-            fname = f.name
-        os.unlink(fname)
+        fname = self.tmp_path(".json")
         export_json([], fname)
         self.assertFalse(os.path.exists(fname))
 
+    def test_json_record_matches_json_dumps(self):
+        from github_trending import _json_record
+        record = {"rank": 1, "title": 'a "quoted" 中文\ttitle', "stars": 5, "none": None,
+                  "ratio": 1.5, "flag": True, "topics": ["x", {"y": 2}], "empty": {}}
+        expected = json.dumps(record, indent=2, ensure_ascii=False)
+        self.assertEqual(_json_record(record), expected)
+        self.assertEqual(_json_record(record, "  "), expected.replace("\n", "\n  "))
+
 
 # =============================================================================
 # output_json
@@ -386,22 +1247,24 @@ class TestExportJSON(unittest.TestCase):
 
 
 class TestOutputJSON(unittest.TestCase):
+    def _capture(self, repos, data):
+        """Run output_json and return the raw bytes written to stdout."""
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+        with patch("sys.stdout", stdout):
+            output_json(repos, data)
+        return stdout.buffer.getvalue()
+
     def test_output_json_structure(self, ):
         """output_json prints valid JSON with expected structure."""
         data = {"pubDate": "Thu, 20 Feb 2026 12:00:00 GMT"}
-        with patch("builtins.print") as mock_print:
-            output_json(SAMPLE_REPOS, data)
-        output = mock_print.call_args[0][0]
-        parsed = json.loads(output)
+        parsed = json.loads(self._capture(SAMPLE_REPOS, data))
         self.assertEqual(parsed["count"], 4)
         self.assertEqual(parsed["updated"], data["pubDate"])
         self.assertEqual(len(parsed["repositories"]), 4)
 
     def test_output_json_repo_fields(self):
         data = {"pubDate": ""}
-        with patch("builtins.print") as mock_print:
-            output_json(SAMPLE_REPOS[:1], data)
-        parsed = json.loads(mock_print.call_args[0][0])
+        parsed = json.loads(self._capture(SAMPLE_REPOS[:1], data))
         repo = parsed["repositories"][0]
         self.assertEqual(repo["rank"], 1)
         self.assertEqual(repo["title"], "owner/repo-a")
@@ -413,6 +1276,25 @@ class TestOutputJSON(unittest.TestCase):
         self.assertEqual(repo["stars"], "12,345")
         self.assertEqual(repo["stars_today"], "200")
 
+    def test_print_json_matches_dumps(self):
+        from contextlib import redirect_stdout
+        from github_trending import print_json
+        data = {"repo": "o/r", "tree": [{"path": "a.py", "size": 1}, {"path": "ü.md", "size": None}]}
+        out = io.StringIO()
+        with redirect_stdout(out):
+            print_json(data)
+        self.assertEqual(out.getvalue(), json.dumps(data, indent=2) + "\n")
+
+    def test_output_json_writes_utf8_bytes(self):
+        """Non-ASCII text is written as UTF-8, unescaped, with a trailing newline."""
+        repos = [{"title": "owner/zh", "description": "中文 — émoji ✨"}]
+        raw = self._capture(repos, {"pubDate": ""})
+        self.assertTrue(raw.endswith(b"}\n"))
+        self.assertIn("中文 — émoji ✨".encode("utf-8"), raw)
+        expected = json.dumps(
+            json.loads(raw), indent=2, ensure_ascii=False).encode("utf-8") + b"\n"
+        self.assertEqual(raw, expected)
+
 
 # =============================================================================
 # get_dir_size
@@ -433,9 +1315,29 @@ class TestGetDirSize(unittest.TestCase):
             result = get_dir_size(d)
             self.assertIn("KB", result)
 
+    def test_nested_dirs_counted(self):
+        with tempfile.TemporaryDirectory() as d:
+            os.makedirs(os.path.join(d, "a", "b"))
+            for rel in ("top.bin", os.path.join("a", "mid.bin"), os.path.join("a", "b", "deep.bin")):
+                with open(os.path.join(d, rel), "wb") as f:
+                    f.write(b"x" * 1024)
+            self.assertEqual(get_dir_size(d), "3.0 KB")
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "needs os.symlink")
+    def test_symlinks_not_followed(self):
+        with tempfile.TemporaryDirectory() as d, tempfile.TemporaryDirectory() as outside:
+            with open(os.path.join(outside, "big.bin"), "wb") as f:
+                f.write(b"x" * 4096)
+            try:
+                os.symlink(outside, os.path.join(d, "linked_dir"), target_is_directory=True)
+                os.symlink(os.path.join(outside, "big.bin"), os.path.join(d, "linked.bin"))
+            except OSError:
+                self.skipTest("symlinks not permitted")
+            self.assertEqual(get_dir_size(d), "0.0 B")
+
     def test_nonexistent_dir(self):
         result = get_dir_size("/nonexistent/path/abc123")
-        # os.walk silently yields nothing for missing paths on some platforms
+        # An unreadable root is skipped like any other directory
         self.assertIn(result, ("?", "0.0 B"))
 
 
@@ -472,6 +1374,32 @@ class TestScoreReadme(unittest.TestCase):
         score_without, _ = score_readme(readme_no_badge)
         self.assertGreater(score_with, score_without)
 
+    def test_keywords_case_insensitive(self):
+        _, note = score_readme("## INSTALLATION\nRun NPM i\n## Getting Started")
+        self.assertIn("install docs", note)
+        self.assertIn("usage docs", note)
+
+    def test_no_keywords(self):
+        _, note = score_readme("Just a description of the project.")
+        self.assertNotIn("install docs", note)
+        self.assertNotIn("usage docs", note)
+
+    def test_repeat_content_served_from_cache(self):
+        readme = "## Usage\n" + "y" * 900
+        score_readme(readme)
+        hits = score_readme.cache_info().hits
+        self.assertEqual(score_readme(readme), (7, "basic, usage docs"))
+        self.assertEqual(score_readme.cache_info().hits, hits + 1)
+
+    def test_bytes_match_str(self):
+        readme = "![ci](x)\n## Installation\npip install x\n## Usage\n" + "x" * 2000
+        self.assertEqual(score_readme(readme.encode()), score_readme(readme))
+
+    def test_length_bands(self):
+        self.assertEqual(score_readme("x" * 500), (0, "minimal"))
+        self.assertEqual(score_readme("x" * 501), (3, "basic"))
+        self.assertEqual(score_readme("x" * 2001), (5, "detailed"))
+
     def test_max_score_capped(self):
         readme = "x" * 5000 + "\n![badge](x)\n## Install\npip install x\n## Usage\nexample"
         score, _ = score_readme(readme)
@@ -505,6 +1433,13 @@ class TestScoreIssueResponse(unittest.TestCase):
         # 50% = 0.5, which is NOT > 0.5, so falls to next bracket (> 0.2 → 5)
         self.assertEqual(score, 5)
 
+    def test_band_edges_are_exclusive(self):
+        def issues(responded, total):
+            return [{"comments": 1}] * responded + [{"comments": 0}] * (total - responded)
+        self.assertEqual(score_issue_response(issues(1, 5)), (0, "Low response rate"))
+        self.assertEqual(score_issue_response(issues(4, 5)), (10, "80% responded"))
+        self.assertEqual(score_issue_response(issues(9, 10)), (15, "90% responded"))
+
 
 # =============================================================================
 # Analyzer: score_pr_merge_rate
@@ -564,6 +1499,27 @@ class TestScoreRecentCommits(unittest.TestCase):
         self.assertEqual(score, 0)
         self.assertIn("Inactive", note)
 
+    def test_zulu_and_offset_timestamps(self):
+        from datetime import datetime, timedelta, timezone
+        when = datetime.now(timezone.utc) - timedelta(days=10)
+        zulu = when.strftime("%Y-%m-%dT%H:%M:%SZ")
+        for date in (zulu, when.isoformat()):
+            score, note = score_recent_commits([{"commit": {"author": {"date": date}}}])
+            self.assertEqual(score, 15)
+            self.assertIn("10d ago", note)
+
+    def test_age_band_edges(self):
+        from datetime import datetime, timedelta, timezone
+        now = datetime.now(timezone.utc)
+        for days, expected in ((6, 20), (7, 15), (29, 15), (30, 10), (90, 5), (180, 0)):
+            date = (now - timedelta(days=days, minutes=1)).isoformat()
+            self.assertEqual(score_recent_commits([{"commit": {"author": {"date": date}}}])[0], expected, days)
+
+    def test_unparseable_date(self):
+        score, note = score_recent_commits([{"commit": {"author": {"date": "yesterday"}}}])
+        self.assertEqual(score, 10)
+        self.assertEqual(note, "Unknown activity")
+
     def test_malformed_commit(self):
         commits = [{"commit": {}}]
         score, _ = score_recent_commits(commits)
@@ -596,6 +1552,470 @@ class TestScoreRepoHealth(unittest.TestCase):
         info = {"license": None, "archived": False, "open_issues_count": 600}
         scores = score_repo_health(info)
         self.assertEqual(scores["low_open_issues"][0], 0)
+        self.assertIn("overloaded", scores["low_open_issues"][1])
+
+    def test_band_edges(self):
+        for open_issues, expected in ((19, 10), (20, 7), (99, 7), (100, 3), (499, 3), (500, 0)):
+            self.assertEqual(score_repo_health({"open_issues_count": open_issues})["low_open_issues"][0],
+                             expected, open_issues)
+        for stars, expected in ((100, 2), (101, 4), (1000, 4), (1001, 7), (10000, 7), (10001, 10)):
+            self.assertEqual(score_repo_health({"stargazers_count": stars})["stars_velocity"][0],
+                             expected, stars)
+
+
+# =============================================================================
+# Analyzer: .env loading
+# =============================================================================
+
+
+class TestLoadEnvFile(unittest.TestCase):
+    def test_skipped_when_token_already_set(self):
+        from analyzer import load_env_file
+        with patch.dict(os.environ, {"GITHUB_TOKEN": "tok"}), patch("builtins.open") as mock_open:
+            self.assertFalse(load_env_file())
+            mock_open.assert_not_called()
+
+    def test_reads_first_existing_file(self):
+        from analyzer import load_env_file
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        tmpdir = tmp.name
+        Path(tmpdir, ".env").write_text(
+            '# comment\nGITHUB_TOKEN = "abc123"\nEMPTY=\nOTHER=\'x y\'\n')
+        with patch.dict(os.environ, {}, clear=True), \
+                patch("analyzer.__file__", os.path.join(tmpdir, "a", "b", "analyzer.py")):
+            self.assertTrue(load_env_file())
+            self.assertEqual(os.environ["GITHUB_TOKEN"], "abc123")
+            self.assertEqual(os.environ["OTHER"], "x y")
+            self.assertNotIn("EMPTY", os.environ)
+
+
+# =============================================================================
+# Analyzer: score_repo
+# =============================================================================
+
+
+class TestScoreRepo(unittest.TestCase):
+    def test_keys_total_and_grade(self):
+        from analyzer import SCORE_KEYS
+        info = {"license": {"spdx_id": "MIT"}, "archived": False,
+                "open_issues_count": 5, "stargazers_count": 20000}
+        result = score_repo("owner/repo", info, [], [], [], None)
+        self.assertEqual(tuple(result["scores"]), SCORE_KEYS)
+        self.assertEqual(tuple(result["details"]), SCORE_KEYS)
+        # 0 commits + 0 readme + 15 issues + 10 PRs + 5 + 10 + 10 + 10
+        self.assertEqual(result["total"], 60)
+        self.assertEqual(result["total"], sum(result["scores"].values()))
+        self.assertEqual(result["grade"], "C")
+
+    def test_grade_band_edges(self):
+        cases = {39: "F", 40: "D", 54: "D", 55: "C", 70: "B", 84: "B", 85: "A", 100: "A"}
+        for total, grade in cases.items():
+            with patch("analyzer.score_recent_commits", return_value=(total - 60, "")):
+                info = {"license": {"spdx_id": "MIT"}, "archived": False,
+                        "open_issues_count": 5, "stargazers_count": 20000}
+                self.assertEqual(score_repo("o/r", info, [], [], [], None)["grade"], grade, total)
+
+
+# =============================================================================
+# Analyzer: analyze_repos
+# =============================================================================
+
+
+class TestLoadAnalyzer(unittest.TestCase):
+    def test_loaded_once_and_shares_this_module(self):
+        import analyzer
+        import github_trending
+        self.assertIs(github_trending._load_analyzer(), github_trending._load_analyzer())
+        self.assertIs(github_trending._load_analyzer().read_cache, github_trending.read_cache)
+        self.assertIs(github_trending._load_analyzer(), analyzer)
+
+
+class TestAnalyzeRepos(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = use_temp_cache_dir(self)
+
+    @patch("analyzer.GITHUB_TOKEN", "")
+    @patch("analyzer.get_rate_limit", return_value={"remaining": 5000, "limit": 5000, "reset": 0})
+    @patch("analyzer.analyze_repo")
+    def test_analyzes_all_and_sorts_by_total(self, mock_analyze, _rl):
+        totals = {"owner/repo-a": 40, "org/repo-b": 90, "user/repo-c": 65, "dev/repo-d": 10}
+        mock_analyze.side_effect = lambda title, **kwargs: {"repo": title, "total": totals[title]}
+        results = analyze_repos(SAMPLE_REPOS)
+        self.assertEqual([r["repo"] for r in results],
+                         ["org/repo-b", "user/repo-c", "owner/repo-a", "dev/repo-d"])
+        self.assertEqual(results[0]["trending"]["todayStars"], "50")
+
+    @patch("analyzer.GITHUB_TOKEN", "")
+    @patch("analyzer.get_rate_limit", return_value={"remaining": 5000, "limit": 5000, "reset": 0})
+    @patch("analyzer.analyze_repo")
+    def test_skips_invalid_titles(self, mock_analyze, _rl):
+        mock_analyze.side_effect = lambda title, **kwargs: {"repo": title, "total": 0}
+        results = analyze_repos([{"title": ""}, {"title": "no-slash"}, SAMPLE_REPOS[0]])
+        self.assertEqual([r["repo"] for r in results], ["owner/repo-a"])
+
+    @patch("analyzer.GITHUB_TOKEN", "")
+    @patch("analyzer.get_rate_limit")
+    @patch("analyzer.analyze_repo")
+    def test_cached_analyses_need_no_api_calls(self, mock_analyze, mock_rl):
+        import github_trending
+        for repo in SAMPLE_REPOS:
+            github_trending.write_cache("analysis", repo["title"], {"repo": repo["title"], "total": 50})
+        results = analyze_repos(SAMPLE_REPOS)
+        self.assertEqual(len(results), len(SAMPLE_REPOS))
+        mock_analyze.assert_not_called()
+        mock_rl.assert_not_called()
+        # The trending block is added per run, never stored
+        self.assertNotIn("trending", github_trending.read_cache("analysis", "owner/repo-a"))
+
+    @patch("analyzer.GITHUB_TOKEN", "")
+    @patch("analyzer.get_rate_limit", return_value={"remaining": 5000, "limit": 5000, "reset": 0})
+    @patch("analyzer.analyze_repo")
+    def test_force_ignores_cached_analyses(self, mock_analyze, _rl):
+        import github_trending
+        github_trending.write_cache("analysis", "owner/repo-a", {"repo": "owner/repo-a", "total": 1})
+        mock_analyze.side_effect = lambda title, **kwargs: {"repo": title, "total": 99}
+        results = analyze_repos(SAMPLE_REPOS[:1], use_cache=False)
+        self.assertEqual(results[0]["total"], 99)
+
+    @patch("analyzer.GITHUB_TOKEN", "t")
+    @patch("analyzer.get_rate_limit", return_value={"remaining": 5000, "limit": 5000, "reset": 0})
+    @patch("analyzer.get_readme", return_value={"_error": "rate_limited"})
+    @patch("analyzer.fetch_repos_graphql")
+    def test_failed_readme_fallback_not_cached(self, mock_graphql, mock_readme, _rl):
+        import github_trending
+        mock_graphql.return_value = {"owner/repo-a": ({"stargazers_count": 5}, [], [], [], None)}
+        results = analyze_repos(SAMPLE_REPOS[:1])
+        self.assertEqual(results[0]["details"]["readme_quality"], "No README")
+        mock_readme.assert_called_once_with("owner", "repo-a")
+        self.assertIsNone(github_trending.read_cache("analysis", "owner/repo-a"))
+
+
+class TestAnalyzeRepoShortCircuit(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = use_temp_cache_dir(self)
+
+    @patch("analyzer.get_readme")
+    @patch("analyzer.get_pull_requests")
+    @patch("analyzer.get_open_issues")
+    @patch("analyzer.get_commits")
+    @patch("analyzer.get_repo_info")
+    def test_empty_repo_skips_fetches(self, mock_info, *fetchers):
+        mock_info.return_value = {"size": 0, "open_issues_count": 0, "stargazers_count": 0,
+                                  "created_at": "2026-01-01T00:00:00Z", "pushed_at": "2026-01-01T00:00:00Z"}
+        result = analyze_repo("owner/empty")
+        self.assertEqual(result["repo"], "owner/empty")
+        for fetcher in fetchers:
+            fetcher.assert_not_called()
+
+    @patch("analyzer.get_readme", return_value=b"# Readme")
+    @patch("analyzer.get_pull_requests", return_value=[])
+    @patch("analyzer.get_commits", return_value=[])
+    @patch("analyzer.get_repo_info")
+    def test_zero_size_after_push_still_fetched(self, mock_info, mock_commits, _prs, mock_readme):
+        # REST size lags behind a first push; only pushed_at == created_at proves emptiness
+        mock_info.return_value = {"size": 0, "open_issues_count": 0, "stargazers_count": 0,
+                                  "created_at": "2026-01-01T00:00:00Z", "pushed_at": "2026-01-02T00:00:00Z"}
+        result = analyze_repo("owner/fresh")
+        mock_commits.assert_called_once()
+        mock_readme.assert_called_once()
+        self.assertEqual(result["details"]["readme_quality"], "minimal")
+
+    @patch("analyzer.get_readme", return_value=None)
+    @patch("analyzer.get_pull_requests", return_value=[])
+    @patch("analyzer.get_open_issues")
+    @patch("analyzer.get_commits", return_value=[])
+    @patch("analyzer.get_repo_info")
+    def test_no_open_issues_skips_issue_fetch(self, mock_info, _commits, mock_issues, mock_prs, _readme):
+        mock_info.return_value = {"size": 120, "open_issues_count": 0, "stargazers_count": 10}
+        analyze_repo("owner/quiet")
+        mock_issues.assert_not_called()
+        mock_prs.assert_called_once()
+
+    @patch("analyzer.ThreadPoolExecutor")
+    @patch("analyzer.get_readme", return_value=b"# Readme")
+    @patch("analyzer.get_pull_requests", return_value=[])
+    @patch("analyzer.get_open_issues", return_value={"items": [{"comments": 0}], "count": 1})
+    @patch("analyzer.get_commits", return_value=[])
+    @patch("analyzer.get_repo_info")
+    def test_sequential_fetch_uses_no_pool(self, mock_info, _commits, _issues, _prs, _readme, mock_pool):
+        mock_info.return_value = {"size": 120, "open_issues_count": 1, "stargazers_count": 10}
+        result = analyze_repo("owner/busy", parallel=False)
+        mock_pool.assert_not_called()
+        self.assertEqual(result["scores"]["issue_response"], 0)
+
+    @patch("analyzer.api_request")
+    def test_failed_sub_fetch_not_cached(self, mock_api):
+        import github_trending
+        def respond(endpoint):
+            if endpoint == "/repos/owner/busy":
+                return {"size": 120, "open_issues_count": 2, "stargazers_count": 10}
+            if "/pulls" in endpoint:
+                return {"_error": "rate_limited"}
+            return {"_error": "not_found"} if endpoint.endswith("/readme") else []
+        mock_api.side_effect = respond
+        result = analyze_repo("owner/busy")
+        self.assertEqual(result["repo"], "owner/busy")
+        self.assertIsNone(github_trending.read_cache("analysis", "owner/busy"))
+        # The next run retries every endpoint instead of reusing the degraded score
+        analyze_repo("owner/busy")
+        self.assertEqual(mock_api.call_count, 10)
+
+    @patch("analyzer.api_request")
+    def test_missing_readme_and_empty_commits_still_cached(self, mock_api):
+        import github_trending
+        mock_api.side_effect = lambda endpoint: (
+            {"size": 120, "open_issues_count": 0} if endpoint == "/repos/owner/bare"
+            else {"_error": "empty_repository"} if "/commits" in endpoint
+            else {"_error": "not_found"} if endpoint.endswith("/readme") else [])
+        result = analyze_repo("owner/bare")
+        self.assertEqual(github_trending.read_cache("analysis", "owner/bare"), result)
+
+    @patch("analyzer.get_repo_info")
+    def test_result_cached_between_calls(self, mock_info):
+        mock_info.return_value = {"size": 0, "stargazers_count": 3,
+                                  "created_at": "2026-01-01T00:00:00Z", "pushed_at": "2026-01-01T00:00:00Z"}
+        first = analyze_repo("owner/empty")
+        self.assertEqual(analyze_repo("owner/empty"), first)
+        mock_info.assert_called_once()
+        analyze_repo("owner/empty", use_cache=False)
+        self.assertEqual(mock_info.call_count, 2)
+
+
+# =============================================================================
+# Analyzer: token rotation
+# =============================================================================
+
+
+class TestTokenRotation(unittest.TestCase):
+    def _patch_tokens(self, tokens):
+        import itertools
+        import analyzer
+        patches = [
+            patch("analyzer.GITHUB_TOKENS", tokens),
+            patch("analyzer._token_cycle", itertools.cycle(tokens)),
+            patch("analyzer._token_reset", {}),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        return analyzer
+
+    def test_round_robin(self):
+        analyzer = self._patch_tokens(["a", "b", "c"])
+        self.assertEqual([analyzer.next_token() for _ in range(4)], ["a", "b", "c", "a"])
+
+    def test_skips_exhausted_until_reset(self):
+        analyzer = self._patch_tokens(["a", "b"])
+        analyzer.mark_token_exhausted("a", time.time() + 60)
+        self.assertEqual([analyzer.next_token() for _ in range(3)], ["b", "b", "b"])
+        analyzer.mark_token_exhausted("a", time.time() - 1)
+        self.assertIn("a", [analyzer.next_token() for _ in range(2)])
+
+    def test_no_tokens(self):
+        analyzer = self._patch_tokens([])
+        self.assertEqual(analyzer.next_token(), "")
+
+    @patch("analyzer.api_request")
+    def test_rate_limit_summed_across_tokens(self, mock_api):
+        analyzer = self._patch_tokens(["a", "b"])
+        budgets = {"a": 30, "b": 20}
+        mock_api.side_effect = lambda endpoint, token: {
+            "resources": {"core": {"remaining": budgets[token], "limit": 5000, "reset": 100}}}
+        self.assertEqual(analyzer.get_rate_limit(), {"remaining": 50, "limit": 10000, "reset": 100})
+
+    @patch("analyzer.fetch_repos_graphql", return_value={})
+    @patch("analyzer.analyze_repo")
+    @patch("analyzer.get_rate_limit", return_value={"remaining": 10, "limit": 10000, "reset": 0})
+    def test_combined_budget_truncates_token_runs(self, _rl, mock_analyze, _graphql):
+        self._patch_tokens(["a", "b"])
+        use_temp_cache_dir(self)
+        mock_analyze.side_effect = lambda title, **kwargs: {"repo": title, "total": 0}
+        with patch("analyzer.GITHUB_TOKEN", "a"), patch("builtins.print"):
+            results = analyze_repos(SAMPLE_REPOS)
+        # 10 calls left at ~5 per repo: only the first two are analyzed
+        self.assertEqual(mock_analyze.call_count, 2)
+        self.assertEqual(len(results), 2)
+
+
+# =============================================================================
+# Analyzer: rate-limit pacing and backoff
+# =============================================================================
+
+
+class TestRateLimitBackoff(unittest.TestCase):
+    def _ok(self, payload, headers=None):
+        return 200, headers or {}, json.dumps(payload).encode()
+
+    @patch("analyzer.time.sleep")
+    @patch("analyzer.http_request")
+    def test_retries_after_retry_after(self, mock_http, mock_sleep):
+        from urllib.error import HTTPError
+        from analyzer import _send
+        limited = HTTPError("u", 429, "Too Many Requests", {"Retry-After": "2"}, None)
+        mock_http.side_effect = [limited, self._ok({"ok": True})]
+        self.assertEqual(_send("https://api.github.com/x", {}, ""), ({}, {"ok": True}))
+        mock_sleep.assert_called_once_with(2.0)
+
+    @patch("analyzer.time.sleep")
+    @patch("analyzer.http_request")
+    def test_primary_limit_not_retried(self, mock_http, mock_sleep):
+        from urllib.error import HTTPError
+        from analyzer import _send
+        mock_http.side_effect = HTTPError(
+            "u", 403, "Forbidden", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}, None)
+        with self.assertRaises(HTTPError):
+            _send("https://api.github.com/x", {}, "")
+        mock_sleep.assert_not_called()
+
+    @patch("analyzer.time.sleep")
+    @patch("analyzer.http_request")
+    def test_waits_when_quota_nearly_gone(self, mock_http, mock_sleep):
+        from analyzer import _send
+        reset = str(int(time.time()) + 30)
+        mock_http.return_value = self._ok({}, {"X-RateLimit-Remaining": "1", "X-RateLimit-Reset": reset})
+        with patch("analyzer._rate_state", {}):
+            _send("https://api.github.com/x", {}, "tok")
+            mock_sleep.assert_not_called()
+            _send("https://api.github.com/x", {}, "tok")
+            mock_sleep.assert_called_once()
+
+
+# =============================================================================
+# Analyzer: api_request caching
+# =============================================================================
+
+
+class TestApiRequestCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = use_temp_cache_dir(self)
+
+    def _response(self, payload, headers=None):
+        return 200, headers or {}, json.dumps(payload).encode()
+
+    def test_cache_type_routing(self):
+        self.assertEqual(api_cache_type("/repos/o/r"), "repo_info")
+        self.assertEqual(api_cache_type("/repos/o/r/readme"), "readme")
+        self.assertEqual(api_cache_type("/repos/o/r/issues?state=open&per_page=10"), "issues")
+        self.assertEqual(api_cache_type("/repos/o/r/pulls?state=all"), "issues")
+        self.assertEqual(api_cache_type("/repos/o/r/commits?per_page=10"), "api")
+        self.assertIsNone(api_cache_type("/rate_limit"))
+
+    @patch("analyzer.http_request")
+    def test_second_call_served_from_cache(self, mock_http):
+        mock_http.return_value = self._response({"full_name": "o/r"})
+        self.assertEqual(api_request("/repos/o/r"), {"full_name": "o/r"})
+        self.assertEqual(api_request("/repos/o/r"), {"full_name": "o/r"})
+        self.assertEqual(mock_http.call_count, 1)
+
+    @patch("analyzer.http_request")
+    def test_errors_not_cached(self, mock_http):
+        from urllib.error import HTTPError
+        mock_http.side_effect = HTTPError("u", 404, "Not Found", {}, None)
+        self.assertEqual(api_request("/repos/o/gone"), {"_error": "not_found"})
+        api_request("/repos/o/gone")
+        self.assertEqual(mock_http.call_count, 2)
+
+    @patch("analyzer.http_request")
+    def test_expired_entry_revalidated_with_etag(self, mock_http):
+        import github_trending
+        mock_http.return_value = self._response({"full_name": "o/r"}, {"ETag": '"abc"'})
+        api_request("/repos/o/r")
+        
+        # Expire the entry, then answer the revalidation with 304
+        path = github_trending.get_cache_path("repo_info", "/repos/o/r")
+        entry = json.loads(path.read_text())
+        entry["_cached_at"] = 0
+        path.write_text(json.dumps(entry))
+        mock_http.return_value = (304, {}, b"")
+        
+        self.assertEqual(api_request("/repos/o/r"), {"full_name": "o/r"})
+        self.assertEqual(mock_http.call_args[0][1]["If-None-Match"], '"abc"')
+        # The 304 refreshed the entry, so the next call is a cache hit
+        api_request("/repos/o/r")
+        self.assertEqual(mock_http.call_count, 2)
+
+    @patch("analyzer.http_request")
+    def test_no_cache_skips_revalidation(self, mock_http):
+        mock_http.return_value = self._response({"full_name": "o/r"}, {"ETag": '"abc"'})
+        api_request("/repos/o/r")
+        with patch("github_trending.USE_CACHE", False):
+            api_request("/repos/o/r")
+        self.assertEqual(mock_http.call_count, 2)
+        self.assertNotIn("If-None-Match", mock_http.call_args[0][1])
+
+
+# =============================================================================
+# Analyzer: GraphQL batching
+# =============================================================================
+
+
+class TestFetchReposGraphQL(unittest.TestCase):
+    NODE = {
+        "description": "Fast thing",
+        "url": "https://github.com/owner/repo-a",
+        "stargazerCount": 12345,
+        "isArchived": False,
+        "primaryLanguage": {"name": "Python"},
+        "licenseInfo": {"spdxId": "MIT"},
+        "issues": {"totalCount": 7},
+        "pullRequests": {"totalCount": 3},
+        "recentIssues": {"nodes": [{"comments": {"totalCount": 2}}, {"comments": {"totalCount": 0}}]},
+        "recentPullRequests": {"nodes": [{"state": "MERGED", "mergedAt": "2025-01-01T00:00:00Z"},
+                                         {"state": "OPEN", "mergedAt": None}]},
+        "defaultBranchRef": {"target": {"history": {"nodes": [{"author": {"date": "2020-01-01T00:00:00Z"}}]}}},
+        "readme": {"text": "# Repo A"},
+    }
+
+    @patch("analyzer.graphql_query")
+    def test_maps_nodes_to_rest_shapes(self, mock_query):
+        mock_query.return_value = {"r0": self.NODE, "r1": None}
+        results = fetch_repos_graphql(["owner/repo-a", "gone/missing"])
+        info, commits, issues, prs, readme = results["owner/repo-a"]
+        self.assertEqual(info["open_issues_count"], 10)
+        self.assertEqual(info["license"]["spdx_id"], "MIT")
+        self.assertEqual(commits[0]["commit"]["author"]["date"], "2020-01-01T00:00:00Z")
+        self.assertEqual([i["comments"] for i in issues], [2, 0])
+        self.assertEqual(prs[0], {"state": "closed", "merged_at": "2025-01-01T00:00:00Z"})
+        self.assertEqual(readme, b"# Repo A")
+        self.assertEqual(results["gone/missing"], {"_error": "not_found"})
+        # Scores the same way the REST path does
+        result = score_repo("owner/repo-a", info, commits, issues, prs, readme)
+        self.assertEqual(result["details"]["low_open_issues"], "10 open")
+
+    @patch("analyzer.api_request")
+    @patch("analyzer.graphql_query")
+    def test_non_ascii_readme_scored_the_same_on_both_paths(self, mock_query, mock_api):
+        import base64
+        from analyzer import get_readme
+        text = "# 项目\n\n" + "这是一个很好的项目。" * 100  # ~1,000 characters, ~3,000 UTF-8 bytes
+        mock_query.return_value = {"r0": dict(self.NODE, readme={"text": text})}
+        mock_api.return_value = {"content": base64.b64encode(text.encode("utf-8")).decode()}
+        graphql_readme = fetch_repos_graphql(["owner/repo-a"])["owner/repo-a"][4]
+        rest_readme = get_readme("owner", "repo-a")
+        self.assertEqual(graphql_readme, rest_readme)
+        self.assertEqual(score_readme(graphql_readme), score_readme(rest_readme))
+        self.assertEqual(score_readme(graphql_readme)[1], "detailed")
+
+    @patch("github_trending.subprocess.run")
+    @patch("analyzer.graphql_query")
+    def test_license_mapped_like_batch_info(self, mock_query, mock_run):
+        from github_trending import fetch_repos_info_batch
+        node = dict(self.NODE, licenseInfo={"spdxId": None})
+        mock_query.return_value = {"r0": node}
+        mock_run.return_value = type("R", (), {"returncode": 0, "stdout": json.dumps({"data": {"r0": node}}).encode()})()
+        use_temp_cache_dir(self)
+        batch_info = fetch_repos_info_batch(["owner/repo-a"])["owner/repo-a"]
+        info = fetch_repos_graphql(["owner/repo-a"])["owner/repo-a"][0]
+        self.assertEqual(info["license"], {"spdx_id": "NOASSERTION"})
+        self.assertEqual(info["license"], batch_info["license"])
+
+    @patch("analyzer.graphql_query")
+    def test_batches_and_skips_failed_batches(self, mock_query):
+        mock_query.return_value = {"_error": "rate_limited"}
+        titles = [f"owner/repo-{i}" for i in range(25)]
+        self.assertEqual(fetch_repos_graphql(titles), {})
+        self.assertEqual(mock_query.call_count, 3)
 
 
 # =============================================================================
@@ -635,6 +2055,20 @@ class TestFormatFunctions(unittest.TestCase):
         self.assertIn("80", output)
         self.assertIn("Active", output)
 
+    def test_format_analysis_detail_bars_and_labels(self):
+        result = {
+            "repo": "owner/repo", "total": 27, "grade": "F",
+            "scores": {"recent_commits": 0, "readme_quality": 15, "issue_response": 7, "custom_metric": 5},
+            "details": {"recent_commits": "Inactive", "readme_quality": "detailed"},
+        }
+        lines = format_analysis_detail(result).splitlines()
+        self.assertEqual(lines[-4:], [
+            "   Recent Commits       [░░░░░░░░░░]  0/20  Inactive",
+            "   Readme Quality       [██████████] 15/15  detailed",
+            "   Issue Response       [████░░░░░░]  7/15  ",
+            "   Custom Metric        [█████░░░░░]  5/10  ",
+        ])
+
     def test_format_analysis_detail_error(self):
         result = {"repo": "bad/repo", "error": "Not found"}
         output = format_analysis_detail(result)